@@ -1,3 +1,10 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import FAQEntry
+
+
+@admin.register(FAQEntry)
+class FAQEntryAdmin(admin.ModelAdmin):
+    list_display = ('question', 'language', 'source', 'hit_count', 'updated_at')
+    list_filter = ('source', 'language')
+    search_fields = ('question', 'answer')
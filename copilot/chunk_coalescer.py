@@ -0,0 +1,78 @@
+"""
+Answer Chunk Coalescing
+Batches streamed answer tokens into fewer WebSocket messages (time / size window, flushed at sentence ends)
+"""
+
+import asyncio
+import re
+from typing import Awaitable, Callable, List, Optional
+
+# A chunk that ends a sentence or a line (optionally followed by a closing quote/bracket)
+SENTENCE_END = re.compile(r'([.!?:;]["\')\]*]*|\n)\s*$')
+
+
+class ChunkCoalescer:
+    """
+    Buffers streamed text and hands it to `send` in batches.
+
+    A batch is sent when it has been open for `interval` seconds (a timer covers a stalled
+    stream), reaches max_bytes of UTF-8, or ends a sentence or line - so the reader never
+    waits on a finished sentence. Per token this only appends to a list; the timer is armed
+    once per batch. Batches are sent in order. With interval <= 0 every chunk is sent as is.
+    """
+
+    def __init__(self, send: Callable[[str], Awaitable], interval: float = 0.06, max_bytes: int = 200):
+        self.send = send
+        self.interval = interval
+        self.max_bytes = max_bytes
+        self._buffer: List[str] = []
+        self._size = 0
+        self._opened = 0.0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._timer_flush: Optional[asyncio.Task] = None
+        self._send_lock = asyncio.Lock()
+        self._loop = asyncio.get_running_loop()
+
+        # Counters
+        self.chunks_in = 0
+        self.messages_out = 0
+
+    async def add(self, chunk: str):
+        if not chunk:
+            return
+        self.chunks_in += 1
+        if not self._buffer:
+            self._opened = self._loop.time()
+        self._buffer.append(chunk)
+        self._size += len(chunk.encode('utf-8'))
+
+        if (self.interval <= 0 or self._size >= self.max_bytes or SENTENCE_END.search(chunk)
+                or self._loop.time() - self._opened >= self.interval):
+            await self.flush()
+        elif self._timer is None:
+            self._timer = self._loop.call_later(self.interval, self._on_timer)
+
+    def _on_timer(self):
+        self._timer = None
+        self._timer_flush = self._loop.create_task(self.flush())
+
+    async def flush(self):
+        """Send whatever is buffered now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._send_lock:
+            if not self._buffer:
+                return
+            text = ''.join(self._buffer)
+            self._buffer, self._size = [], 0
+            self.messages_out += 1
+            await self.send(text)
+
+    def close(self):
+        """Drop a pending timer flush (e.g. the answer was cancelled); buffered text is discarded."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._timer_flush is not None and not self._timer_flush.done():
+            self._timer_flush.cancel()
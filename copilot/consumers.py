@@ -2,50 +2,17 @@ import json
 import asyncio
 import time
 from channels.generic.websocket import AsyncWebsocketConsumer
-from .utils import get_resume_summary, get_job_description_summary, generate_response_async, get_cached_answer, cache_answer, load_faq_from_file
+from django.conf import settings
+from .utils import aget_document_summaries, generate_response_async, get_cached_answer, cache_answer, warm_faq_cache, queue_faq_write, queue_faq_hit, flush_faq_store, record_llm_response, get_question_hash, summarize_conversation, is_answer_available
 from .pattern_analyzer import QuestionPredictor
+from .prefetch import AnswerPrefetcher
+from .single_flight import SingleFlight
+from .conversation import ConversationHistory
+from .interim_speculation import InterimSpeculator
+from .chunk_coalescer import ChunkCoalescer
+from .language import detect_language
 from datetime import datetime
 
-
-def detect_language(text: str) -> str:
-    """
-    Detect language of text based on common words.
-    Returns: 'Portuguese', 'French', or 'English' (default)
-    """
-    if not text:
-        return 'English'
-
-    text_lower = text.lower()
-
-    # Portuguese indicators
-    portuguese_words = ['você', 'qual', 'como', 'quando', 'onde', 'porque', 'posso', 'pode',
-                        'que', 'para', 'com', 'seu', 'sua', 'meu', 'minha', 'estou', 'está',
-                        'fazer', 'trabalho', 'experiência', 'projeto', 'dados', 'sistema']
-    pt_count = sum(1 for word in portuguese_words if word in text_lower)
-
-    # French indicators
-    french_words = ['vous', 'quel', 'quelle', 'comment', 'quand', 'où', 'pourquoi', 'puis',
-                    'avec', 'pour', 'votre', 'mon', 'ma', 'suis', 'êtes', 'faire',
-                    'travail', 'expérience', 'projet', 'données', 'système']
-    fr_count = sum(1 for word in french_words if word in text_lower)
-
-    # English indicators
-    english_words = ['you', 'what', 'how', 'when', 'where', 'why', 'can', 'could',
-                     'your', 'my', 'the', 'with', 'work', 'experience', 'project', 'data']
-    en_count = sum(1 for word in english_words if word in text_lower)
-
-    # Return language with highest match
-    max_count = max(pt_count, fr_count, en_count)
-
-    if max_count == 0:
-        return 'English'  # Default
-    elif pt_count == max_count:
-        return 'Portuguese'
-    elif fr_count == max_count:
-        return 'French'
-    else:
-        return 'English'
-
 class InterviewConsumer(AsyncWebsocketConsumer):
     # Class-level cache (shared across all WebSocket instances)
     _resume_cache = None
@@ -53,6 +20,10 @@ class InterviewConsumer(AsyncWebsocketConsumer):
     _cache_timestamp = None
     CACHE_TTL = 3600  # 1 hour cache
     _faq_loaded = False  # Flag to track if FAQ has been preloaded
+    _faq_flush_task = None  # Process-wide write-behind flusher for the FAQ store
+    _single_flight = SingleFlight()  # LLM answers in progress, shared by identical questions
+    DELIVERY_MODES = ('instant', 'paced')  # How cached answers are delivered to this client
+    PACED_CHUNK_WORDS = 3  # Words per chunk in paced delivery
 
     async def connect(self):
         # Join room group
@@ -66,18 +37,55 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         # Accept the connection
         await self.accept()
 
-        # Store conversation history
-        self.conversation_history = []
+        # Store conversation history (recent turns verbatim, older ones summarized in the background)
+        self.conversation_history = ConversationHistory(
+            summarizer=summarize_conversation,
+            keep_turns=settings.HISTORY_KEEP_TURNS,
+            summary_max_tokens=settings.HISTORY_SUMMARY_MAX_TOKENS
+        )
+
+        # Cached answer delivery (clients can change it with a 'delivery_settings' message)
+        self.delivery_mode = settings.CACHE_DELIVERY_MODE
+        self.delivery_words_per_second = settings.CACHE_DELIVERY_WORDS_PER_SECOND
+        self._paced_delivery = None  # Task delivering a cached answer at the paced rate
+
+        # Answer being generated for the latest question, and the groups receiving it
+        self._answer_task = None
+        self._answer_groups = set()
+        self._answer_chunks = []  # Answer text streamed so far
+        self._awaiting_answer = False  # The latest question has no answer in the history yet
 
         # Initialize question predictor (will be created after we have summaries)
         self.question_predictor = None
         self.last_question = None
 
-        # Load FAQ from file on first connection (automatic preload for instant responses)
+        # Background generation of answers for predicted questions (opt-in per message)
+        self.prefetcher = AnswerPrefetcher(
+            max_concurrent=settings.PREFETCH_MAX_CONCURRENT,
+            budget=settings.PREFETCH_BUDGET,
+            top_n=settings.PREFETCH_TOP_N
+        )
+
+        # Answers started from interim transcripts, kept if the final transcript matches (opt-in)
+        self.speculator = InterimSpeculator(
+            match_threshold=settings.SPECULATIVE_MATCH_THRESHOLD,
+            min_words=settings.SPECULATIVE_MIN_WORDS,
+            max_per_question=settings.SPECULATIVE_MAX_PER_QUESTION
+        )
+        # LLM choice of the last question, used for speculative answers
+        self.selected_model = 'gpt-4o-mini'
+        self.llm_provider = 'openai'
+        self.hedge_enabled = settings.LLM_HEDGE_ENABLED
+
+        # Warm FAQ cache from the database on first connection (normally already done at startup)
         if not InterviewConsumer._faq_loaded:
-            await asyncio.to_thread(load_faq_from_file)
+            await asyncio.to_thread(warm_faq_cache)
             InterviewConsumer._faq_loaded = True
 
+        # Make sure FAQ answers learned by this process are persisted in the background
+        if InterviewConsumer._faq_flush_task is None or InterviewConsumer._faq_flush_task.done():
+            InterviewConsumer._faq_flush_task = asyncio.create_task(self._faq_flush_loop())
+
         # Check cache first for massive performance boost
         current_time = time.time()
         cache_expired = (
@@ -88,8 +96,9 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         if self._resume_cache is None or self._job_cache is None or cache_expired:
             # Cache miss - fetch and cache
             print("Cache miss - generating summaries...")
-            self._resume_cache = await asyncio.to_thread(get_resume_summary)
-            self._job_cache = await asyncio.to_thread(get_job_description_summary)
+            resume, job = await aget_document_summaries()
+            self._resume_cache = resume or ('', None, None)
+            self._job_cache = job or ('', None, None)
             self._cache_timestamp = current_time
         else:
             print("Cache hit - using cached summaries (instant!)")
@@ -116,11 +125,47 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             self.channel_name
         )
 
+        # Stop prefetching and history summarization for a session that is gone
+        if hasattr(self, 'prefetcher'):
+            self.prefetcher.cancel_all()
+        if hasattr(self, 'conversation_history'):
+            self.conversation_history.close()
+        if hasattr(self, 'speculator'):
+            self.speculator.cancel()
+        if hasattr(self, '_answer_task'):
+            await self._cancel_current_answer()
+
+        # Persist anything this session learned without waiting for the next timer tick
+        await asyncio.to_thread(flush_faq_store)
+
+    @staticmethod
+    async def _faq_flush_loop():
+        """Periodically flush queued FAQ answers and hit counts to the database"""
+        while True:
+            await asyncio.sleep(settings.FAQ_STORE_FLUSH_INTERVAL)
+            try:
+                await asyncio.to_thread(flush_faq_store)
+            except Exception as e:
+                print(f"[FAQ Store] Background flush error: {e}")
+
     async def receive(self, text_data):
         text_data_json = json.loads(text_data)
         message_type = text_data_json.get('type')
 
-        if message_type == 'live_transcript_update':
+        if message_type == 'delivery_settings':
+            # Per-client choice of how cached answers arrive: all at once, or paced at a given rate
+            mode = text_data_json.get('mode', self.delivery_mode)
+            if mode in self.DELIVERY_MODES:
+                self.delivery_mode = mode
+            try:
+                words_per_second = float(text_data_json.get('words_per_second', self.delivery_words_per_second))
+                if words_per_second > 0:
+                    self.delivery_words_per_second = words_per_second
+            except (TypeError, ValueError):
+                pass
+            print(f"[DELIVERY] Mode: {self.delivery_mode} ({self.delivery_words_per_second} words/s when paced)")
+
+        elif message_type == 'live_transcript_update':
             # Broadcast live transcript to all connected clients
             await self.channel_layer.group_send(
                 self.room_group_name,
@@ -131,173 +176,392 @@ class InterviewConsumer(AsyncWebsocketConsumer):
                 }
             )
 
+            # Start answering as soon as the interim transcript looks like a complete question
+            if text_data_json.get('speculative_enabled', settings.SPECULATIVE_ANSWERS_ENABLED):
+                await self._maybe_speculate(text_data_json.get('text', ''), text_data_json.get('is_final', False))
+
         elif message_type == 'transcription':
-            # Get the transcribed text, provider, and selected model
-            transcribed_text = text_data_json.get('text', '')
-            llm_provider = text_data_json.get('provider', 'openai')  # Default to openai
-            selected_model = text_data_json.get('model', 'gpt-4o-mini')  # Default to gpt-4o-mini (faster)
-            predictions_enabled = text_data_json.get('predictions_enabled', True)  # Default to enabled for backward compatibility
-            timestamp = datetime.now().strftime("%H:%M:%S")
-
-            print(f"Received transcription: {transcribed_text}")
-            print(f"LLM Provider: {llm_provider}")
-            print(f"Selected model: {selected_model}")
-            print(f"Predictions enabled: {predictions_enabled}")
-
-            # Store current question for prediction
-            self.last_question = transcribed_text
-
-            # Use transcript directly - no need for extraction (saves API call and time)
-            # Truncate only for display if very long, but keep full transcript for LLM context
-            display_question = transcribed_text if len(transcribed_text) <= 500 else transcribed_text[:500] + "..."
-
-            # Add FULL transcript to conversation history for LLM context
-            self.conversation_history.append({
-                "role": "user",
-                "content": transcribed_text
-            })
-
-            # Broadcast question to all connected clients
+            # Answer in a task so the next message is handled right away: a newer question
+            # cancels the answer still streaming for the previous one
+            await self._cancel_current_answer()
+            self._answer_task = asyncio.create_task(self._run_answer(text_data_json))
+
+    async def _cancel_current_answer(self):
+        """Abort the answer still being generated for the previous question (closes its LLM stream)"""
+        task = self._answer_task
+        if task is None or task.done():
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _run_answer(self, text_data_json):
+        """Answer a question; if superseded, tell every client that was receiving the answer"""
+        self._answer_groups = {self.room_group_name}
+        self._answer_chunks = []
+        try:
+            await self._answer_transcription(text_data_json)
+        except asyncio.CancelledError:
+            print(f"[CANCEL] Answer superseded for: '{text_data_json.get('text', '')[:50]}...'")
+            self._record_unfinished_answer('interrupted by the next question')
+            for group in list(self._answer_groups):
+                await self.channel_layer.group_send(
+                    group,
+                    {
+                        'type': 'answer_cancelled_message',
+                        'timestamp': datetime.now().strftime("%H:%M:%S")
+                    }
+                )
+            raise
+        except Exception as e:
+            print(f"[ERROR] Failed to answer question: {e}")
+            import traceback
+            print(traceback.format_exc())
+            self._record_unfinished_answer('failed')
+
+    def _record_answer(self, text):
+        """Add the answer to the current question to the history"""
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": text
+        })
+        self._awaiting_answer = False
+
+    def _record_unfinished_answer(self, reason):
+        """Close the current question's turn with what was streamed so far (keeps question/answer pairs)"""
+        if not self._awaiting_answer:
+            return
+        partial = ''.join(self._answer_chunks).rstrip()
+        self._record_answer(f"{partial}\n[Answer {reason}]" if partial else f"[Answer {reason}]")
+
+    async def _answer_transcription(self, text_data_json):
+        """Answer one transcribed question (runs as self._answer_task, cancelled by a newer question)"""
+        # Get the transcribed text, provider, and selected model
+        transcribed_text = text_data_json.get('text', '')
+        llm_provider = text_data_json.get('provider', 'openai')  # Default to openai
+        selected_model = text_data_json.get('model', 'gpt-4o-mini')  # Default to gpt-4o-mini (faster)
+        predictions_enabled = text_data_json.get('predictions_enabled', True)  # Default to enabled for backward compatibility
+        prefetch_enabled = text_data_json.get('prefetch_enabled', settings.PREFETCH_ENABLED)
+        hedge_enabled = text_data_json.get('hedge_enabled', settings.LLM_HEDGE_ENABLED)
+        timestamp = datetime.now().strftime("%H:%M:%S")
+
+        print(f"Received transcription: {transcribed_text}")
+        print(f"LLM Provider: {llm_provider}")
+        print(f"Selected model: {selected_model}")
+        print(f"Predictions enabled: {predictions_enabled}")
+
+        # Store current question for prediction
+        self.last_question = transcribed_text
+        self.selected_model, self.llm_provider, self.hedge_enabled = selected_model, llm_provider, hedge_enabled
+
+        # Answer already being generated from the interim transcript (None if the final text diverged)
+        speculation = self.speculator.take(transcribed_text)
+
+        # Use transcript directly - no need for extraction (saves API call and time)
+        # Truncate only for display if very long, but keep full transcript for LLM context
+        display_question = transcribed_text if len(transcribed_text) <= 500 else transcribed_text[:500] + "..."
+
+        # Add FULL transcript to conversation history for LLM context
+        self.conversation_history.append({
+            "role": "user",
+            "content": transcribed_text
+        })
+        self._awaiting_answer = True
+
+        # The same question is already being answered for this room (several clients sent the
+        # same transcript): the room is receiving that answer, so just wait for it
+        question_key = get_question_hash(transcribed_text)
+        flight = self._single_flight.get(question_key)
+        if flight is not None and self.room_group_name in flight.groups:
+            flight.followers += 1
+            print(f"[SINGLE-FLIGHT] Joined in-flight answer for: '{transcribed_text[:50]}...'")
+            if speculation:
+                speculation.cancel()
+            # The room keeps receiving the leader's answer even if this wait is superseded
+            self._answer_groups = set()
+            self._answer_chunks = flight.chunks
+            answer = await flight.wait()
+            if flight.cancelled:
+                self._record_unfinished_answer('interrupted by the next question')
+            else:
+                self._record_answer(answer)
+            return
+
+        # Broadcast question to all connected clients
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                'type': 'question_message',
+                'text': display_question,
+                'timestamp': timestamp
+            }
+        )
+
+        # Check FAQ cache first for instant response
+        cached_result = await asyncio.to_thread(
+            get_cached_answer, transcribed_text, speculative_cache=self.prefetcher.cache
+        )
+
+        full_response = ""
+        is_from_cache = False
+
+        if cached_result:
+            # Use cached answer (INSTANT response!)
+            full_response = cached_result['answer']
+            is_from_cache = True
+            if speculation:
+                speculation.cancel()
+
+            if cached_result.get('speculative'):
+                # Prefetched answer was just promoted into the cache - persist it like an LLM answer
+                flush_due = queue_faq_write(transcribed_text, full_response)
+            else:
+                flush_due = queue_faq_hit(cached_result['matched_question'])
+            if flush_due:
+                await asyncio.to_thread(flush_faq_store)
+
+            # Send cache indicator FIRST
             await self.channel_layer.group_send(
                 self.room_group_name,
                 {
-                    'type': 'question_message',
-                    'text': display_question,
-                    'timestamp': timestamp
+                    'type': 'cache_indicator_message',
+                    'cached': True,
+                    'speculative': cached_result.get('speculative', False),
+                    'hit_count': cached_result.get('hit_count', 0)
                 }
             )
 
-            # Check FAQ cache first for instant response
-            cached_result = await asyncio.to_thread(get_cached_answer, transcribed_text)
+            # Send the whole cached answer in one message - each client delivers it
+            # according to its own delivery mode (instant or paced)
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'cached_answer_message',
+                    'text': full_response,
+                    'timestamp': timestamp
+                }
+            )
+        else:
+            # Send LLM indicator FIRST
+            await self.channel_layer.group_send(
+                self.room_group_name,
+                {
+                    'type': 'cache_indicator_message',
+                    'cached': False,
+                    'model': selected_model,
+                    'provider': llm_provider
+                }
+            )
 
-            full_response = ""
-            is_from_cache = False
+            # Only one LLM stream per question: identical questions attach to the running one
+            flight, is_leader = self._single_flight.acquire(question_key, self.room_group_name)
+            if is_leader:
+                # Every group attached to the flight gets the cancellation notice if it is superseded
+                self._answer_groups = flight.groups
+                self._answer_chunks = flight.chunks
+                try:
+                    full_response = await self._stream_llm_answer(
+                        flight, transcribed_text, selected_model, llm_provider, timestamp, hedge_enabled, speculation
+                    )
+                except asyncio.CancelledError:
+                    flight.cancelled = True
+                    raise
+                finally:
+                    self._single_flight.release(question_key, flight, full_response)
+            else:
+                print(f"[SINGLE-FLIGHT] Attached to in-flight answer for: '{transcribed_text[:50]}...'")
+                if speculation:
+                    speculation.cancel()
+                try:
+                    # Replay what has been streamed so far, then receive the rest live
+                    async with flight.lock:
+                        streamed = flight.subscribe(self.room_group_name)
+                        self._answer_chunks = flight.chunks
+                        if streamed:
+                            await self.channel_layer.group_send(
+                                self.room_group_name,
+                                {
+                                    'type': 'answer_chunk_message',
+                                    'text': streamed,
+                                    'timestamp': timestamp
+                                }
+                            )
+                    full_response = await flight.wait()
+                except asyncio.CancelledError:
+                    # Superseded: only this room stops receiving the leader's answer (and is told)
+                    flight.groups.discard(self.room_group_name)
+                    raise
+                if flight.cancelled:
+                    # The leader was superseded and has told this room
+                    self._record_unfinished_answer('interrupted by the next question')
+                    return
+
+        # Add AI response to conversation history
+        self._record_answer(full_response)
+
+        # Broadcast end of response marker to all clients
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                'type': 'answer_complete_message',
+                'timestamp': timestamp
+            }
+        )
 
-            if cached_result:
-                # Use cached answer (INSTANT response!)
-                full_response = cached_result['answer']
-                is_from_cache = True
+        # Generate predictions for next questions (only if enabled)
+        if predictions_enabled and self.last_question and full_response and self.question_predictor:
+            try:
+                # Detect language from transcription
+                detected_language = detect_language(transcribed_text)
+                print(f"[PREDICTIONS] Detected language: {detected_language}")
+
+                predictions = await asyncio.to_thread(
+                    self.question_predictor.predict_next_questions,
+                    self.last_question,
+                    full_response,
+                    detected_language
+                )
 
-                # Send cache indicator FIRST
+                # Send predictions to all clients
                 await self.channel_layer.group_send(
                     self.room_group_name,
                     {
-                        'type': 'cache_indicator_message',
-                        'cached': True,
-                        'hit_count': cached_result.get('hit_count', 0)
+                        'type': 'question_predictions_message',
+                        'predictions': predictions
                     }
                 )
 
-                # Send cached answer as if it was streaming (for UX consistency)
-                # Split into words for smooth display
-                words = cached_result['answer'].split()
-                word_chunks = [' '.join(words[i:i+3]) for i in range(0, len(words), 3)]
+                print(f"[PREDICTIONS] Generated {len(predictions)} predictions in {detected_language}")
+
+                # Answer the likely next questions ahead of time
+                if prefetch_enabled:
+                    await self.prefetcher.schedule(
+                        predictions,
+                        self.conversation_history.for_prompt(),
+                        self.resume_summary,
+                        self.job_summary,
+                        selected_model,
+                        llm_provider
+                    )
+            except Exception as e:
+                print(f"[ERROR] Failed to generate predictions: {e}")
+                import traceback
+                print(traceback.format_exc())
+        elif not predictions_enabled:
+            print("[PREDICTIONS] Predictions disabled by user - skipping")
+    
+    async def _maybe_speculate(self, text, is_final):
+        """Start a speculative answer for an interim transcript that looks like a complete question"""
+        question = self.speculator.observe(text, is_final)
+        if not question or self._single_flight.get(get_question_hash(question)) is not None:
+            return
+        if await asyncio.to_thread(is_answer_available, question, self.prefetcher.cache):
+            return  # Will be a cache hit anyway
+
+        print(f"[SPECULATIVE] Answering interim transcript: '{question[:50]}...'")
+        messages = self.conversation_history.for_prompt() + [{"role": "user", "content": question}]
+        self.speculator.start(
+            question, self._generate_answer_text(messages, self.selected_model, self.llm_provider, self.hedge_enabled)
+        )
 
-                for chunk in word_chunks:
+    async def _generate_answer_text(self, messages, model, provider, hedge=False):
+        """Answer text chunks from the LLM for the given conversation"""
+        response_stream = await generate_response_async(
+            messages,
+            self.resume_summary,
+            self.job_summary,
+            model,
+            provider,
+            hedge=hedge
+        )
+        # A failed call comes back as an error iterator: show its message, then report the failure
+        error_message = getattr(response_stream, 'error_message', None)
+        async for chunk in self._process_openai_stream(response_stream):
+            yield chunk
+        if error_message:
+            raise RuntimeError(error_message)
+
+    async def _stream_llm_answer(self, flight, question, model, provider, timestamp, hedge=False, speculation=None):
+        """Generate an answer, fanning its chunks out to every group attached to the flight"""
+        full_response = ""
+
+        # Generate response with selected provider and model using async client (no thread blocking!),
+        # or continue the answer already started from the interim transcript
+        llm_started = time.perf_counter()
+        if speculation is not None:
+            print(f"[SPECULATIVE] Promoted answer started {llm_started - speculation.started:.2f}s before the final transcript "
+                  f"({len(speculation.chunks)} chunks ready)")
+            llm_started = speculation.started
+            chunks = speculation.stream()
+        else:
+            chunks = self._generate_answer_text(self.conversation_history.for_prompt(), model, provider, hedge)
+
+        # Process and send streaming response to all clients (tokens batched per flush window)
+        async def broadcast(text):
+            async with flight.lock:
+                flight.chunks.append(text)
+                # Broadcast to all connected clients (of every room waiting for this answer)
+                for group in list(flight.groups):
                     await self.channel_layer.group_send(
-                        self.room_group_name,
+                        group,
                         {
                             'type': 'answer_chunk_message',
-                            'text': chunk + ' ',
+                            'text': text,
                             'timestamp': timestamp
                         }
                     )
-                    # Small delay to simulate streaming (for better UX)
-                    await asyncio.sleep(0.05)
-            else:
-                # Send LLM indicator FIRST
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        'type': 'cache_indicator_message',
-                        'cached': False,
-                        'model': selected_model,
-                        'provider': llm_provider
-                    }
-                )
 
-                # Generate response with selected provider and model using async client (no thread blocking!)
-                response_stream = await generate_response_async(
-                    self.conversation_history,
-                    self.resume_summary,
-                    self.job_summary,
-                    selected_model,
-                    llm_provider
-                )
-
-                # Process and send streaming response to all clients
-                async for chunk in self._process_openai_stream(response_stream):
+        coalescer = ChunkCoalescer(broadcast, settings.ANSWER_CHUNK_FLUSH_MS / 1000, settings.ANSWER_CHUNK_FLUSH_BYTES)
+        error = None
+        try:
+            try:
+                async for chunk in chunks:
                     if chunk:
                         full_response += chunk
-                        # Broadcast to all connected clients
-                        await self.channel_layer.group_send(
-                            self.room_group_name,
-                            {
-                                'type': 'answer_chunk_message',
-                                'text': chunk,
-                                'timestamp': timestamp
-                            }
-                        )
-
-                # Cache the answer for future use
-                await asyncio.to_thread(cache_answer, transcribed_text, full_response)
-
-            # Add AI response to conversation history
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": full_response
-            })
-
-            # Broadcast end of response marker to all clients
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'answer_complete_message',
-                    'timestamp': timestamp
-                }
-            )
-
-            # Generate predictions for next questions (only if enabled)
-            if predictions_enabled and self.last_question and full_response and self.question_predictor:
-                try:
-                    # Detect language from transcription
-                    detected_language = detect_language(transcribed_text)
-                    print(f"[PREDICTIONS] Detected language: {detected_language}")
-
-                    predictions = await asyncio.to_thread(
-                        self.question_predictor.predict_next_questions,
-                        self.last_question,
-                        full_response,
-                        detected_language
-                    )
+                        await coalescer.add(chunk)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Clients keep what was streamed (e.g. the error message); it is never cached
+                error = e
+            await coalescer.flush()
+        finally:
+            coalescer.close()
+        print(f"[STREAM] {coalescer.chunks_in} tokens sent in {coalescer.messages_out} messages")
+
+        if error is not None or not full_response.strip():
+            print(f"[ERROR] Answer generation failed, not caching: {error or 'empty answer'}")
+            return full_response
+
+        record_llm_response(time.perf_counter() - llm_started, full_response)
+
+        # Cache the answer for future use (and queue it for the durable FAQ store) - done once,
+        # before the flight is released, so a repeat of the question is a cache hit from then on
+        await asyncio.to_thread(cache_answer, question, full_response)
+        if queue_faq_write(question, full_response):
+            await asyncio.to_thread(flush_faq_store)
+
+        if flight.followers:
+            print(f"[SINGLE-FLIGHT] Answer shared with {flight.followers} identical request(s)")
+        return full_response
 
-                    # Send predictions to all clients
-                    await self.channel_layer.group_send(
-                        self.room_group_name,
-                        {
-                            'type': 'question_predictions_message',
-                            'predictions': predictions
-                        }
-                    )
-
-                    print(f"[PREDICTIONS] Generated {len(predictions)} predictions in {detected_language}")
-                except Exception as e:
-                    print(f"[ERROR] Failed to generate predictions: {e}")
-                    import traceback
-                    print(traceback.format_exc())
-            elif not predictions_enabled:
-                print("[PREDICTIONS] Predictions disabled by user - skipping")
-    
     async def _process_openai_stream(self, response_stream):
         """Process OpenAI streaming response and yield content chunks"""
         # Handle both sync and async iterators
         if hasattr(response_stream, '__aiter__'):
             # Async iterator
-            async for chunk in response_stream:
-                if hasattr(chunk.choices[0], 'delta') and hasattr(chunk.choices[0].delta, 'content'):
-                    content = chunk.choices[0].delta.content
-                    if content:
-                        yield content
+            try:
+                async for chunk in response_stream:
+                    if hasattr(chunk.choices[0], 'delta') and hasattr(chunk.choices[0].delta, 'content'):
+                        content = chunk.choices[0].delta.content
+                        if content:
+                            yield content
+            finally:
+                # Abandoned early (answer cancelled): stop the upstream request too
+                if hasattr(response_stream, 'close'):
+                    response_stream.close()
         else:
             # Sync iterator
             for chunk in response_stream:
@@ -318,6 +582,13 @@ class InterviewConsumer(AsyncWebsocketConsumer):
     # Handler for question messages from the group
     async def question_message(self, event):
         """Send question to WebSocket"""
+        # A cached answer still being paced out is superseded by the new question
+        if self._cancel_paced_delivery():
+            await self.send(text_data=json.dumps({
+                'type': 'answer_cancelled',
+                'timestamp': event['timestamp']
+            }))
+
         await self.send(text_data=json.dumps({
             'type': 'question',
             'text': event['text'],
@@ -333,20 +604,71 @@ class InterviewConsumer(AsyncWebsocketConsumer):
             'timestamp': event['timestamp']
         }))
 
+    # Handler for cached answers from the group
+    async def cached_answer_message(self, event):
+        """Deliver a cached answer to WebSocket - in one chunk, or paced at the client's rate"""
+        if self.delivery_mode != 'paced':
+            await self.send(text_data=json.dumps({
+                'type': 'answer_chunk',
+                'text': event['text'],
+                'timestamp': event['timestamp']
+            }))
+            return
+
+        # Paced delivery runs as a task so it doesn't hold up this client's next messages
+        self._paced_delivery = asyncio.create_task(self._deliver_paced(event))
+
+    async def _deliver_paced(self, event):
+        """Send a cached answer a few words at a time at the client's rate"""
+        words = event['text'].split()
+        delay = self.PACED_CHUNK_WORDS / self.delivery_words_per_second
+        for i in range(0, len(words), self.PACED_CHUNK_WORDS):
+            await self.send(text_data=json.dumps({
+                'type': 'answer_chunk',
+                'text': ' '.join(words[i:i + self.PACED_CHUNK_WORDS]) + ' ',
+                'timestamp': event['timestamp']
+            }))
+            await asyncio.sleep(delay)
+
     # Handler for answer complete messages from the group
     async def answer_complete_message(self, event):
-        """Send answer complete marker to WebSocket"""
+        """Send answer complete marker to WebSocket (after a paced answer has been fully delivered)"""
+        delivery = self._paced_delivery
+        if delivery is not None and not delivery.done():
+            async def complete_after_delivery():
+                await delivery
+                await self.answer_complete_message(event)
+            self._paced_delivery = asyncio.create_task(complete_after_delivery())
+            return
+
         await self.send(text_data=json.dumps({
             'type': 'answer_complete',
             'timestamp': event['timestamp']
         }))
 
+    # Handler for answer cancelled messages from the group
+    async def answer_cancelled_message(self, event):
+        """Tell the client the current answer was abandoned for a newer question"""
+        self._cancel_paced_delivery()
+        await self.send(text_data=json.dumps({
+            'type': 'answer_cancelled',
+            'timestamp': event['timestamp']
+        }))
+
+    def _cancel_paced_delivery(self):
+        """Stop a paced cached answer; returns True if one was still being delivered"""
+        if self._paced_delivery is None or self._paced_delivery.done():
+            return False
+        self._paced_delivery.cancel()
+        return True
+
     # Handler for cache indicator messages
     async def cache_indicator_message(self, event):
         """Send cache indicator to WebSocket"""
         await self.send(text_data=json.dumps({
             'type': 'cache_indicator',
             'cached': event['cached'],
+            'speculative': event.get('speculative', False),
             'hit_count': event.get('hit_count', 0),
             'model': event.get('model', ''),
             'provider': event.get('provider', '')
@@ -358,4 +680,20 @@ class InterviewConsumer(AsyncWebsocketConsumer):
         await self.send(text_data=json.dumps({
             'type': 'question_predictions',
             'predictions': event['predictions']
+        }))
+
+    # Handler for background summary jobs (document uploads)
+    async def summary_job_message(self, event):
+        """Pick up freshly generated summaries and forward job progress to WebSocket"""
+        job = event['job']
+        if job['status'] == 'done':
+            if job['result'].get('resume_summary'):
+                self.resume_summary = job['result']['resume_summary']
+            if job['result'].get('job_summary'):
+                self.job_summary = job['result']['job_summary']
+                self.question_predictor = QuestionPredictor(job_description=self.job_summary)
+
+        await self.send(text_data=json.dumps({
+            'type': 'summary_job',
+            'job': job
         }))
\ No newline at end of file
@@ -0,0 +1,141 @@
+"""
+Context Retrieval
+Picks the resume and job description chunks relevant to a question (BM25) instead of sending the full summaries
+"""
+
+import math
+import re
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from .faq_index import CLAUSE_MARKERS, FILLER_WORDS
+from .tokens import estimate_tokens
+
+# Words too common in questions and summaries to say anything about relevance
+STOP_WORDS = FILLER_WORDS | CLAUSE_MARKERS | {
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'at', 'for', 'with', 'by', 'from',
+    'is', 'are', 'was', 'were', 'be', 'been', 'do', 'did', 'does', 'have', 'has', 'had',
+    'you', 'your', 'i', 'me', 'my', 'we', 'our', 'it', 'its', 'this', 'that', 'these', 'those',
+    'what', 'which', 'who', 'how', 'when', 'where', 'why', 'can', 'could', 'would', 'should',
+    'tell', 'about', 'describe', 'explain', 'give', 'example', 'any', 'some', 'as', 'if', 'than'
+}
+
+# A line that starts a new section: markdown heading, bold title or numbered bold title
+_HEADING = re.compile(r'^\s*(#{1,6}\s+\S|\d+\.\s+\*\*|\*\*[^*]+\*\*:?\s*$|===)')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased words without stop words (plural 's' folded so 'pipelines' matches 'pipeline')."""
+    words = re.findall(r'\w+', text.lower())
+    return [w[:-1] if len(w) > 3 and w.endswith('s') and not w.endswith('ss') else w
+            for w in words if w not in STOP_WORDS and len(w) > 1]
+
+
+def split_into_chunks(text: str, max_tokens: int = 120) -> List[str]:
+    """
+    Split a summary into chunks of at most ~max_tokens, never across sections.
+
+    Long sections are split on line boundaries and each piece is prefixed with the
+    section heading, so a chunk still says what it is about ("Technical Skills: ...").
+    """
+    sections: List[Tuple[str, List[str]]] = []
+    heading, lines = '', []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        if _HEADING.match(line):
+            if lines:
+                sections.append((heading, lines))
+            heading, lines = line.strip(), [line.strip()]
+        else:
+            lines.append(line.rstrip())
+    if lines:
+        sections.append((heading, lines))
+
+    chunks = []
+    for heading, lines in sections:
+        current, size, has_content = [], 0, False
+        for line in lines:
+            line_tokens = estimate_tokens(line)
+            if has_content and size + line_tokens > max_tokens:
+                chunks.append('\n'.join(current))
+                current, size = ([heading], estimate_tokens(heading)) if heading else ([], 0)
+            current.append(line)
+            size += line_tokens
+            has_content = True
+        if has_content:
+            chunks.append('\n'.join(current))
+    return chunks
+
+
+class ContextIndex:
+    """
+    BM25 index over the chunks of one document (a resume or job description summary).
+
+    Built once per summary; select() then returns the chunks most relevant to a question,
+    kept in document order, within a token budget. The first `lead_chunks` chunks (the
+    profile / job title) are always included because most answers need them. If nothing
+    in the question matches, chunks are taken from the top of the document instead.
+    """
+
+    def __init__(self, text: str, chunk_tokens: int = 120, k1: float = 1.5, b: float = 0.75):
+        self.text = text
+        self.k1 = k1
+        self.b = b
+        self.chunks = split_into_chunks(text, chunk_tokens)
+        self.chunk_token_counts = [estimate_tokens(chunk) for chunk in self.chunks]
+
+        self._term_counts = [Counter(tokenize(chunk)) for chunk in self.chunks]
+        self._lengths = [sum(counts.values()) for counts in self._term_counts]
+        self._average_length = (sum(self._lengths) / len(self._lengths)) if self._lengths else 0.0
+
+        df = Counter()
+        for counts in self._term_counts:
+            df.update(counts.keys())
+        n = len(self.chunks)
+        self._idf = {term: math.log(1.0 + (n - freq + 0.5) / (freq + 0.5)) for term, freq in df.items()}
+
+    def __len__(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def total_tokens(self) -> int:
+        return estimate_tokens(self.text)
+
+    def scores(self, question: str) -> List[float]:
+        """BM25 score of every chunk for the question."""
+        terms = [term for term in set(tokenize(question)) if term in self._idf]
+        scores = []
+        for counts, length in zip(self._term_counts, self._lengths):
+            norm = self.k1 * (1.0 - self.b + self.b * length / (self._average_length or 1.0))
+            scores.append(sum(
+                self._idf[term] * counts[term] * (self.k1 + 1.0) / (counts[term] + norm)
+                for term in terms if term in counts
+            ))
+        return scores
+
+    def select(self, question: str, budget_tokens: int, top_k: int = 4, lead_chunks: int = 1) -> str:
+        """The lead chunks plus the top_k chunks for the question that fit in budget_tokens."""
+        if self.total_tokens <= budget_tokens:
+            return self.text
+
+        scores = self.scores(question)
+        ranked = sorted((i for i in range(len(self.chunks)) if scores[i] > 0), key=lambda i: -scores[i])[:top_k]
+        if not ranked:
+            ranked = list(range(len(self.chunks)))
+
+        selected, used = set(), 0
+        for i in list(range(min(lead_chunks, len(self.chunks)))) + ranked:
+            if i in selected or used + self.chunk_token_counts[i] > budget_tokens:
+                continue
+            selected.add(i)
+            used += self.chunk_token_counts[i]
+        return '\n'.join(self.chunks[i] for i in sorted(selected))
+
+
+def last_question(messages: List[dict]) -> Optional[str]:
+    """The newest interviewer message (the question being answered)."""
+    for message in reversed(messages):
+        if message.get('role') == 'user':
+            return message.get('content')
+    return None
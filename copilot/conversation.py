@@ -0,0 +1,158 @@
+"""
+Conversation History
+Token-budgeted interview history: recent turns verbatim, older turns folded into a running summary
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from .tokens import CHARS_PER_TOKEN, estimate_tokens
+
+# Approximate per-message overhead of the chat format (role, separators)
+MESSAGE_OVERHEAD_TOKENS = 4
+
+Summarizer = Callable[[str, List[Dict]], Awaitable[str]]
+
+
+def message_tokens(message: Dict) -> int:
+    return estimate_tokens(message.get('content') or '') + MESSAGE_OVERHEAD_TOKENS
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Keep the newest (last) part of a text that is over max_tokens."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    return text if len(text) <= max_chars else '...' + text[-max_chars:]
+
+
+def compact_summary(summary: str, messages: List[Dict], max_tokens: int) -> str:
+    """
+    Extractive fallback for folding turns into the summary (no LLM call):
+    keeps the start of each question and answer, and the newest part if it gets too long.
+    """
+    lines = [summary] if summary else []
+    for message in messages:
+        prefix = 'Q' if message['role'] == 'user' else 'A'
+        limit = 160 if prefix == 'Q' else 240
+        content = ' '.join((message.get('content') or '').split())
+        lines.append(f"{prefix}: {content[:limit]}{'...' if len(content) > limit else ''}")
+
+    return truncate_to_tokens('\n'.join(lines), max_tokens)
+
+
+def fit_messages_to_budget(system_prompt: str, messages: List[Dict], budget_tokens: int) -> List[Dict]:
+    """
+    Trim messages so that the system prompt plus messages stay within budget_tokens.
+
+    Drops the oldest verbatim turns first, then the history summary, and as a last resort
+    shortens the current (last) message. Never drops the current message.
+    """
+    messages = list(messages)
+    used = estimate_tokens(system_prompt) + sum(message_tokens(m) for m in messages)
+
+    # Oldest verbatim messages first (the summary, if present, is the leading system message)
+    start = 1 if messages and messages[0]['role'] == 'system' else 0
+    while used > budget_tokens and len(messages) - start > 1:
+        used -= message_tokens(messages.pop(start))
+    if used > budget_tokens and start:
+        used -= message_tokens(messages.pop(0))
+
+    if used > budget_tokens and messages:
+        last = messages[-1]
+        allowed_chars = max(0, (budget_tokens - (used - message_tokens(last)) - MESSAGE_OVERHEAD_TOKENS) * CHARS_PER_TOKEN)
+        messages[-1] = {**last, 'content': last['content'][-allowed_chars:] if allowed_chars else ''}
+
+    return messages
+
+
+class ConversationHistory:
+    """
+    Interview history for one session.
+
+    append() takes chat messages as before; for_prompt() returns what to send to the LLM:
+    the running summary of older turns (as a system message) followed by the last keep_turns
+    question/answer pairs verbatim. Once more than fold_after turns are beyond that window,
+    they are folded into the summary in the background with the injected summarizer (an LLM
+    call); if it fails, an extractive summary is used instead. The summary is capped at
+    summary_max_tokens.
+    """
+
+    def __init__(self, summarizer: Optional[Summarizer] = None, keep_turns: int = 4, fold_after: int = 2,
+                 summary_max_tokens: int = 300):
+        self.summarizer = summarizer
+        self.keep_messages = keep_turns * 2
+        self.fold_after_messages = fold_after * 2
+        self.summary_max_tokens = summary_max_tokens
+        self.summary = ''
+        self._messages: List[Dict] = []
+        self._fold_task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.folded_messages = 0
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def __iter__(self):
+        return iter(self._messages)
+
+    def append(self, message: Dict):
+        self._messages.append(message)
+        if len(self._messages) - self.keep_messages >= self.fold_after_messages:
+            self._schedule_fold()
+
+    def for_prompt(self) -> List[Dict]:
+        """Summary of older turns plus the messages not folded yet (recent turns verbatim)."""
+        messages = []
+        if self.summary:
+            messages.append({
+                "role": "system",
+                "content": f"Summary of the interview so far (older questions and your answers):\n{self.summary}"
+            })
+        return messages + list(self._messages)
+
+    def _schedule_fold(self):
+        if self._fold_task is not None and not self._fold_task.done():
+            return
+        try:
+            self._fold_task = asyncio.get_running_loop().create_task(self._fold())
+        except RuntimeError:
+            # No event loop (sync caller): fold right away without the LLM
+            self._apply_fold(len(self._messages) - self.keep_messages, None)
+
+    def _apply_fold(self, count: int, summary: Optional[str]):
+        folded = self._messages[:count]
+        if summary is None:
+            summary = compact_summary(self.summary, folded, self.summary_max_tokens)
+        del self._messages[:count]
+        self.summary = summary
+        self.folded_messages += count
+
+    async def _fold(self):
+        # Messages are only ever appended, so the first `count` stay the same while we summarize
+        count = len(self._messages) - self.keep_messages
+        if count <= 0:
+            return
+        folded = self._messages[:count]
+
+        summary = None
+        if self.summarizer is not None:
+            try:
+                summary = truncate_to_tokens(await self.summarizer(self.summary, folded), self.summary_max_tokens)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"[History] Summarization failed, using extractive summary: {str(e)}")
+                summary = None
+
+        self._apply_fold(count, summary or None)
+        print(f"[History] Folded {count} messages into summary ({estimate_tokens(self.summary)} tokens), "
+              f"{len(self._messages)} kept verbatim")
+
+        # More turns may have arrived while summarizing
+        if len(self._messages) - self.keep_messages >= self.fold_after_messages:
+            self._fold_task = asyncio.get_running_loop().create_task(self._fold())
+
+    def close(self):
+        """Cancel a background fold (session ended)."""
+        if self._fold_task is not None and not self._fold_task.done():
+            self._fold_task.cancel()
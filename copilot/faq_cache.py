@@ -0,0 +1,565 @@
+"""
+Bounded FAQ Cache
+Size- and memory-bounded FAQ answer cache with pluggable eviction policies
+"""
+
+import bisect
+import heapq
+import itertools
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from .faq_index import FAQIndex
+
+# Approximate per-entry cost of the dict, datetime and bookkeeping around the two strings
+ENTRY_OVERHEAD_BYTES = 256
+
+
+def estimate_entry_bytes(entry: Dict) -> int:
+    """Rough memory footprint of a cache entry (question + answer text plus overhead)."""
+    return len(entry['question'].encode('utf-8')) + len(entry['answer'].encode('utf-8')) + ENTRY_OVERHEAD_BYTES
+
+
+class EvictionPolicy(ABC):
+    """
+    Chooses which unpinned entry to drop when the cache is over budget.
+
+    The cache reports every insert, removal, hit and access, so a policy can keep its own
+    ordering of the candidates instead of scanning all entries for each eviction.
+    """
+
+    name = 'base'
+
+    def on_insert(self, key: str, entry: Dict):
+        """An entry was inserted (or replaced)."""
+
+    def on_remove(self, key: str):
+        """An entry was removed (evicted, expired, replaced or deleted)."""
+
+    def on_hit(self, key: str, entry: Dict):
+        """An entry's hit_count was incremented."""
+
+    def on_access(self, key: str):
+        """An entry was read."""
+
+    def clear(self):
+        """The cache was emptied."""
+
+    @abstractmethod
+    def choose_victim(self, entries: 'OrderedDict[str, Dict]') -> Optional[str]:
+        """Key of the next entry to evict (without removing it), or None if everything left is pinned."""
+
+
+class LRUPolicy(EvictionPolicy):
+    """Least recently used - unpinned keys are kept in access order, oldest first."""
+
+    name = 'lru'
+
+    def __init__(self):
+        self._order: 'OrderedDict[str, None]' = OrderedDict()
+
+    def on_insert(self, key, entry):
+        if not entry.get('pinned'):
+            self._order[key] = None
+
+    def on_remove(self, key):
+        self._order.pop(key, None)
+
+    def on_access(self, key):
+        if key in self._order:
+            self._order.move_to_end(key)
+
+    def clear(self):
+        self._order.clear()
+
+    def choose_victim(self, entries):
+        return next(iter(self._order), None)
+
+
+class _HeapPolicy(EvictionPolicy):
+    """
+    Evicts the unpinned entry with the lowest priority, kept in a heap.
+
+    Heap items are invalidated lazily: each key maps to its current item, and stale items
+    (the key was removed or re-prioritized) are dropped when they reach the top. The heap is
+    rebuilt from the live items once stale ones outnumber them.
+    """
+
+    def __init__(self):
+        self._heap: List[Tuple] = []
+        self._live: Dict[str, Tuple] = {}
+        self._counter = itertools.count()
+
+    @abstractmethod
+    def _priority(self, entry: Dict):
+        """Sort key of an entry (lowest is evicted first)."""
+
+    def _push(self, key: str, entry: Dict):
+        # The counter breaks ties in favour of the entry touched least recently
+        item = (self._priority(entry), next(self._counter), key)
+        self._live[key] = item
+        heapq.heappush(self._heap, item)
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = list(self._live.values())
+            heapq.heapify(self._heap)
+
+    def on_insert(self, key, entry):
+        if not entry.get('pinned'):
+            self._push(key, entry)
+
+    def on_remove(self, key):
+        self._live.pop(key, None)
+
+    def clear(self):
+        self._heap = []
+        self._live.clear()
+
+    def choose_victim(self, entries):
+        while self._heap:
+            item = self._heap[0]
+            if self._live.get(item[2]) is item:
+                return item[2]
+            heapq.heappop(self._heap)
+        return None
+
+
+class LFUPolicy(_HeapPolicy):
+    """Least frequently used by hit_count, ties broken by least recent use."""
+
+    name = 'lfu'
+
+    def _priority(self, entry):
+        return entry['hit_count']
+
+    def on_hit(self, key, entry):
+        if key in self._live:
+            self._push(key, entry)
+
+
+class TTLPolicy(_HeapPolicy):
+    """Oldest timestamp first - the entry closest to expiring goes."""
+
+    name = 'ttl'
+
+    def _priority(self, entry):
+        return entry['timestamp']
+
+
+EVICTION_POLICIES = {
+    LRUPolicy.name: LRUPolicy,
+    LFUPolicy.name: LFUPolicy,
+    TTLPolicy.name: TTLPolicy,
+}
+
+
+class BoundedFAQCache:
+    """
+    Dict-like FAQ cache bounded by entry count and approximate memory use.
+
+    Entries are the usual FAQ cache dicts ({'question', 'answer', 'timestamp', 'hit_count'}).
+    Entries stored with pinned=True (preloaded FAQ answers) never expire or get evicted.
+    When ttl_seconds is set, unpinned entries older than that are dropped on access.
+
+    Statistics are kept up to date on insert/removal/hit instead of being computed by
+    scanning: running hit/pinned/per-language counters, the top_k most asked entries, and
+    a question-sorted index (overall and per language) used for paging and prefix search.
+    Hits must therefore go through record_hit() rather than editing hit_count directly.
+    """
+
+    def __init__(self, max_entries: int = 5000, max_bytes: int = 20 * 1024 * 1024,
+                 policy: str = 'lfu', ttl_seconds: float = 0, top_k: int = 10):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown eviction policy '{policy}'. Use one of: {', '.join(EVICTION_POLICIES)}")
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = EVICTION_POLICIES[policy]()
+        self.ttl = timedelta(seconds=ttl_seconds) if ttl_seconds else None
+        # Unpinned entries by age, to expire the oldest without scanning (only with a TTL)
+        self._expiry = TTLPolicy() if self.ttl is not None else None
+
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        # Running statistics
+        self.total_hits = 0
+        self._pinned_count = 0
+        self._partition_counts: Dict[str, int] = {}
+        # Most asked keys, highest hit_count first (refilled by a scan only after one is removed)
+        self.top_k = top_k
+        self._top: List[str] = []
+        self._top_stale = False
+        # (lowercased question, key) pairs kept sorted; None holds all languages
+        self._sorted: Dict[Optional[str], List[Tuple[str, str]]] = {None: []}
+
+        # Counters
+        self.evictions = 0
+        self.expirations = 0
+        # Bumped on every insert/removal so callers can tell if the cache changed under them
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key) -> Dict:
+        return self._entries[key]
+
+    def __setitem__(self, key, entry: Dict):
+        self.put(key, entry)
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._entries.keys())
+
+    def values(self) -> List[Dict]:
+        with self._lock:
+            return list(self._entries.values())
+
+    def items(self) -> List[Tuple[str, Dict]]:
+        with self._lock:
+            return list(self._entries.items())
+
+    def snapshot(self) -> Tuple[List[Tuple[str, Dict]], int]:
+        """All entries together with the version they belong to."""
+        with self._lock:
+            return list(self._entries.items()), self.version
+
+    def _is_expired(self, entry: Dict, now: datetime) -> bool:
+        return self.ttl is not None and not entry.get('pinned') and now - entry['timestamp'] > self.ttl
+
+    @staticmethod
+    def _sort_key(entry: Dict, key: str) -> Tuple[str, str]:
+        return entry['question'].lower(), key
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= self._sizes.pop(key)
+        self.version += 1
+        self.policy.on_remove(key)
+        if self._expiry is not None:
+            self._expiry.on_remove(key)
+
+        language = entry.get('language', 'en')
+        self.total_hits -= entry['hit_count']
+        self._pinned_count -= bool(entry.get('pinned'))
+        self._partition_counts[language] -= 1
+        if not self._partition_counts[language]:
+            del self._partition_counts[language]
+
+        sort_key = self._sort_key(entry, key)
+        for index in (self._sorted[None], self._sorted[language]):
+            del index[bisect.bisect_left(index, sort_key)]
+
+        if key in self._top:
+            self._top.remove(key)
+            self._top_stale = True
+
+    def _insert(self, key: str, entry: Dict):
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = entry
+        self._sizes[key] = estimate_entry_bytes(entry)
+        self._bytes += self._sizes[key]
+        self.version += 1
+        self.policy.on_insert(key, entry)
+        if self._expiry is not None:
+            self._expiry.on_insert(key, entry)
+
+        language = entry.get('language', 'en')
+        self.total_hits += entry['hit_count']
+        self._pinned_count += bool(entry.get('pinned'))
+        self._partition_counts[language] = self._partition_counts.get(language, 0) + 1
+
+        sort_key = self._sort_key(entry, key)
+        bisect.insort(self._sorted[None], sort_key)
+        bisect.insort(self._sorted.setdefault(language, []), sort_key)
+
+        self._offer_top(key)
+
+    def _offer_top(self, key: str):
+        """Keep the top-K list current after an entry was inserted or its hit count grew."""
+        hits = self._entries[key]['hit_count']
+        if key in self._top:
+            self._top.remove(key)
+        elif len(self._top) >= self.top_k and hits <= self._entries[self._top[-1]]['hit_count']:
+            return
+
+        position = len(self._top)
+        while position > 0 and self._entries[self._top[position - 1]]['hit_count'] < hits:
+            position -= 1
+        self._top.insert(position, key)
+        del self._top[self.top_k:]
+
+    def record_hit(self, key: str) -> Optional[Dict]:
+        """Count a hit on an entry. Returns the entry, or None if it is no longer cached."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            entry['hit_count'] += 1
+            self.total_hits += 1
+            self.policy.on_hit(key, entry)
+            self._offer_top(key)
+            return entry
+
+    def top(self, n: Optional[int] = None) -> List[Tuple[str, Dict]]:
+        """The n (at most top_k) most asked entries, highest hit_count first."""
+        with self._lock:
+            if self._top_stale:
+                self._top = heapq.nlargest(self.top_k, self._entries, key=lambda k: self._entries[k]['hit_count'])
+                self._top_stale = False
+            return [(key, self._entries[key]) for key in self._top[:n]]
+
+    def partition_counts(self) -> Dict[str, int]:
+        """Number of entries per language."""
+        with self._lock:
+            return dict(self._partition_counts)
+
+    def page(self, offset: int = 0, limit: int = 50, language: Optional[str] = None, prefix: str = '',
+             search: str = '', source: Optional[str] = None) -> Tuple[int, List[Tuple[str, Dict]]]:
+        """
+        One page of entries in question order.
+
+        Language and question-prefix filters are answered from the sorted index
+        (binary search, then a slice). The optional substring search (question or
+        answer) and source filter ('file' for pinned entries, 'llm' otherwise) scan
+        only the entries in that range.
+
+        Returns:
+            (number of matching entries, [(key, entry), ...] for the requested page)
+        """
+        prefix = prefix.lower()
+        search = search.lower()
+        with self._lock:
+            index = self._sorted.get(language, [])
+            lo = bisect.bisect_left(index, (prefix,)) if prefix else 0
+            hi = bisect.bisect_left(index, (prefix + '\U0010ffff',)) if prefix else len(index)
+
+            if not search and source is None:
+                page = index[lo + offset:min(lo + offset + max(limit, 0), hi)]
+                return hi - lo, [(key, self._entries[key]) for _, key in page]
+
+            total, page = 0, []
+            for position in range(lo, hi):
+                question, key = index[position]
+                entry = self._entries[key]
+                if source is not None and (source == 'file') != bool(entry.get('pinned')):
+                    continue
+                if search and search not in question and search not in entry['answer'].lower():
+                    continue
+                if offset <= total < offset + limit:
+                    page.append((key, entry))
+                total += 1
+            return total, page
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Look up an entry, dropping it if expired and marking it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._is_expired(entry, datetime.now()):
+                self._remove(key)
+                self.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            self.policy.on_access(key)
+            return entry
+
+    def put(self, key: str, entry: Dict, pinned: bool = False) -> List[str]:
+        """
+        Insert or replace an entry, evicting others if the cache is over budget.
+
+        Returns:
+            Keys that were expired or evicted to make room
+        """
+        if pinned:
+            entry['pinned'] = True
+
+        with self._lock:
+            self._insert(key, entry)
+            return self._enforce_limits()
+
+    def apply(self, puts: Dict[str, Dict], removals: List[str],
+              expected_version: Optional[int] = None) -> Tuple[List[str], bool]:
+        """
+        Insert/replace and remove a batch of entries in one step, so concurrent readers
+        see either the old or the new contents and never anything in between.
+
+        Args:
+            puts: Entries to insert or replace
+            removals: Keys to remove
+            expected_version: Cache version the batch was computed against
+
+        Returns:
+            (keys expired or evicted to make room, whether the cache changed since expected_version)
+        """
+        with self._lock:
+            changed = expected_version is not None and self.version != expected_version
+            for key in removals:
+                if key in self._entries:
+                    self._remove(key)
+            for key, entry in puts.items():
+                self._insert(key, entry)
+            return self._enforce_limits(), changed
+
+    def _over_budget(self) -> bool:
+        return len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+
+    def _enforce_limits(self) -> List[str]:
+        removed = []
+        if not self._over_budget():
+            return removed
+
+        # Expired entries go first (oldest first, stopping at the first one still fresh)
+        if self._expiry is not None:
+            now = datetime.now()
+            while True:
+                key = self._expiry.choose_victim(self._entries)
+                if key is None or not self._is_expired(self._entries[key], now):
+                    break
+                self._remove(key)
+                self.expirations += 1
+                removed.append(key)
+
+        while self._over_budget():
+            victim = self.policy.choose_victim(self._entries)
+            if victim is None:
+                # Everything left is pinned
+                break
+            self._remove(victim)
+            self.evictions += 1
+            removed.append(victim)
+
+        return removed
+
+    def pop(self, key: str, default=None):
+        with self._lock:
+            if key not in self._entries:
+                return default
+            entry = self._entries[key]
+            self._remove(key)
+            return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+            self.version += 1
+            self.total_hits = 0
+            self._pinned_count = 0
+            self._partition_counts.clear()
+            self._sorted = {None: []}
+            self._top = []
+            self._top_stale = False
+            self.policy.clear()
+            if self._expiry is not None:
+                self._expiry.clear()
+
+    def stats(self) -> Dict:
+        """Capacity, memory use and eviction counters."""
+        with self._lock:
+            return {
+                'eviction_policy': self.policy.name,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'bytes_used': self._bytes,
+                'pinned_entries': self._pinned_count,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+
+class SpeculativeAnswerCache:
+    """
+    Short-lived answers generated ahead of time for predicted questions.
+
+    Entries expire after ttl_seconds and are consumed on first use. Lookups match the
+    question exactly (by key) or fuzzily through a small FAQIndex over the predictions,
+    which is updated in place as entries come and go (and compacted when storing).
+    """
+
+    def __init__(self, ttl_seconds: float = 300, threshold: float = 0.75, max_entries: int = 100):
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._index = FAQIndex(threshold=threshold)
+        self._lock = threading.Lock()
+
+        # Counters
+        self.stored = 0
+        self.used = 0
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def _purge_expired(self):
+        now = datetime.now()
+        for key, entry in list(self._entries.items()):
+            if now - entry['timestamp'] > self.ttl:
+                del self._entries[key]
+                self._index.remove(key)
+                self.expired += 1
+
+    def put(self, key: str, question: str, answer: str):
+        """Store a prefetched answer (oldest entries are dropped beyond max_entries)."""
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = {'question': question, 'answer': answer, 'timestamp': datetime.now()}
+            self._index.add(key, question)
+            while len(self._entries) > self.max_entries:
+                self._index.remove(self._entries.popitem(last=False)[0])
+            if self._index.needs_compaction:
+                self._index.build({k: entry['question'] for k, entry in self._entries.items()})
+            self.stored += 1
+
+    def take(self, key: str, question: str) -> Optional[Tuple[Dict, float]]:
+        """
+        Remove and return the prefetched answer for a question.
+
+        Returns:
+            (entry, similarity) or None
+        """
+        with self._lock:
+            self._purge_expired()
+            if not self._entries:
+                return None
+
+            similarity = 1.0
+            if key not in self._entries:
+                match = self._index.search(question)
+                if match is None:
+                    return None
+                key, similarity = match
+
+            entry = self._entries.pop(key)
+            self._index.remove(key)
+            self.used += 1
+            return entry, similarity
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._index.build({})
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                'speculative_entries': len(self._entries),
+                'speculative_stored': self.stored,
+                'speculative_used': self.used,
+                'speculative_expired': self.expired
+            }
@@ -0,0 +1,300 @@
+"""
+FAQ Retrieval Index
+Fuzzy lookup of cached FAQ questions using character n-gram TF-IDF vectors
+"""
+
+import math
+import re
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Spoken filler that shows up in live transcripts but never changes what a question asks
+# (hesitations and hedges)
+FILLER_WORDS = {
+    'um', 'umm', 'uh', 'uhh', 'uhm', 'er', 'erm', 'ah', 'hmm', 'mm',
+    'basically', 'actually', 'exactly', 'really', 'literally', 'please'
+}
+
+# Discourse markers: filler when they open a clause ("so, ...", "like, ...", "..., right?"),
+# content words anywhere else ("how well", "what does it look like")
+CLAUSE_MARKERS = {'so', 'well', 'like', 'now', 'ok', 'okay', 'alright', 'right', 'anyway'}
+
+# Openings that frame a question without changing what it asks ("can you tell me what ETL is?")
+FRAMING_PREFIXES = [
+    ('can', 'you', 'tell', 'me'), ('could', 'you', 'tell', 'me'), ('would', 'you', 'tell', 'me'), ('tell', 'me'),
+    ('i', 'want', 'to', 'know'), ('i', 'would', 'like', 'to', 'know'), ('i', 'd', 'like', 'to', 'know')
+]
+
+_IS_CONTRACTION = re.compile(r"\b(what|how|where|who|when|why|that|it|there)['’]s\b")
+
+
+class FAQIndex:
+    """
+    In-memory retrieval index over FAQ questions.
+
+    Each question is turned into a bag of character n-grams (word-boundary padded),
+    weighted with sublinear TF-IDF and L2-normalized. Vectors are stored column-wise
+    (CSC layout in three flat NumPy arrays), so a lookup only touches the postings of
+    the n-grams present in the query and scores every entry with one np.bincount.
+
+    add() and remove() update the index in place without a rebuild: removed entries are
+    masked out of the matrix, added ones go to a small side matrix (COO triplets, weighted
+    with the IDF of the last build) that is scored the same way. Once needs_compaction is set, the
+    owner should build() a fresh index off the request path and swap it in.
+    """
+
+    def __init__(self, ngram_range: Tuple[int, int] = (2, 4), threshold: float = 0.75, max_pending: int = 64):
+        self.ngram_range = ngram_range
+        self.threshold = threshold
+        self.max_pending = max_pending
+        self._keys: List[str] = []
+        self._rows_of: Dict[str, int] = {}
+        self._vocab: Dict[str, int] = {}
+        self._idf = np.zeros(0, dtype=np.float32)
+        self._max_idf = 1.0
+        # CSC postings: rows/weights of column c live in [_indptr[c], _indptr[c + 1])
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._rows = np.zeros(0, dtype=np.int32)
+        self._weights = np.zeros(0, dtype=np.float32)
+        # Changes since the last build
+        self._removed = np.zeros(0, dtype=bool)
+        self._removed_count = 0
+        self._added: Dict[str, int] = {}  # key -> slot in the side matrix (live entries only)
+        self._added_keys: List[Optional[str]] = []  # By slot, None once removed
+        self._added_vocab: Dict[str, int] = {}
+        self._added_triplets: Tuple[List[int], List[int], List[float]] = ([], [], [])
+        self._added_arrays: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def __len__(self) -> int:
+        return len(self._keys) - self._removed_count + len(self._added)
+
+    def __contains__(self, key) -> bool:
+        return key in self._added or (key in self._rows_of and not self._removed[self._rows_of[key]])
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Enough entries were added or removed since build() that a rebuild pays off."""
+        return (len(self._added) > max(self.max_pending, len(self._keys) // 16)
+                or self._removed_count > max(self.max_pending, len(self._keys) // 4))
+
+    def _tokenize(self, text: str) -> List[str]:
+        """Lowercase words without punctuation, filler words, clause-opening markers and question framing."""
+        text = _IS_CONTRACTION.sub(r'\1 is', text.lower())
+        words, content = [], []
+        for clause in re.split(r"[^\w\s'’]+", text):
+            clause_words = re.sub(r"['’]", ' ', clause).split()
+            words.extend(clause_words)
+            clause_words = [w for w in clause_words if w not in FILLER_WORDS]
+            start = 0
+            while True:
+                while start < len(clause_words) and clause_words[start] in CLAUSE_MARKERS:
+                    start += 1
+                prefix = next((p for p in FRAMING_PREFIXES if tuple(clause_words[start:start + len(p)]) == p), None)
+                if prefix is None:
+                    break
+                start += len(prefix)
+            content.extend(clause_words[start:])
+        # Keep the original words if the question was nothing but filler
+        return content or words
+
+    def _ngrams(self, text: str) -> Counter:
+        """
+        Character n-grams of each word, padded with spaces to mark boundaries.
+
+        Whole words are added as extra features so that short acronyms sharing most
+        of their characters (ETL/ELT, OLTP/OLAP) still separate cleanly.
+        """
+        grams = Counter()
+        low, high = self.ngram_range
+        for word in self._tokenize(text):
+            grams[f'<{word}>'] += 1
+            padded = f' {word} '
+            for n in range(low, high + 1):
+                for i in range(len(padded) - n + 1):
+                    grams[padded[i:i + n]] += 1
+        return grams
+
+    def _weigh(self, grams: Counter) -> Tuple[Dict[str, float], float]:
+        """Sublinear TF-IDF weight per n-gram (unseen n-grams get the maximum IDF) and the squared norm."""
+        weights = {}
+        norm_sq = 0.0
+        for gram, count in grams.items():
+            col = self._vocab.get(gram)
+            w = (1.0 + math.log(count)) * (self._max_idf if col is None else float(self._idf[col]))
+            weights[gram] = w
+            norm_sq += w * w
+        return weights, norm_sq
+
+    def add(self, key: str, text: str):
+        """Index (or re-index) one entry without rebuilding."""
+        self.remove(key)
+        weights, norm_sq = self._weigh(self._ngrams(text))
+        norm = math.sqrt(norm_sq) or 1.0
+        slot = len(self._added_keys)
+        rows, cols, values = self._added_triplets
+        for gram, w in weights.items():
+            rows.append(slot)
+            cols.append(self._added_vocab.setdefault(gram, len(self._added_vocab)))
+            values.append(w / norm)
+        self._added_keys.append(key)
+        self._added[key] = slot
+        self._added_arrays = None
+
+    def remove(self, key: str):
+        """Drop one entry from the results (a no-op for unknown keys)."""
+        slot = self._added.pop(key, None)
+        if slot is not None:
+            self._added_keys[slot] = None
+            return
+        row = self._rows_of.get(key)
+        if row is not None and not self._removed[row]:
+            self._removed[row] = True
+            self._removed_count += 1
+
+    def build(self, entries: Dict[str, str]):
+        """
+        (Re)build the index.
+
+        Args:
+            entries: Mapping of cache key -> question text
+        """
+        keys = list(entries.keys())
+        docs = [self._ngrams(entries[key]) for key in keys]
+
+        # Vocabulary and document frequencies
+        vocab: Dict[str, int] = {}
+        df: List[int] = []
+        for grams in docs:
+            for gram in grams:
+                col = vocab.get(gram)
+                if col is None:
+                    vocab[gram] = len(df)
+                    df.append(1)
+                else:
+                    df[col] += 1
+
+        n_docs = len(docs)
+        idf = np.log((1.0 + n_docs) / (1.0 + np.asarray(df, dtype=np.float64))) + 1.0
+
+        # Build COO triplets with normalized TF-IDF weights
+        rows, cols, weights = [], [], []
+        for row, grams in enumerate(docs):
+            if not grams:
+                continue
+            doc_cols = np.fromiter((vocab[g] for g in grams), dtype=np.int64, count=len(grams))
+            tf = 1.0 + np.log(np.fromiter(grams.values(), dtype=np.float64, count=len(grams)))
+            w = tf * idf[doc_cols]
+            w /= np.linalg.norm(w)
+            rows.append(np.full(len(grams), row, dtype=np.int32))
+            cols.append(doc_cols)
+            weights.append(w)
+
+        if rows:
+            rows = np.concatenate(rows)
+            cols = np.concatenate(cols)
+            weights = np.concatenate(weights).astype(np.float32)
+            order = np.argsort(cols, kind='stable')
+            rows, cols, weights = rows[order], cols[order], weights[order]
+        else:
+            rows = np.zeros(0, dtype=np.int32)
+            cols = np.zeros(0, dtype=np.int64)
+            weights = np.zeros(0, dtype=np.float32)
+
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(cols, minlength=len(vocab)), out=indptr[1:])
+
+        self._keys = keys
+        self._rows_of = {key: row for row, key in enumerate(keys)}
+        self._removed = np.zeros(len(keys), dtype=bool)
+        self._removed_count = 0
+        self._added = {}
+        self._added_keys = []
+        self._added_vocab = {}
+        self._added_triplets = ([], [], [])
+        self._added_arrays = None
+        self._vocab = vocab
+        self._idf = idf.astype(np.float32)
+        self._max_idf = math.log((1.0 + n_docs) / 1.0) + 1.0
+        self._indptr = indptr
+        self._rows = rows
+        self._weights = weights
+
+    def search(self, question: str) -> Optional[Tuple[str, float]]:
+        """
+        Find the most similar indexed question.
+
+        Returns:
+            (key, similarity) of the best match above the threshold, or None
+        """
+        match = self.best_match(question)
+        if match is None or match[1] < self.threshold:
+            return None
+        return match
+
+    def best_match(self, question: str) -> Optional[Tuple[str, float]]:
+        """
+        Most similar indexed question regardless of the threshold (useful to see near misses).
+
+        Returns:
+            (key, similarity), or None if the question shares nothing with the index
+        """
+        if not len(self):
+            return None
+
+        grams = self._ngrams(question)
+        if not grams:
+            return None
+
+        # Query vector: n-grams unseen in the corpus only count towards the norm
+        # (with the maximum IDF), which penalizes questions about unknown topics
+        query, norm_sq = self._weigh(grams)
+        query_cols, query_weights = [], []
+        for gram, w in query.items():
+            col = self._vocab.get(gram)
+            if col is not None:
+                query_cols.append(col)
+                query_weights.append(w)
+
+        best_key, best_score = None, 0.0
+        if query_cols and len(self._keys) > self._removed_count:
+            starts = self._indptr[query_cols]
+            lengths = self._indptr[np.asarray(query_cols) + 1] - starts
+            positions = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            scores = np.bincount(
+                self._rows[positions],
+                weights=self._weights[positions] * np.repeat(np.asarray(query_weights, dtype=np.float32), lengths),
+                minlength=len(self._keys)
+            )
+            if self._removed_count:
+                scores[self._removed] = -1.0
+
+            best = int(np.argmax(scores))
+            if scores[best] > 0:
+                best_key, best_score = self._keys[best], float(scores[best])
+
+        # Entries added since the last build
+        if self._added:
+            if self._added_arrays is None:
+                rows, cols, values = self._added_triplets
+                self._added_arrays = (np.asarray(rows, dtype=np.int32), np.asarray(cols, dtype=np.int64),
+                                      np.asarray(values, dtype=np.float32))
+            rows, cols, values = self._added_arrays
+            query_vector = np.zeros(len(self._added_vocab), dtype=np.float32)
+            for gram, w in query.items():
+                col = self._added_vocab.get(gram)
+                if col is not None:
+                    query_vector[col] = w
+            scores = np.bincount(rows, weights=values * query_vector[cols], minlength=len(self._added_keys))
+            for slot in np.argsort(scores)[::-1]:
+                if scores[slot] <= best_score:
+                    break
+                if self._added_keys[slot] is not None:
+                    best_key, best_score = self._added_keys[slot], float(scores[slot])
+                    break
+
+        if best_key is None:
+            return None
+        return best_key, best_score / math.sqrt(norm_sq)
@@ -0,0 +1,163 @@
+"""
+FAQ Cache Metrics
+Hit rate, near-miss similarity, lookup latency and estimated LLM savings of the FAQ cache
+"""
+
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+from .tokens import estimate_tokens
+
+# Upper bounds of the near-miss similarity histogram buckets
+SIMILARITY_BUCKETS = (0.3, 0.4, 0.5, 0.6, 0.65, 0.7, 0.75, 0.8, 0.9, 1.0)
+LATENCY_QUANTILES = (0.5, 0.9, 0.99)
+HIT_KINDS = ('exact', 'fuzzy', 'speculative')
+
+
+def _percentile(sorted_samples, quantile: float) -> float:
+    if not sorted_samples:
+        return 0.0
+    position = min(len(sorted_samples) - 1, int(round(quantile * (len(sorted_samples) - 1))))
+    return sorted_samples[position]
+
+
+class FAQCacheMetrics:
+    """
+    Counters for FAQ cache lookups in this process.
+
+    Records every lookup as a hit (exact, fuzzy or speculative) or a miss. For misses the
+    best similarity the fuzzy index found is put into a histogram, which shows how many
+    questions just missed the match threshold. Lookup latencies are kept in a window of
+    the most recent samples for percentiles. LLM savings are estimated per hit from the
+    cached answer length (tokens) and the average observed LLM response time (seconds).
+    """
+
+    def __init__(self, latency_window: int = 1000, default_llm_seconds: float = 3.0):
+        self.default_llm_seconds = default_llm_seconds
+        self._latencies = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.hits = {kind: 0 for kind in HIT_KINDS}
+            self.misses = 0
+            self.near_miss_buckets = [0] * len(SIMILARITY_BUCKETS)
+            self.near_miss_unmatched = 0  # Misses sharing nothing with the FAQ index
+            self.near_miss_similarity_sum = 0.0
+            self.lookup_seconds_total = 0.0
+            self.lookup_count = 0
+            self._latencies.clear()
+            self.llm_answers = 0
+            self.llm_seconds_total = 0.0
+            self.llm_tokens_total = 0
+            self.tokens_saved = 0
+            self.llm_seconds_saved = 0.0
+
+    def _record_latency(self, seconds: float):
+        self.lookup_seconds_total += seconds
+        self.lookup_count += 1
+        self._latencies.append(seconds)
+
+    def _average_llm_seconds(self) -> float:
+        return self.llm_seconds_total / self.llm_answers if self.llm_answers else self.default_llm_seconds
+
+    def record_hit(self, kind: str, latency_seconds: float, answer: str):
+        """Count a cache hit and the LLM call it saved."""
+        with self._lock:
+            self.hits[kind] += 1
+            self._record_latency(latency_seconds)
+            self.tokens_saved += estimate_tokens(answer)
+            self.llm_seconds_saved += self._average_llm_seconds()
+
+    def record_miss(self, best_similarity: Optional[float], latency_seconds: float):
+        """Count a cache miss with the best (below-threshold) fuzzy similarity, if any."""
+        with self._lock:
+            self.misses += 1
+            self._record_latency(latency_seconds)
+            if best_similarity is None:
+                self.near_miss_unmatched += 1
+                return
+            self.near_miss_similarity_sum += best_similarity
+            for i, bound in enumerate(SIMILARITY_BUCKETS):
+                if best_similarity <= bound:
+                    self.near_miss_buckets[i] += 1
+                    break
+            else:
+                self.near_miss_buckets[-1] += 1
+
+    def record_llm_answer(self, seconds: float, answer: str):
+        """Record a generated answer, used to estimate what a cache hit saves."""
+        with self._lock:
+            self.llm_answers += 1
+            self.llm_seconds_total += seconds
+            self.llm_tokens_total += estimate_tokens(answer)
+
+    def snapshot(self) -> Dict:
+        """All metrics as a JSON-friendly dict."""
+        with self._lock:
+            total_hits = sum(self.hits.values())
+            lookups = total_hits + self.misses
+            latencies = sorted(self._latencies)
+            cumulative, buckets = 0, {}
+            for bound, count in zip(SIMILARITY_BUCKETS, self.near_miss_buckets):
+                cumulative += count
+                buckets[f'{bound:g}'] = cumulative
+
+            return {
+                'lookups': lookups,
+                'hits': total_hits,
+                'hits_by_kind': dict(self.hits),
+                'misses': self.misses,
+                'hit_rate': total_hits / lookups if lookups else 0.0,
+                'near_miss_similarity': {
+                    'buckets': buckets,  # Cumulative counts of misses with similarity <= bucket
+                    'unmatched': self.near_miss_unmatched
+                },
+                'lookup_latency_ms': {
+                    'mean': 1000 * self.lookup_seconds_total / self.lookup_count if self.lookup_count else 0.0,
+                    **{f'p{int(q * 100)}': 1000 * _percentile(latencies, q) for q in LATENCY_QUANTILES},
+                    'window': len(latencies)
+                },
+                'llm_answers': self.llm_answers,
+                'llm_seconds_avg': self._average_llm_seconds(),
+                'estimated_llm_seconds_saved': self.llm_seconds_saved,
+                'estimated_tokens_saved': self.tokens_saved
+            }
+
+    def to_prometheus(self, prefix: str = 'faq_cache') -> str:
+        """All metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        with self._lock:
+            latencies = sorted(self._latencies)
+            lookup_seconds_total, lookup_count = self.lookup_seconds_total, self.lookup_count
+            similarity_sum = self.near_miss_similarity_sum
+
+        lines = [
+            f'# HELP {prefix}_hits_total FAQ cache hits.',
+            f'# TYPE {prefix}_hits_total counter',
+            *[f'{prefix}_hits_total{{kind="{kind}"}} {count}' for kind, count in snapshot['hits_by_kind'].items()],
+            f'# HELP {prefix}_misses_total FAQ cache misses.',
+            f'# TYPE {prefix}_misses_total counter',
+            f'{prefix}_misses_total {snapshot["misses"]}',
+            f'# HELP {prefix}_near_miss_similarity Best fuzzy similarity of questions that missed the cache.',
+            f'# TYPE {prefix}_near_miss_similarity histogram',
+            *[f'{prefix}_near_miss_similarity_bucket{{le="{bound}"}} {count}'
+              for bound, count in snapshot['near_miss_similarity']['buckets'].items()],
+            f'{prefix}_near_miss_similarity_bucket{{le="+Inf"}} {snapshot["misses"] - snapshot["near_miss_similarity"]["unmatched"]}',
+            f'{prefix}_near_miss_similarity_sum {similarity_sum:.6f}',
+            f'{prefix}_near_miss_similarity_count {snapshot["misses"] - snapshot["near_miss_similarity"]["unmatched"]}',
+            f'# HELP {prefix}_lookup_seconds FAQ cache lookup latency (quantiles over the recent window).',
+            f'# TYPE {prefix}_lookup_seconds summary',
+            *[f'{prefix}_lookup_seconds{{quantile="{q}"}} {_percentile(latencies, q):.6f}' for q in LATENCY_QUANTILES],
+            f'{prefix}_lookup_seconds_sum {lookup_seconds_total:.6f}',
+            f'{prefix}_lookup_seconds_count {lookup_count}',
+            f'# HELP {prefix}_llm_seconds_saved_total Estimated LLM response time saved by cache hits.',
+            f'# TYPE {prefix}_llm_seconds_saved_total counter',
+            f'{prefix}_llm_seconds_saved_total {snapshot["estimated_llm_seconds_saved"]:.3f}',
+            f'# HELP {prefix}_tokens_saved_total Estimated completion tokens saved by cache hits.',
+            f'# TYPE {prefix}_tokens_saved_total counter',
+            f'{prefix}_tokens_saved_total {snapshot["estimated_tokens_saved"]}',
+        ]
+        return '\n'.join(lines) + '\n'
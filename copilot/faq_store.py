@@ -0,0 +1,129 @@
+"""
+FAQ Answer Store
+Durable SQLite persistence for the FAQ cache with batched write-behind
+"""
+
+import threading
+from typing import Dict, Iterable, List, Tuple
+
+from django.db import transaction
+from django.db.models import F
+
+from .models import FAQEntry
+
+
+class FAQStore:
+    """
+    Buffers FAQ cache writes in memory and flushes them to the database in batches.
+
+    Answers and hit counts are queued from the request path (cheap dict updates under a
+    lock) and written by flush(), which callers run off the event loop, either on a timer
+    or as soon as a batch is full.
+    """
+
+    def __init__(self, batch_size: int = 50):
+        self.batch_size = batch_size
+        self._pending_answers: Dict[str, Dict] = {}
+        self._pending_hits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def pending_count(self) -> int:
+        """Number of queued writes not yet flushed."""
+        with self._lock:
+            return len(self._pending_answers) + len(self._pending_hits)
+
+    def enqueue_answer(self, question_hash: str, question: str, answer: str, language: str = 'en',
+                       source: str = FAQEntry.SOURCE_LLM) -> bool:
+        """
+        Queue an answer for persistence (later writes for the same question win).
+
+        Returns:
+            True when the batch is full and should be flushed
+        """
+        with self._lock:
+            self._pending_answers[question_hash] = {
+                'question': question,
+                'answer': answer,
+                'language': language,
+                'source': source
+            }
+            return len(self._pending_answers) + len(self._pending_hits) >= self.batch_size
+
+    def record_hit(self, question_hash: str) -> bool:
+        """Queue a hit-count increment. Returns True when the batch is full."""
+        with self._lock:
+            self._pending_hits[question_hash] = self._pending_hits.get(question_hash, 0) + 1
+            return len(self._pending_answers) + len(self._pending_hits) >= self.batch_size
+
+    def flush(self) -> int:
+        """
+        Write all queued answers and hit counts in a single transaction.
+
+        On failure the queued writes are put back so the next flush retries them.
+
+        Returns:
+            Number of rows written
+        """
+        with self._lock:
+            answers, self._pending_answers = self._pending_answers, {}
+            hits, self._pending_hits = self._pending_hits, {}
+
+        if not answers and not hits:
+            return 0
+
+        try:
+            with transaction.atomic():
+                if answers:
+                    FAQEntry.objects.bulk_create(
+                        [FAQEntry(question_hash=question_hash, **fields) for question_hash, fields in answers.items()],
+                        update_conflicts=True,
+                        unique_fields=['question_hash'],
+                        update_fields=['question', 'answer', 'language', 'source', 'updated_at']
+                    )
+                for question_hash, delta in hits.items():
+                    FAQEntry.objects.filter(question_hash=question_hash).update(hit_count=F('hit_count') + delta)
+        except Exception:
+            with self._lock:
+                # Keep newer writes that arrived while we were flushing
+                for question_hash, fields in answers.items():
+                    self._pending_answers.setdefault(question_hash, fields)
+                for question_hash, delta in hits.items():
+                    self._pending_hits[question_hash] = self._pending_hits.get(question_hash, 0) + delta
+            raise
+
+        return len(answers) + len(hits)
+
+    def load_all(self) -> List[Dict]:
+        """Read every stored entry."""
+        return list(FAQEntry.objects.values(
+            'question_hash', 'question', 'answer', 'language', 'source', 'hit_count', 'updated_at'
+        ))
+
+    def replace_file_entries(self, entries: Iterable[Tuple[str, str, str, str]]) -> int:
+        """
+        Replace the stored FAQ-file entries with a new set, keeping LLM-learned answers.
+
+        Args:
+            entries: (question_hash, question, answer, language) tuples from the FAQ files
+
+        Returns:
+            Number of entries stored
+        """
+        objs = [
+            FAQEntry(question_hash=question_hash, question=question, answer=answer, language=language,
+                     source=FAQEntry.SOURCE_FILE)
+            for question_hash, question, answer, language in entries
+        ]
+
+        with transaction.atomic():
+            FAQEntry.objects.filter(source=FAQEntry.SOURCE_FILE).exclude(
+                question_hash__in=[obj.question_hash for obj in objs]
+            ).delete()
+            FAQEntry.objects.bulk_create(
+                objs,
+                update_conflicts=True,
+                unique_fields=['question_hash'],
+                update_fields=['question', 'answer', 'language', 'source', 'updated_at']
+            )
+
+        return len(objs)
@@ -0,0 +1,174 @@
+"""
+Interim Transcript Speculation
+Starts answering while the question is still being transcribed, and keeps the answer if the final transcript matches
+"""
+
+import asyncio
+import html
+import re
+import time
+from difflib import SequenceMatcher
+from typing import AsyncIterator, List, Optional
+
+from .faq_index import FILLER_WORDS
+
+# Words that open a question (en/pt/fr/es/de), matched on the first content words
+QUESTION_STARTERS = {
+    'what', 'how', 'why', 'when', 'where', 'which', 'who', 'can', 'could', 'would', 'do', 'did', 'does',
+    'have', 'has', 'is', 'are', 'tell', 'describe', 'explain', 'walk', 'give', 'share',
+    'qual', 'quais', 'como', 'por', 'quando', 'onde', 'quem', 'pode', 'poderia', 'você', 'fale', 'conte', 'descreva', 'explique',
+    'quel', 'quelle', 'quels', 'quelles', 'comment', 'pourquoi', 'quand', 'où', 'pouvez', 'parlez', 'décrivez', 'expliquez', 'est',
+    'cuál', 'cuáles', 'cómo', 'qué', 'cuándo', 'dónde', 'puede', 'podría', 'háblame', 'cuéntame', 'describe',
+    'was', 'wie', 'warum', 'wann', 'wo', 'welche', 'welcher', 'können', 'erzählen', 'beschreiben', 'erklären'
+}
+
+
+def clean_transcript(text: str) -> str:
+    """Plain text of a live transcript (the page sends it with speaker-label HTML)."""
+    return ' '.join(html.unescape(re.sub(r'<[^>]+>', ' ', text or '')).split())
+
+
+def _words(text: str) -> List[str]:
+    return [w for w in re.findall(r'\w+', text.lower()) if w not in FILLER_WORDS]
+
+
+def looks_like_question(text: str, min_words: int = 4) -> bool:
+    """A question mark, or enough words opening with a question word."""
+    words = _words(text)
+    if len(words) < min_words:
+        return False
+    return text.rstrip().endswith('?') or any(word in QUESTION_STARTERS for word in words[:3])
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    """Word-level similarity of two transcripts (1.0 = same words in the same order)."""
+    words_a, words_b = _words(a), _words(b)
+    if not words_a or not words_b:
+        return 0.0
+    return SequenceMatcher(None, words_a, words_b, autojunk=False).ratio()
+
+
+class SpeculativeAnswer:
+    """
+    An answer being generated for an interim transcript.
+
+    Chunks are buffered while nobody is watching; stream() replays the buffer and then
+    follows the live chunks, so a promoted answer continues seamlessly.
+    """
+
+    def __init__(self, question: str, source: AsyncIterator[str]):
+        self.question = question
+        self.started = time.perf_counter()
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+        self._task = asyncio.ensure_future(self._run(source))
+
+    async def _run(self, source: AsyncIterator[str]):
+        try:
+            async for chunk in source:
+                self.chunks.append(chunk)
+                self._changed.set()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done = True
+            self._changed.set()
+
+    async def stream(self) -> AsyncIterator[str]:
+        """Buffered then live chunks; raises the generation error (if any) after the last one."""
+        position = 0
+        try:
+            while True:
+                if position < len(self.chunks):
+                    position += 1
+                    yield self.chunks[position - 1]
+                    continue
+                if self.done:
+                    if self.error is not None:
+                        raise self.error
+                    return
+                self._changed.clear()
+                await self._changed.wait()
+        finally:
+            # The reader went away (e.g. the client disconnected) - stop generating
+            self.cancel()
+
+    def cancel(self):
+        if not self._task.done():
+            self._task.cancel()
+
+
+class InterimSpeculator:
+    """
+    Per-session speculation on interim transcripts.
+
+    observe() is fed every live transcript update and returns the text to start answering
+    once it looks like a complete question and is stable: committed by the recognizer
+    (is_final) or unchanged since the previous update. take() is called with the final
+    transcript: the running answer is promoted if the texts are at least match_threshold
+    similar, and cancelled otherwise. At most max_per_question answers are started
+    between two final transcripts, so a long monologue cannot start an answer per word.
+    """
+
+    def __init__(self, match_threshold: float = 0.85, min_words: int = 4, max_per_question: int = 3):
+        self.match_threshold = match_threshold
+        self.min_words = min_words
+        self.max_per_question = max_per_question
+        self.current: Optional[SpeculativeAnswer] = None
+        self._last_text = ''
+        self._started_for_question = 0
+
+        # Counters
+        self.started = 0
+        self.promoted = 0
+        self.discarded = 0
+
+    def observe(self, text: str, is_final: bool = False) -> Optional[str]:
+        """Returns the question to speculate on now, or None."""
+        text = clean_transcript(text)
+        stable = is_final or text == self._last_text
+        self._last_text = text
+        if not text or not stable or not looks_like_question(text, self.min_words):
+            return None
+        if self.current is not None and transcript_similarity(self.current.question, text) >= self.match_threshold:
+            return None  # The running answer already covers it
+        if self._started_for_question >= self.max_per_question:
+            return None
+        return text
+
+    def start(self, question: str, source: AsyncIterator[str]) -> SpeculativeAnswer:
+        """Start answering `question` from `source` (replaces a running answer)."""
+        if self.current is not None:
+            self.current.cancel()
+            self.discarded += 1
+        self.current = SpeculativeAnswer(question, source)
+        self.started += 1
+        self._started_for_question += 1
+        return self.current
+
+    def take(self, final_text: str) -> Optional[SpeculativeAnswer]:
+        """The running answer if it matches the final transcript (otherwise it is cancelled)."""
+        speculation, self.current = self.current, None
+        self._last_text = ''
+        self._started_for_question = 0
+        if speculation is None:
+            return None
+
+        similarity = transcript_similarity(speculation.question, clean_transcript(final_text))
+        if similarity >= self.match_threshold and speculation.error is None:
+            self.promoted += 1
+            return speculation
+
+        speculation.cancel()
+        self.discarded += 1
+        print(f"[SPECULATIVE] Discarded answer for '{speculation.question[:50]}' (similarity {similarity:.2f})")
+        return None
+
+    def cancel(self):
+        if self.current is not None:
+            self.current.cancel()
+            self.current = None
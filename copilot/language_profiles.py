@@ -0,0 +1,120 @@
+"""
+Language Profile Samples
+Reference text per language, from which copilot.language builds its character n-gram profiles
+"""
+
+# Everyday and interview / engineering language, so the profiles fit both small talk and
+# technical questions. Product names and English loanwords are left out on purpose: they
+# look the same in every language and would only blur the profiles.
+SAMPLES = {
+    'en': """
+        Tell me about yourself and your professional background. What are your greatest strengths and weaknesses?
+        Why do you want to work for our company, and where do you see yourself in five years?
+        Describe a situation where you had to solve a difficult problem with your team.
+        How do you handle pressure, tight deadlines and changing priorities at work?
+        Can you walk me through the most challenging project you have worked on recently?
+        What would your previous manager say about you? How did you measure the results of that work?
+        I have been working as a software engineer for the last eight years, mostly building data pipelines.
+        In my current role I am responsible for the design, development and maintenance of our services.
+        We improved the performance of the reporting system and reduced the processing time by half.
+        The main goal of the project was to make the information available to the business every morning.
+        I usually start by understanding the requirements, then I break the work into smaller tasks.
+        When something goes wrong, I try to find the root cause instead of only fixing the symptoms.
+        Thank you for the opportunity, I would like to know more about the team and the next steps.
+        Which tools do you use to test your code? What is the difference between these two approaches?
+        There were several people involved, and everyone had a different opinion about the right solution.
+        We should always think about the quality of the data, the security of the system and the cost.
+        Could you explain how you would scale this application if the number of users doubled tomorrow?
+        I enjoy learning new things, and I believe that communication is just as important as technical knowledge.
+        They were able to deliver the first version within three months, which was faster than expected.
+        What does a typical day look like for someone in this position? How large is the team?
+    """,
+    'pt': """
+        Fale um pouco sobre você e a sua trajetória profissional. Quais são os seus pontos fortes e fracos?
+        Por que você quer trabalhar na nossa empresa e onde você se vê daqui a cinco anos?
+        Descreva uma situação em que você precisou resolver um problema difícil com a sua equipe.
+        Como você lida com pressão, prazos apertados e mudanças de prioridade no trabalho?
+        Você pode me explicar o projeto mais desafiador em que trabalhou recentemente?
+        O que o seu gestor anterior diria sobre você? Como você mediu os resultados desse trabalho?
+        Eu trabalho como engenheiro de software há oito anos, principalmente construindo fluxos de dados.
+        Na minha função atual sou responsável pelo desenho, desenvolvimento e manutenção dos nossos serviços.
+        Nós melhoramos o desempenho do sistema de relatórios e reduzimos o tempo de processamento pela metade.
+        O objetivo principal do projeto era disponibilizar as informações para a área de negócios todas as manhãs.
+        Normalmente começo entendendo os requisitos, depois divido o trabalho em tarefas menores.
+        Quando algo dá errado, tento encontrar a causa raiz em vez de apenas corrigir os sintomas.
+        Obrigado pela oportunidade, gostaria de saber mais sobre a equipe e os próximos passos.
+        Quais ferramentas você usa para testar o seu código? Qual é a diferença entre essas duas abordagens?
+        Havia várias pessoas envolvidas, e cada uma tinha uma opinião diferente sobre a solução certa.
+        Devemos sempre pensar na qualidade dos dados, na segurança do sistema e no custo da solução.
+        Você poderia explicar como escalaria esta aplicação se o número de usuários dobrasse amanhã?
+        Gosto de aprender coisas novas e acredito que a comunicação é tão importante quanto o conhecimento técnico.
+        Eles conseguiram entregar a primeira versão em três meses, o que foi mais rápido do que o esperado.
+        Como é um dia típico para alguém nesta posição? Qual é o tamanho da equipe? Não, ainda não começamos.
+    """,
+    'fr': """
+        Parlez-moi de vous et de votre parcours professionnel. Quels sont vos principaux points forts et faiblesses?
+        Pourquoi voulez-vous travailler dans notre entreprise et où vous voyez-vous dans cinq ans?
+        Décrivez une situation où vous avez dû résoudre un problème difficile avec votre équipe.
+        Comment gérez-vous la pression, les délais serrés et les changements de priorités au travail?
+        Pouvez-vous me présenter le projet le plus difficile sur lequel vous avez travaillé récemment?
+        Que dirait votre ancien responsable à votre sujet? Comment avez-vous mesuré les résultats de ce travail?
+        Je travaille comme ingénieur logiciel depuis huit ans, principalement sur des chaînes de traitement de données.
+        Dans mon poste actuel je suis responsable de la conception, du développement et de la maintenance de nos services.
+        Nous avons amélioré les performances du système de rapports et réduit le temps de traitement de moitié.
+        L'objectif principal du projet était de mettre les informations à la disposition des équipes chaque matin.
+        Je commence généralement par comprendre les besoins, puis je découpe le travail en tâches plus petites.
+        Quand quelque chose ne va pas, j'essaie de trouver la cause première au lieu de corriger seulement les symptômes.
+        Merci pour cette opportunité, j'aimerais en savoir plus sur l'équipe et les prochaines étapes.
+        Quels outils utilisez-vous pour tester votre code? Quelle est la différence entre ces deux approches?
+        Il y avait plusieurs personnes impliquées, et chacune avait un avis différent sur la bonne solution.
+        Nous devons toujours penser à la qualité des données, à la sécurité du système et au coût.
+        Pourriez-vous expliquer comment vous feriez évoluer cette application si le nombre d'utilisateurs doublait demain?
+        J'aime apprendre de nouvelles choses et je crois que la communication est aussi importante que les connaissances techniques.
+        Ils ont réussi à livrer la première version en trois mois, ce qui était plus rapide que prévu.
+        À quoi ressemble une journée type pour quelqu'un à ce poste? Quelle est la taille de l'équipe? Qu'est-ce que c'est?
+    """,
+    'es': """
+        Háblame de ti y de tu trayectoria profesional. ¿Cuáles son tus principales fortalezas y debilidades?
+        ¿Por qué quieres trabajar en nuestra empresa y dónde te ves dentro de cinco años?
+        Describe una situación en la que tuviste que resolver un problema difícil con tu equipo.
+        ¿Cómo manejas la presión, los plazos ajustados y los cambios de prioridades en el trabajo?
+        ¿Puedes explicarme el proyecto más desafiante en el que has trabajado recientemente?
+        ¿Qué diría tu jefe anterior sobre ti? ¿Cómo mediste los resultados de ese trabajo?
+        Llevo ocho años trabajando como ingeniero de software, sobre todo construyendo flujos de datos.
+        En mi puesto actual soy responsable del diseño, el desarrollo y el mantenimiento de nuestros servicios.
+        Mejoramos el rendimiento del sistema de informes y redujimos el tiempo de procesamiento a la mitad.
+        El objetivo principal del proyecto era poner la información a disposición del negocio todas las mañanas.
+        Normalmente empiezo por entender los requisitos y luego divido el trabajo en tareas más pequeñas.
+        Cuando algo sale mal, intento encontrar la causa raíz en lugar de solo corregir los síntomas.
+        Gracias por la oportunidad, me gustaría saber más sobre el equipo y los próximos pasos.
+        ¿Qué herramientas usas para probar tu código? ¿Cuál es la diferencia entre estos dos enfoques?
+        Había varias personas involucradas, y cada una tenía una opinión distinta sobre la solución correcta.
+        Siempre debemos pensar en la calidad de los datos, la seguridad del sistema y el costo.
+        ¿Podrías explicar cómo escalarías esta aplicación si el número de usuarios se duplicara mañana?
+        Me gusta aprender cosas nuevas y creo que la comunicación es tan importante como el conocimiento técnico.
+        Ellos lograron entregar la primera versión en tres meses, lo cual fue más rápido de lo esperado.
+        ¿Cómo es un día típico para alguien en este puesto? ¿Qué tan grande es el equipo? Todavía no, pero pronto.
+    """,
+    'de': """
+        Erzählen Sie mir etwas über sich und Ihren beruflichen Werdegang. Was sind Ihre größten Stärken und Schwächen?
+        Warum möchten Sie für unser Unternehmen arbeiten, und wo sehen Sie sich in fünf Jahren?
+        Beschreiben Sie eine Situation, in der Sie mit Ihrem Team ein schwieriges Problem lösen mussten.
+        Wie gehen Sie mit Druck, knappen Fristen und wechselnden Prioritäten bei der Arbeit um?
+        Können Sie mir das anspruchsvollste Projekt erklären, an dem Sie zuletzt gearbeitet haben?
+        Was würde Ihr früherer Vorgesetzter über Sie sagen? Wie haben Sie die Ergebnisse dieser Arbeit gemessen?
+        Ich arbeite seit acht Jahren als Softwareentwickler und baue vor allem Datenverarbeitungsstrecken.
+        In meiner aktuellen Rolle bin ich für den Entwurf, die Entwicklung und die Wartung unserer Dienste verantwortlich.
+        Wir haben die Leistung des Berichtssystems verbessert und die Verarbeitungszeit halbiert.
+        Das wichtigste Ziel des Projekts war, die Informationen jeden Morgen für die Fachabteilung bereitzustellen.
+        Normalerweise verstehe ich zuerst die Anforderungen und teile die Arbeit dann in kleinere Aufgaben auf.
+        Wenn etwas schiefgeht, versuche ich die eigentliche Ursache zu finden, statt nur die Symptome zu beheben.
+        Vielen Dank für die Gelegenheit, ich würde gerne mehr über das Team und die nächsten Schritte erfahren.
+        Welche Werkzeuge verwenden Sie, um Ihren Code zu testen? Was ist der Unterschied zwischen diesen beiden Ansätzen?
+        Es waren mehrere Personen beteiligt, und jeder hatte eine andere Meinung über die richtige Lösung.
+        Wir sollten immer an die Qualität der Daten, die Sicherheit des Systems und die Kosten denken.
+        Könnten Sie erklären, wie Sie diese Anwendung skalieren würden, wenn sich die Zahl der Benutzer morgen verdoppelt?
+        Ich lerne gerne neue Dinge und glaube, dass Kommunikation genauso wichtig ist wie technisches Wissen.
+        Sie konnten die erste Version innerhalb von drei Monaten liefern, was schneller war als erwartet.
+        Wie sieht ein typischer Tag für jemanden in dieser Position aus? Wie groß ist das Team? Noch nicht, aber bald.
+    """
+}
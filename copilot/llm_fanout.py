@@ -0,0 +1,134 @@
+"""
+LLM Fan-out
+Streams one question through several models at once and measures each one (TTFT, tokens/sec, latency, tokens)
+"""
+
+import asyncio
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from .tokens import estimate_tokens
+
+
+class ModelRun:
+    """
+    Timings and token counts of one model's streamed answer.
+
+    Token counts come from the usage block of the stream when the provider sends one,
+    otherwise completion tokens are the number of content chunks (one token per chunk
+    for OpenAI-compatible streams). Tokens/sec is measured from the first token on, so
+    it is the generation speed independent of time to first token.
+    """
+
+    def __init__(self, index: int, provider: str, model: str):
+        self.index = index
+        self.provider = provider
+        self.model = model
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.chunks = 0
+        self.characters = 0
+        self.prompt_tokens: Optional[int] = None
+        self.completion_tokens: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def add(self, text: str):
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+        self.chunks += 1
+        self.characters += len(text)
+
+    def metrics(self) -> Dict:
+        finished = self.finished_at or time.perf_counter()
+        completion_tokens = self.completion_tokens if self.completion_tokens is not None else self.chunks
+        generation_seconds = (finished - self.first_token_at) if self.first_token_at is not None else 0.0
+        return {
+            'provider': self.provider,
+            'model': self.model,
+            'ttft_ms': round(1000 * (self.first_token_at - self.started)) if self.first_token_at is not None else None,
+            'total_ms': round(1000 * (finished - self.started)),
+            'prompt_tokens': self.prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'tokens_per_second': round(completion_tokens / generation_seconds, 1) if generation_seconds > 0 else None,
+            'usage_reported': self.completion_tokens is not None,
+            'error': self.error
+        }
+
+
+def _chunk_text(chunk) -> str:
+    choices = getattr(chunk, 'choices', None)
+    if choices and getattr(choices[0], 'delta', None) is not None:
+        return getattr(choices[0].delta, 'content', None) or ''
+    return ''
+
+
+async def _iterate(stream) -> AsyncIterator:
+    """Chunks of an async or a sync (error fallback) response stream."""
+    if hasattr(stream, '__aiter__'):
+        async for chunk in stream:
+            yield chunk
+    else:
+        for chunk in stream:
+            yield chunk
+
+
+async def fan_out(targets: List[Dict], open_stream: Callable[[str, str], Awaitable],
+                  prompt_tokens: Optional[int] = None) -> AsyncIterator[Dict]:
+    """
+    Stream every target ({'provider', 'model'}) concurrently and yield events as they happen:
+    start, chunk (text), done (metrics) per model - all tagged with the target index - and
+    a final summary with the metrics of every model. `open_stream(provider, model)` opens
+    one streamed answer. Closing the generator (client disconnected) cancels every stream.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    runs = [ModelRun(i, target['provider'], target['model']) for i, target in enumerate(targets)]
+
+    async def run(model_run: ModelRun):
+        stream = None
+        await queue.put({'type': 'start', 'index': model_run.index,
+                         'provider': model_run.provider, 'model': model_run.model})
+        try:
+            stream = await open_stream(model_run.provider, model_run.model)
+            if getattr(stream, 'error_message', None):
+                raise RuntimeError(stream.error_message)
+            async for chunk in _iterate(stream):
+                usage = getattr(chunk, 'usage', None)
+                if usage is not None:
+                    model_run.prompt_tokens = usage.prompt_tokens
+                    model_run.completion_tokens = usage.completion_tokens
+                text = _chunk_text(chunk)
+                if text:
+                    model_run.add(text)
+                    await queue.put({'type': 'chunk', 'index': model_run.index, 'text': text})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            model_run.error = str(e)
+            print(f"[FANOUT] {model_run.provider}/{model_run.model} failed: {str(e)}")
+        finally:
+            if hasattr(stream, 'close'):
+                stream.close()
+            model_run.finished_at = time.perf_counter()
+            if model_run.prompt_tokens is None:
+                model_run.prompt_tokens = prompt_tokens
+            queue.put_nowait({'type': 'done', 'index': model_run.index, 'metrics': model_run.metrics()})
+
+    tasks = [asyncio.ensure_future(run(model_run)) for model_run in runs]
+    try:
+        remaining = len(tasks)
+        while remaining:
+            event = await queue.get()
+            if event['type'] == 'done':
+                remaining -= 1
+            yield event
+        yield {'type': 'summary', 'results': [model_run.metrics() for model_run in runs]}
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def estimate_prompt_tokens(system_prompt: str, question: str) -> int:
+    """Estimated prompt size for providers that do not report usage."""
+    return estimate_tokens(system_prompt) + estimate_tokens(question)
@@ -0,0 +1,393 @@
+"""
+LLM Gateway
+Pooled async OpenAI clients shared by every LLM call, with per-model concurrency limits and timeouts
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from collections import deque
+from typing import Callable, Dict, List, Optional, Union
+
+import httpx
+from openai import APITimeoutError, AsyncOpenAI, DefaultAsyncHttpxClient
+
+# close() tasks of abandoned streams (kept referenced until they finish)
+_closing = set()
+
+
+def parse_model_overrides(value: Union[str, Dict], cast: Callable, name: str = 'model overrides') -> Dict:
+    """
+    Per-model settings from comma-separated model=value pairs ("gpt-4=4,gpt-4o=8").
+    Malformed pairs are skipped with a warning; a dict is taken as already parsed.
+    """
+    if isinstance(value, dict):
+        return dict(value)
+
+    overrides = {}
+    for item in (value or '').split(','):
+        if not item.strip():
+            continue
+        model, _, raw = item.partition('=')
+        try:
+            if not model.strip():
+                raise ValueError('missing model name')
+            overrides[model.strip()] = cast(raw)
+        except ValueError:
+            print(f"[LLM Gateway] Ignoring malformed {name} entry: {item.strip()!r}")
+    return overrides
+
+
+class _ModelSlots:
+    """
+    Concurrency limit for one model, shared by every event loop in the process.
+
+    A released slot is handed straight to the oldest waiter, whichever loop it waits on.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self._waiters = deque()  # [future, granted]
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _wake(future: asyncio.Future):
+        if not future.done():
+            future.set_result(None)
+
+    async def acquire(self):
+        with self._lock:
+            if self.in_use < self.limit and not self._waiters:
+                self.in_use += 1
+                return
+            waiter = [asyncio.get_running_loop().create_future(), False]
+            self._waiters.append(waiter)
+
+        try:
+            await waiter[0]
+        except asyncio.CancelledError:
+            with self._lock:
+                granted = waiter[1]
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                # The slot was handed over just as we were cancelled: pass it on
+                self.release()
+            raise
+
+    def release(self):
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                try:
+                    waiter[0].get_loop().call_soon_threadsafe(self._wake, waiter[0])
+                except RuntimeError:
+                    continue  # Its loop is closed
+                waiter[1] = True
+                return
+            self.in_use -= 1
+
+
+class LLMStream:
+    """
+    Async iterator over the chunks of a streaming chat completion.
+
+    Holds the model's concurrency slot until the stream ends, fails or is closed. Closing
+    the stream (or abandoning it because the consumer was cancelled) stops the request.
+    """
+
+    def __init__(self, response, finish: Callable[[Optional[BaseException]], None], model: Optional[str] = None):
+        self._response = response
+        self._iterator = response.__aiter__()
+        self._finish = finish
+        self._finished = False
+        self._pending = []
+        self.model = model
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._pending:
+            return self._pending.pop(0)
+        if self._finished:
+            raise StopAsyncIteration
+
+        try:
+            return await self._iterator.__anext__()
+        except StopAsyncIteration:
+            self._done()
+            raise
+        except asyncio.CancelledError:
+            self.close()
+            raise
+        except Exception as e:
+            self._done(e)
+            raise
+
+    def _done(self, error: Optional[BaseException] = None):
+        if not self._finished:
+            self._finished = True
+            self._finish(error)
+
+    def close(self):
+        """Stop the underlying request if it is still running."""
+        if self._finished:
+            return
+        self._done()
+        try:
+            task = asyncio.get_running_loop().create_task(self._response.close())
+        except RuntimeError:
+            return  # No loop to close it on; the connection is dropped with the response
+        _closing.add(task)
+        task.add_done_callback(_closing.discard)
+
+    async def aclose(self):
+        if not self._finished:
+            self._done()
+            await self._response.close()
+
+    def __del__(self):
+        # Never leak the slot of a stream nobody closed
+        if not self._finished:
+            self._done()
+
+
+class LLMGateway:
+    """
+    Process-wide gateway for OpenAI chat completions.
+
+    Async callers (consumers, async views) run their requests on their own event loop,
+    with one AsyncOpenAI client per loop, so each loop keeps a pool of keep-alive
+    connections instead of opening new TLS connections. Sync callers (views and helpers
+    running in worker threads) go through complete_sync(), which runs the request on one
+    background loop and its client. Each model has its own concurrency limit, shared by
+    all loops (requests beyond it wait for a slot), and its own request timeout.
+    """
+
+    def __init__(self, api_key: Optional[str], base_url: Optional[str] = None, timeout: float = 60.0,
+                 connect_timeout: float = 5.0, max_connections: int = 50, max_keepalive_connections: int = 20,
+                 keepalive_expiry: float = 60.0, default_concurrency: int = 8,
+                 model_concurrency: Optional[Dict[str, int]] = None,
+                 model_timeouts: Optional[Dict[str, float]] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.default_concurrency = default_concurrency
+        self.model_concurrency = model_concurrency or {}
+        self.model_timeouts = model_timeouts or {}
+
+        # One client per event loop (an httpx connection pool belongs to the loop that opened it)
+        self._clients: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]' = weakref.WeakKeyDictionary()
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Dict[str, _ModelSlots] = {}
+        self._lock = threading.Lock()
+
+        # Per-model counters
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+        # Hedged request counters (updated from the callers' loops)
+        self._hedge_lock = threading.Lock()
+        self._hedge_stats = {'requests': 0, 'hedged': 0, 'primary_wins': 0, 'backup_wins': 0,
+                             'failed': 0, 'first_token_seconds_total': 0.0}
+
+    def _ensure_sync_loop(self) -> asyncio.AbstractEventLoop:
+        if self._sync_loop is None:
+            with self._lock:
+                if self._sync_loop is None:
+                    loop = asyncio.new_event_loop()
+                    threading.Thread(target=loop.run_forever, name='llm-gateway-sync', daemon=True).start()
+                    self._sync_loop = loop
+        return self._sync_loop
+
+    def _get_client(self) -> AsyncOpenAI:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            if not self.api_key:
+                raise RuntimeError('OpenAI API key is not configured')
+            client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                http_client=DefaultAsyncHttpxClient(
+                    limits=self.limits,
+                    timeout=httpx.Timeout(self.timeout, connect=self.connect_timeout)
+                )
+            )
+            with self._lock:
+                self._clients[loop] = client
+        return client
+
+    def _model_slot(self, model: str) -> _ModelSlots:
+        with self._lock:
+            if model not in self._slots:
+                self._slots[model] = _ModelSlots(self.model_concurrency.get(model, self.default_concurrency))
+                self._stats[model] = {'requests': 0, 'in_flight': 0, 'waiting': 0, 'errors': 0, 'timeouts': 0}
+            return self._slots[model]
+
+    def _count(self, model: str, **increments):
+        with self._lock:
+            for name, value in increments.items():
+                self._stats[model][name] += value
+
+    def _request_timeout(self, model: str) -> httpx.Timeout:
+        return httpx.Timeout(self.model_timeouts.get(model, self.timeout), connect=self.connect_timeout)
+
+    async def _request(self, model: str, messages: List[Dict], stream: bool, **kwargs):
+        """
+        Issue one request on the running loop once the model has a free slot.
+        Returns the ChatCompletion, or for streams an LLMStream that holds the slot until it ends.
+        """
+        slot = self._model_slot(model)
+
+        self._count(model, waiting=1)
+        try:
+            await slot.acquire()
+        finally:
+            self._count(model, waiting=-1)
+
+        self._count(model, requests=1, in_flight=1)
+
+        def finish(error: Optional[BaseException] = None):
+            if isinstance(error, Exception):
+                self._count(model, errors=1, timeouts=int(isinstance(error, (APITimeoutError, httpx.TimeoutException))))
+            self._count(model, in_flight=-1)
+            slot.release()
+
+        try:
+            response = await self._get_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                stream=stream,
+                timeout=self._request_timeout(model),
+                **kwargs
+            )
+        except BaseException as e:
+            finish(e)
+            raise
+        if not stream:
+            finish()
+            return response
+        return LLMStream(response, finish, model=model)
+
+    async def complete(self, model: str, messages: List[Dict], **kwargs):
+        """Chat completion (non-streaming) from async code. Returns the ChatCompletion."""
+        return await self._request(model, messages, stream=False, **kwargs)
+
+    def complete_sync(self, model: str, messages: List[Dict], **kwargs):
+        """Chat completion from sync code (views, helpers run in threads). Returns the ChatCompletion."""
+        loop = self._ensure_sync_loop()
+        if threading.current_thread().name == 'llm-gateway-sync':
+            raise RuntimeError('complete_sync() cannot be called from the LLM gateway loop')
+        return asyncio.run_coroutine_threadsafe(self.complete(model, messages, **kwargs), loop).result()
+
+    async def stream(self, model: str, messages: List[Dict], **kwargs) -> LLMStream:
+        """
+        Streaming chat completion from async code.
+
+        Waits for the first chunk, so connection and API errors are raised here rather
+        than in the middle of iteration.
+        """
+        stream = await self._request(model, messages, stream=True, **kwargs)
+        try:
+            stream._pending.append(await stream.__anext__())
+        except StopAsyncIteration:
+            pass
+        return stream
+
+    async def _first_token(self, model: str, messages: List[Dict], **kwargs):
+        """Start a stream and read up to its first content token. Returns (stream, chunks read)."""
+        stream = await self.stream(model=model, messages=messages, **kwargs)
+        chunks = []
+        try:
+            async for chunk in stream:
+                chunks.append(chunk)
+                if chunk.choices and getattr(chunk.choices[0].delta, 'content', None):
+                    break
+        except BaseException:
+            stream.close()
+            raise
+        return stream, chunks
+
+    def _count_hedge(self, **increments):
+        with self._hedge_lock:
+            for name, value in increments.items():
+                self._hedge_stats[name] += value
+
+    async def hedged_stream(self, model: str, messages: List[Dict], backup_model: str, hedge_delay: float,
+                            **kwargs) -> LLMStream:
+        """
+        Streaming chat completion that races a backup model when the primary is slow.
+
+        If the primary has produced no content token after hedge_delay seconds (or failed),
+        the same request is sent to backup_model. Whichever produces a token first is
+        returned - its `model` attribute tells which - and the other request is cancelled.
+        Raises the primary's error only if both fail.
+        """
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(self._first_token(model, messages, **kwargs))
+        tasks = [primary]
+        winner = None
+        try:
+            await asyncio.wait(tasks, timeout=hedge_delay)
+            if not primary.done() or primary.exception() is not None:
+                print(f"[LLM Gateway] No token from {model} after {time.perf_counter() - started:.2f}s, "
+                      f"hedging with {backup_model}")
+                tasks.append(asyncio.ensure_future(self._first_token(backup_model, messages, **kwargs)))
+
+            while winner is None:
+                for task in tasks:
+                    if task.done() and task.exception() is None:
+                        winner = task
+                        break
+                else:
+                    running = [task for task in tasks if not task.done()]
+                    if not running:
+                        raise primary.exception()
+                    await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            if winner is None:
+                self._count_hedge(requests=1, hedged=int(len(tasks) > 1), failed=1)
+            raise
+        finally:
+            # Cancel (or close) the loser(s)
+            for task in tasks:
+                if task is winner:
+                    continue
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled() and task.exception() is None:
+                    task.result()[0].close()
+
+        stream, chunks = winner.result()
+        stream._pending = chunks
+        self._count_hedge(
+            requests=1,
+            hedged=int(len(tasks) > 1),
+            primary_wins=int(winner is primary),
+            backup_wins=int(winner is not primary),
+            first_token_seconds_total=time.perf_counter() - started
+        )
+        return stream
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-model request counters (requests, in_flight, waiting, errors, timeouts)."""
+        with self._lock:
+            return {model: dict(counters) for model, counters in self._stats.items()}
+
+    def hedge_stats(self) -> Dict:
+        """Hedged request counters: how often a backup was sent and which model won."""
+        with self._hedge_lock:
+            stats = dict(self._hedge_stats)
+        answered = stats['primary_wins'] + stats['backup_wins']
+        stats['backup_win_rate'] = stats['backup_wins'] / stats['hedged'] if stats['hedged'] else 0.0
+        stats['first_token_seconds_avg'] = stats.pop('first_token_seconds_total') / answered if answered else 0.0
+        return stats
@@ -0,0 +1,100 @@
+"""
+Benchmark: per-token vs. coalesced answer_chunk delivery
+Streams FAQ answers token by token through the channel layer and measures messages, CPU and added delay per answer
+"""
+
+import asyncio
+import json
+import re
+import statistics
+import time
+
+from channels.layers import InMemoryChannelLayer
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from copilot.chunk_coalescer import ChunkCoalescer
+from copilot.utils import read_faq_files
+
+
+def _tokens(text):
+    """Split an answer roughly like an LLM tokenizer would (word pieces of up to 4 characters)."""
+    return [piece for word in re.findall(r'\s*\S+', text) for piece in re.findall(r'.{1,4}', word, re.S)]
+
+
+class Command(BaseCommand):
+    help = 'Compare messages, CPU and added delay per answer for per-token and coalesced answer_chunk delivery'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--answers', type=int, default=10, help='Number of FAQ answers to stream')
+        parser.add_argument('--token-ms', type=float, default=15.0, help='Delay between tokens (simulated LLM speed)')
+        parser.add_argument('--flush-ms', type=float, default=settings.ANSWER_CHUNK_FLUSH_MS)
+        parser.add_argument('--flush-bytes', type=int, default=settings.ANSWER_CHUNK_FLUSH_BYTES)
+        parser.add_argument('--clients', type=int, default=2, help='WebSocket clients in the room')
+
+    def handle(self, *args, **options):
+        answers = [entry['answer'] for entry in read_faq_files().values()][:options['answers']]
+        if not answers:
+            raise CommandError('No FAQ answers found (check FAQ_FILES)')
+
+        tokens = sum(len(_tokens(answer)) for answer in answers)
+        self.stdout.write(f"{len(answers)} answers, {tokens} tokens, {options['token_ms']:g} ms/token, "
+                          f"{options['clients']} clients")
+
+        for label, flush_ms in (('per token', 0), (f"coalesced ({options['flush_ms']:g} ms / {options['flush_bytes']} B)",
+                                                   options['flush_ms'])):
+            results = asyncio.run(self._run(answers, options['token_ms'] / 1000, flush_ms / 1000,
+                                            options['flush_bytes'], options['clients']))
+            messages, cpu_ms, delays = results
+            self.stdout.write(
+                f'{label:>32}: {statistics.mean(messages):7.1f} messages/answer, {statistics.mean(cpu_ms):6.2f} ms CPU/answer, '
+                f'added delay per token mean {statistics.mean(delays):5.1f} ms, max {max(delays):5.1f} ms'
+            )
+
+    async def _run(self, answers, token_delay, interval, max_bytes, clients):
+        """Stream every answer through a channel layer group to `clients` receivers that JSON-encode each message."""
+        layer = InMemoryChannelLayer(capacity=100000)
+        channels = [await layer.new_channel() for _ in range(clients)]
+        for channel in channels:
+            await layer.group_add('benchmark', channel)
+
+        messages, cpu_ms, delays = [], [], []
+        for answer in answers:
+            arrivals = []  # When each token arrived from the (simulated) LLM
+            flushed = []  # (time, tokens in the message)
+
+            async def llm_stream():
+                for token in _tokens(answer):
+                    await asyncio.sleep(token_delay)
+                    arrivals.append(time.perf_counter())
+                    yield token
+
+            async def receive(channel):
+                while True:
+                    event = await layer.receive(channel)
+                    if event['type'] == 'answer_complete_message':
+                        return
+                    json.dumps({'type': 'answer_chunk', 'text': event['text'], 'timestamp': event['timestamp']})
+
+            async def send(text):
+                flushed.append((time.perf_counter(), len(arrivals)))
+                await layer.group_send('benchmark', {'type': 'answer_chunk_message', 'text': text, 'timestamp': '00:00:00'})
+
+            receivers = [asyncio.ensure_future(receive(channel)) for channel in channels]
+            cpu_started = time.process_time()
+            coalescer = ChunkCoalescer(send, interval, max_bytes)
+            async for token in llm_stream():
+                await coalescer.add(token)
+            await coalescer.flush()
+            await layer.group_send('benchmark', {'type': 'answer_complete_message'})
+            await asyncio.gather(*receivers)
+            cpu_ms.append(1000 * (time.process_time() - cpu_started))
+            messages.append(coalescer.messages_out)
+
+            # Delay each token spent waiting in the buffer before its message went out
+            token = 0
+            for flushed_at, count in flushed:
+                while token < count:
+                    delays.append(1000 * (flushed_at - arrivals[token]))
+                    token += 1
+        return messages, cpu_ms, delays
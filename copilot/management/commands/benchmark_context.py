@@ -0,0 +1,115 @@
+"""
+Benchmark: relevance-selected resume/job context vs. full summaries in the answer prompt
+Reports prompt tokens and selection latency over the FAQ questions, and optionally time to first token against the LLM
+"""
+
+import asyncio
+import os
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from copilot.context_retrieval import ContextIndex
+from copilot.tokens import estimate_tokens
+from copilot.utils import (
+    build_system_prompt, extract_text_from_file, get_job_description_summary, get_resume_summary,
+    llm_gateway, read_faq_files
+)
+
+
+def _read_documents(directory):
+    """Raw text of every resume / job description file in a directory."""
+    if not os.path.isdir(directory):
+        return ''
+    files = sorted(f for f in os.listdir(directory) if f.endswith(('.pdf', '.txt')))
+    return '\n\n'.join(extract_text_from_file(os.path.join(directory, f)) for f in files)
+
+
+def _percentile(samples, quantile):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(quantile * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = 'Compare prompt size and latency of full vs. relevance-selected resume/job context'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--resume', help='Text file to use as resume summary (default: files in RESUME_DIR)')
+        parser.add_argument('--job', help='Text file to use as job summary (default: files in JOB_DESCRIPTION_DIR)')
+        parser.add_argument('--summaries', action='store_true',
+                            help='Use the generated (cached) summaries instead of the raw documents - may call the LLM')
+        parser.add_argument('--questions', type=int, default=200, help='Number of FAQ questions to use')
+        parser.add_argument('--live', type=int, default=0,
+                            help='Also stream N questions both ways through the LLM and compare time to first token')
+        parser.add_argument('--model', default='gpt-4o-mini')
+
+    def handle(self, *args, **options):
+        if options['summaries']:
+            resume_text = get_resume_summary()[0]
+            job_text = get_job_description_summary()[0]
+        else:
+            resume_text = (open(options['resume'], encoding='utf-8').read() if options['resume']
+                           else _read_documents(settings.RESUME_DIR))
+            job_text = (open(options['job'], encoding='utf-8').read() if options['job']
+                        else _read_documents(settings.JOB_DESCRIPTION_DIR))
+        if not resume_text and not job_text:
+            raise CommandError('No resume or job description text found (use --resume / --job)')
+
+        questions = [entry['question'] for entry in read_faq_files().values()][:options['questions']]
+        if not questions:
+            raise CommandError('No FAQ questions found (check FAQ_FILES)')
+
+        start = time.perf_counter()
+        resume_index = ContextIndex(resume_text, chunk_tokens=settings.CONTEXT_CHUNK_TOKENS)
+        job_index = ContextIndex(job_text, chunk_tokens=settings.CONTEXT_CHUNK_TOKENS)
+        build_ms = 1000 * (time.perf_counter() - start)
+
+        full_prompt = build_system_prompt(resume_text, job_text)
+        full_tokens = estimate_tokens(full_prompt)
+
+        selected_tokens, select_us, prompts = [], [], []
+        for question in questions:
+            start = time.perf_counter()
+            resume_context = resume_index.select(question, settings.CONTEXT_RESUME_BUDGET_TOKENS, top_k=settings.CONTEXT_TOP_K)
+            job_context = job_index.select(question, settings.CONTEXT_JOB_BUDGET_TOKENS, top_k=settings.CONTEXT_TOP_K)
+            select_us.append(1e6 * (time.perf_counter() - start))
+            prompt = build_system_prompt(resume_context, job_context)
+            selected_tokens.append(estimate_tokens(prompt))
+            prompts.append(prompt)
+
+        mean_selected = statistics.mean(selected_tokens)
+        self.stdout.write(f'Documents: resume {resume_index.total_tokens} tokens / {len(resume_index)} chunks, '
+                          f'job {job_index.total_tokens} tokens / {len(job_index)} chunks (indexed in {build_ms:.1f} ms)')
+        self.stdout.write(f'Questions: {len(questions)}')
+        self.stdout.write(f'System prompt tokens - full: {full_tokens}, selected: mean {mean_selected:.0f}, '
+                          f'max {max(selected_tokens)} ({100 * (1 - mean_selected / full_tokens):.1f}% smaller)')
+        self.stdout.write(f'Selection latency - p50 {_percentile(select_us, 0.5):.0f} us, '
+                          f'p95 {_percentile(select_us, 0.95):.0f} us')
+
+        if options['live']:
+            full_ttft, selected_ttft = asyncio.run(
+                self._measure_ttft(questions[:options['live']], full_prompt, prompts, options['model'])
+            )
+            self.stdout.write(f"Time to first token ({options['model']}, {len(full_ttft)} questions) - "
+                              f'full: mean {statistics.mean(full_ttft):.0f} ms, p95 {_percentile(full_ttft, 0.95):.0f} ms; '
+                              f'selected: mean {statistics.mean(selected_ttft):.0f} ms, '
+                              f'p95 {_percentile(selected_ttft, 0.95):.0f} ms')
+
+    async def _measure_ttft(self, questions, full_prompt, prompts, model):
+        """Stream each question with the full and the selected prompt (alternating order) and time the first token."""
+        full_ttft, selected_ttft = [], []
+        for i, question in enumerate(questions):
+            runs = [(full_prompt, full_ttft), (prompts[i], selected_ttft)]
+            for system_prompt, samples in (runs if i % 2 == 0 else runs[::-1]):
+                start = time.perf_counter()
+                stream = await llm_gateway.stream(
+                    model=model,
+                    messages=[{"role": "system", "content": system_prompt}, {"role": "user", "content": question}],
+                    max_tokens=1
+                )
+                samples.append(1000 * (time.perf_counter() - start))
+                async for _ in stream:
+                    pass
+        return full_ttft, selected_ttft
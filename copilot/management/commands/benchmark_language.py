@@ -0,0 +1,83 @@
+"""
+Benchmark: offline language identification accuracy and latency
+Identifies the questions and answers of a labelled FAQ file (full text and interim-transcript-sized prefixes)
+"""
+
+import json
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from copilot.language import LANGUAGE_NAMES, detect_language_code
+
+
+def _percentile(samples, quantile):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(quantile * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = 'Measure accuracy and latency of the offline language identifier on a labelled FAQ file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default='faq_data_bilingual.json', help='FAQ JSON file (relative to BASE_DIR)')
+        parser.add_argument('--alternate', default='en,fr',
+                            help='Labels for unlabelled entries, in rotation (the bilingual FAQ alternates English / French)')
+        parser.add_argument('--prefix-words', type=int, default=3,
+                            help='Also identify the first N words only, like an early interim transcript (0 = skip)')
+        parser.add_argument('--show-errors', type=int, default=10, help='Misidentified texts to list')
+
+    def handle(self, *args, **options):
+        path = os.path.join(settings.BASE_DIR, options['file'])
+        try:
+            with open(path, encoding='utf-8') as f:
+                faq_data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read {path}: {e}')
+
+        rotation = [code for code in options['alternate'].split(',') if code]
+        samples = []
+        for i, faq in enumerate(faq_data.get('faqs', [])):
+            label = faq.get('language') or faq_data.get('language') or (rotation[i % len(rotation)] if rotation else None)
+            if label not in LANGUAGE_NAMES:
+                raise CommandError(f'Entry {i} has no usable language label (use --alternate)')
+            samples.extend((field, label, faq[field]) for field in ('question', 'answer') if faq.get(field))
+            if options['prefix_words']:
+                words = faq.get('question', '').split()[:options['prefix_words']]
+                samples.append((f"question ({options['prefix_words']} words)", label, ' '.join(words)))
+        if not samples:
+            raise CommandError('No FAQ entries found')
+
+        start = time.perf_counter()
+        detect_language_code('warm up')  # Builds the profiles
+        build_ms = 1000 * (time.perf_counter() - start)
+
+        results = {}
+        errors = []
+        latencies = []
+        for kind, label, text in samples:
+            start = time.perf_counter()
+            predicted = detect_language_code(text)
+            latencies.append(1e6 * (time.perf_counter() - start))
+            results.setdefault(kind, Counter())[(label, predicted)] += 1
+            if predicted != label:
+                errors.append((kind, label, predicted, text))
+
+        self.stdout.write(f"{os.path.basename(path)}: {len(faq_data.get('faqs', []))} entries, "
+                          f"labels {dict(Counter(label for kind, label, _ in samples if kind == 'question'))}")
+        for kind, confusion in results.items():
+            total = sum(confusion.values())
+            correct = sum(count for (label, predicted), count in confusion.items() if label == predicted)
+            mistakes = ', '.join(f'{label}->{predicted}: {count}' for (label, predicted), count in confusion.items()
+                                 if label != predicted)
+            self.stdout.write(f'{kind:>22}: {correct}/{total} correct ({100 * correct / total:.1f}%)'
+                              + (f' - {mistakes}' if mistakes else ''))
+        self.stdout.write(f'Latency per text: p50 {_percentile(latencies, 0.5):.0f} us, '
+                          f'p95 {_percentile(latencies, 0.95):.0f} us, max {max(latencies):.0f} us '
+                          f'(profiles built once in {build_ms:.1f} ms)')
+
+        for kind, label, predicted, text in errors[:options['show_errors']]:
+            self.stdout.write(f'  [{kind}] expected {label}, got {predicted}: {text[:80]}')
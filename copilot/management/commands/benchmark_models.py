@@ -0,0 +1,82 @@
+"""
+Benchmark: candidate models for live answers, streamed concurrently on the same questions
+Reports time to first token, tokens/sec, total latency and token counts per model over FAQ questions
+"""
+
+import asyncio
+import statistics
+
+from django.core.management.base import BaseCommand, CommandError
+
+from copilot.llm_fanout import estimate_prompt_tokens, fan_out
+from copilot.utils import (
+    build_system_prompt, generate_response_async, get_interview_context, read_faq_files, select_prompt_context
+)
+
+
+def _percentile(samples, quantile):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(quantile * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = 'Stream FAQ questions through several models at once and compare TTFT, tokens/sec, latency and tokens'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--models', default='gpt-4o-mini,gpt-3.5-turbo',
+                            help='Comma-separated models (provider/model for non-OpenAI providers, e.g. ollama/gemma3:4b)')
+        parser.add_argument('--questions', type=int, default=5, help='Number of FAQ questions to ask every model')
+        parser.add_argument('--no-context', action='store_true', help='Leave the resume / job summaries out of the prompt')
+
+    def handle(self, *args, **options):
+        targets = []
+        for entry in options['models'].split(','):
+            provider, _, model = entry.strip().rpartition('/')
+            if model:
+                targets.append({'provider': provider or 'openai', 'model': model})
+        if not targets:
+            raise CommandError('No models given (--models)')
+
+        questions = [entry['question'] for entry in read_faq_files().values()][:options['questions']]
+        if not questions:
+            raise CommandError('No FAQ questions found (check FAQ_FILES)')
+
+        resume_summary, job_summary = ('', '') if options['no_context'] else get_interview_context()
+        results = asyncio.run(self._run(targets, questions, resume_summary, job_summary))
+
+        self.stdout.write(f'{len(questions)} questions, {len(targets)} models streamed concurrently')
+        self.stdout.write(f"{'model':>28}  {'TTFT p50':>9}  {'TTFT p95':>9}  {'tok/s':>7}  {'total p50':>10}  "
+                          f"{'prompt':>7}  {'completion':>10}  {'errors':>6}")
+        for target, runs in zip(targets, results):
+            ok = [run for run in runs if not run['error']]
+            name = f"{target['provider']}/{target['model']}"
+            if not ok:
+                self.stdout.write(f'{name:>28}  all {len(runs)} requests failed: {runs[0]["error"]}')
+                continue
+            ttft = [run['ttft_ms'] for run in ok if run['ttft_ms'] is not None] or [0]
+            rates = [run['tokens_per_second'] for run in ok if run['tokens_per_second']] or [0]
+            self.stdout.write(
+                f'{name:>28}  {_percentile(ttft, 0.5):7.0f}ms  {_percentile(ttft, 0.95):7.0f}ms  '
+                f'{statistics.mean(rates):7.1f}  {_percentile([run["total_ms"] for run in ok], 0.5):8.0f}ms  '
+                f'{statistics.mean(run["prompt_tokens"] or 0 for run in ok):7.0f}  '
+                f'{statistics.mean(run["completion_tokens"] for run in ok):10.0f}  {len(runs) - len(ok):>6}'
+            )
+
+    async def _run(self, targets, questions, resume_summary, job_summary):
+        """One fan-out per question; returns the metrics of every run, grouped per target."""
+        results = [[] for _ in targets]
+        for question in questions:
+            messages = [{"role": "user", "content": question}]
+            prompt_tokens = estimate_prompt_tokens(
+                build_system_prompt(*select_prompt_context(question, resume_summary, job_summary)), question
+            )
+
+            async def open_stream(provider, model):
+                return await generate_response_async(messages, resume_summary, job_summary, model=model,
+                                                     provider=provider, usage=True)
+
+            async for event in fan_out(targets, open_stream, prompt_tokens=prompt_tokens):
+                if event['type'] == 'summary':
+                    for i, metrics in enumerate(event['results']):
+                        results[i].append(metrics)
+        return results
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.2 on 2026-10-17 12:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('copilot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='faqentry',
+            name='language',
+            field=models.CharField(default='en', max_length=8),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 5.1.2 on 2026-10-17 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('copilot', '0002_faqentry_language'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DocumentSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('resume', 'Resume'), ('job', 'Job description')], max_length=8)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('text', models.TextField()),
+                ('language', models.CharField(default='English', max_length=32)),
+                ('language_code', models.CharField(default='en', max_length=8)),
+                ('summary', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'content_hash'), name='unique_document_summary')],
+            },
+        ),
+    ]
@@ -1,3 +1,56 @@
 from django.db import models
 
-# Create your models here.
+
+class FAQEntry(models.Model):
+    """Durable copy of an FAQ cache entry (preloaded from file or learned from the LLM)."""
+
+    SOURCE_FILE = 'file'
+    SOURCE_LLM = 'llm'
+    SOURCE_CHOICES = [
+        (SOURCE_FILE, 'FAQ file'),
+        (SOURCE_LLM, 'LLM answer'),
+    ]
+
+    question_hash = models.CharField(max_length=32, unique=True)
+    question = models.TextField()
+    answer = models.TextField()
+    source = models.CharField(max_length=8, choices=SOURCE_CHOICES, default=SOURCE_LLM)
+    language = models.CharField(max_length=8, default='en')
+    hit_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'FAQ entry'
+        verbose_name_plural = 'FAQ entries'
+
+    def __str__(self):
+        return self.question[:80]
+
+
+class DocumentSummary(models.Model):
+    """Resume / job description summary keyed by the content hash of the documents it was made from."""
+
+    KIND_RESUME = 'resume'
+    KIND_JOB = 'job'
+    KIND_CHOICES = [
+        (KIND_RESUME, 'Resume'),
+        (KIND_JOB, 'Job description'),
+    ]
+
+    kind = models.CharField(max_length=8, choices=KIND_CHOICES)
+    content_hash = models.CharField(max_length=64)
+    text = models.TextField()
+    language = models.CharField(max_length=32, default='English')
+    language_code = models.CharField(max_length=8, default='en')
+    summary = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'content_hash'], name='unique_document_summary'),
+        ]
+
+    def __str__(self):
+        return f'{self.kind} {self.content_hash[:8]}'
@@ -0,0 +1,155 @@
+"""
+PDF Text Extraction
+Streams PDF page text, parsing large documents across a process pool, with a per-(file hash, page) cache
+"""
+
+import hashlib
+import multiprocessing
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import PyPDF2
+
+
+def _extract_pages(path: str, start: int, stop: int, reader: Optional[PyPDF2.PdfReader] = None) -> List[str]:
+    """Text of pages [start, stop) of a PDF (in a pool worker, which opens the file itself)."""
+    reader = reader or PyPDF2.PdfReader(path)
+    return [reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+
+def file_sha256(path: str) -> str:
+    """SHA-256 of a file's bytes."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PDFTextExtractor:
+    """
+    Extracts PDF text page by page.
+
+    iter_pages() yields page texts in order as soon as each is available. Pages already
+    extracted from a file with the same content hash come from an LRU cache (bounded by
+    cache_max_pages); the rest are parsed in batches of batch_pages. Documents with at
+    least parallel_min_pages uncached pages are parsed across a process pool of `workers`
+    processes (PyPDF2 is pure Python, so threads would not help); smaller ones in-process,
+    where starting the work costs less than shipping it to a worker. If the pool fails
+    the extractor falls back to in-process parsing.
+    """
+
+    def __init__(self, workers: int = 2, parallel_min_pages: int = 8, batch_pages: int = 4,
+                 cache_max_pages: int = 2000):
+        self.workers = workers
+        self.parallel_min_pages = parallel_min_pages
+        self.batch_pages = batch_pages
+        self.cache_max_pages = cache_max_pages
+        self._cache: 'OrderedDict[Tuple[str, int], str]' = OrderedDict()
+        self._page_counts: Dict[str, int] = {}  # file hash -> pages, so a fully cached PDF is never opened
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+        # Counters
+        self.cached_pages = 0
+        self.parsed_pages = 0
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        with self._lock:
+            if self._pool is None and self.workers > 1:
+                # Spawned, not forked: the server process runs threads (LLM gateway, DB flushes)
+                self._pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            return self._pool
+
+    def _cached(self, key: Tuple[str, int]) -> Optional[str]:
+        with self._lock:
+            text = self._cache.get(key)
+            if text is not None:
+                self._cache.move_to_end(key)
+            return text
+
+    def _store(self, file_hash: str, start: int, texts: List[str]):
+        with self._lock:
+            for offset, text in enumerate(texts):
+                self._cache[(file_hash, start + offset)] = text
+            while len(self._cache) > self.cache_max_pages:
+                (evicted_hash, _), _ = self._cache.popitem(last=False)
+                self._page_counts.pop(evicted_hash, None)
+
+    def _batches(self, missing: List[int]) -> List[Tuple[int, int]]:
+        """Consecutive runs of missing pages, split into batches of at most batch_pages."""
+        batches = []
+        for page in missing:
+            if batches and batches[-1][1] == page and page - batches[-1][0] < self.batch_pages:
+                batches[-1] = (batches[-1][0], page + 1)
+            else:
+                batches.append((page, page + 1))
+        return batches
+
+    def iter_pages(self, path: str, file_hash: Optional[str] = None) -> Iterator[str]:
+        """Text of every page of the PDF, in page order."""
+        file_hash = file_hash or file_sha256(path)
+        reader = None
+        page_count = self._page_counts.get(file_hash)
+        if page_count is None:
+            reader = PyPDF2.PdfReader(path)
+            page_count = self._page_counts[file_hash] = len(reader.pages)
+
+        texts: Dict[int, str] = {}
+        for page in range(page_count):
+            text = self._cached((file_hash, page))
+            if text is not None:
+                texts[page] = text
+        missing = [page for page in range(page_count) if page not in texts]
+        self.cached_pages += len(texts)
+        self.parsed_pages += len(missing)
+
+        batches = self._batches(missing)
+        if batches and reader is None:
+            reader = PyPDF2.PdfReader(path)
+        futures = {}
+        pool = self._get_pool() if len(missing) >= self.parallel_min_pages else None
+        if pool is not None:
+            try:
+                futures = {start: pool.submit(_extract_pages, path, start, stop) for start, stop in batches}
+            except (BrokenProcessPool, RuntimeError) as e:
+                print(f'[PDF] Process pool unavailable, extracting in-process: {str(e)}')
+                with self._lock:
+                    self._pool = None
+                futures = {}
+
+        try:
+            next_page = 0
+            for start, stop in batches:
+                # Cached pages before this batch can go out right away
+                while next_page < start:
+                    yield texts[next_page]
+                    next_page += 1
+                try:
+                    extracted = futures[start].result() if start in futures else _extract_pages(path, start, stop, reader)
+                except BrokenProcessPool:
+                    extracted = _extract_pages(path, start, stop, reader)
+                self._store(file_hash, start, extracted)
+                yield from extracted
+                next_page = stop
+            while next_page < page_count:
+                yield texts[next_page]
+                next_page += 1
+        finally:
+            # The consumer stopped early: do not keep the pool busy with pages nobody reads
+            for future in futures.values():
+                future.cancel()
+
+    def extract(self, path: str, file_hash: Optional[str] = None) -> str:
+        """Full text of the PDF."""
+        return ''.join(self.iter_pages(path, file_hash))
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
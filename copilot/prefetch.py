@@ -0,0 +1,114 @@
+"""
+Speculative Answer Prefetch
+Generates answers for predicted next questions in the background, so a correct prediction is answered from cache
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set
+
+from .utils import generate_response_async, is_answer_available, new_speculative_cache, cache_speculative_answer
+
+
+class AnswerPrefetcher:
+    """
+    Per-session prefetcher for predicted interview questions.
+
+    Predictions are prefetched in order of confidence, skipping questions that are already
+    answerable from cache. At most max_concurrent generations run at once and each session
+    may spend at most `budget` LLM calls on prefetching, so bad predictions cannot burn
+    through the API quota. The answers go to this session's own speculative cache: they
+    are built from its conversation and documents, so no other session is served from it.
+    """
+
+    def __init__(self, max_concurrent: int = 2, budget: int = 20, top_n: int = 3):
+        self.top_n = top_n
+        self.budget = budget
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self._tasks: Set[asyncio.Task] = set()
+        self._in_flight: Set[str] = set()
+        self.cache = new_speculative_cache()
+
+        # Counters
+        self.scheduled = 0
+        self.completed = 0
+        self.failed = 0
+
+    def _answerable(self, questions: List[str]) -> Set[str]:
+        return {question for question in questions if is_answer_available(question, self.cache)}
+
+    async def schedule(self, predictions: List[Dict], history: List[Dict], resume_summary: str, job_summary: str,
+                       model: str = 'gpt-4o-mini', provider: Optional[str] = None) -> int:
+        """
+        Start background generation for the most likely predicted questions.
+
+        Args:
+            predictions: Predictor output ({'question', 'confidence', ...} dicts)
+            history: Conversation so far (copied, the prefetch appends the predicted question)
+
+        Returns:
+            Number of prefetches started
+        """
+        ranked = sorted(predictions, key=lambda p: p.get('confidence', 0), reverse=True)[:self.top_n]
+        questions = [question for question in ((p.get('question') or '').strip() for p in ranked) if question]
+
+        # Cache lookups search the FAQ index under its lock: keep them off the event loop
+        answerable = await asyncio.to_thread(self._answerable, questions)
+
+        started = 0
+        for question in questions:
+            if question in self._in_flight or question in answerable:
+                continue
+            if self.budget <= 0:
+                print("[Prefetch] Budget exhausted for this session - skipping")
+                break
+
+            self.budget -= 1
+            self.scheduled += 1
+            started += 1
+            self._in_flight.add(question)
+            messages = list(history) + [{"role": "user", "content": question}]
+            task = asyncio.create_task(
+                self._prefetch(question, messages, resume_summary, job_summary, model, provider)
+            )
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        if started:
+            print(f"[Prefetch] Started {started} prefetch(es), {self.budget} left in budget")
+        return started
+
+    async def _prefetch(self, question: str, messages: List[Dict], resume_summary: str, job_summary: str,
+                        model: str, provider: Optional[str]):
+        try:
+            async with self._semaphore:
+                response_stream = await generate_response_async(
+                    messages, resume_summary, job_summary, model, provider
+                )
+                # Failed calls come back as a sync error iterator - never cache those
+                if not hasattr(response_stream, '__aiter__'):
+                    self.failed += 1
+                    return
+
+                answer = ""
+                async for chunk in response_stream:
+                    if chunk.choices and getattr(chunk.choices[0].delta, 'content', None):
+                        answer += chunk.choices[0].delta.content
+
+            if answer:
+                cache_speculative_answer(self.cache, question, answer)
+                self.completed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            print(f"[Prefetch] Error prefetching '{question[:50]}...': {e}")
+        finally:
+            self._in_flight.discard(question)
+
+    def cancel_all(self):
+        """Cancel every running prefetch (e.g. when the session ends)."""
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+        self._in_flight.clear()
+        self.cache.clear()
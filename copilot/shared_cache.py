@@ -0,0 +1,183 @@
+"""
+Shared Cache Backends
+Cache storage shared by every worker process (in-process for single-worker runs, Redis for multi-worker deployments)
+"""
+
+import json
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+
+class SharedCacheBackend(ABC):
+    """
+    Storage for cache entries that all workers should see.
+
+    Holds learned FAQ answers (keyed by question hash) and document summaries (keyed by
+    content hash). Every stored answer gets a sequence number, so a worker can cheaply pull
+    the answers other workers learned since its last sync with answers_since().
+    """
+
+    name = 'base'
+
+    @abstractmethod
+    def get_answer(self, question_hash: str) -> Optional[Dict]:
+        """The stored answer for a question hash, or None."""
+
+    @abstractmethod
+    def set_answer(self, question_hash: str, entry: Dict) -> int:
+        """Store an answer ({'question', 'answer', 'language'}) and return its sequence number."""
+
+    @abstractmethod
+    def answers_since(self, sequence: int) -> Tuple[int, List[Tuple[str, Dict]]]:
+        """
+        Answers stored after the given sequence number.
+
+        Returns:
+            (latest sequence number, [(question_hash, entry), ...])
+        """
+
+    @abstractmethod
+    def get_summary(self, kind: str, content_hash: str) -> Optional[Dict]:
+        """The stored summary for a document kind and content hash, or None."""
+
+    @abstractmethod
+    def set_summary(self, kind: str, content_hash: str, value: Dict, ttl_seconds: Optional[int] = None):
+        """Store a summary (expiring after ttl_seconds if given)."""
+
+    @abstractmethod
+    def clear_answers(self):
+        """Drop every stored answer (summaries are kept)."""
+
+
+class InProcessCacheBackend(SharedCacheBackend):
+    """
+    Dict-backed backend - shared by the threads of one process only (the default).
+
+    Keeps summaries but no answers: with a single process there is no other worker to share
+    them with, and the process's FAQ cache already holds every answer. A second copy would
+    only cost memory and bring back answers the FAQ cache evicted under its byte budget.
+    """
+
+    name = 'memory'
+
+    def __init__(self):
+        self._summaries: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+    def get_answer(self, question_hash):
+        return None
+
+    def set_answer(self, question_hash, entry):
+        return 0
+
+    def answers_since(self, sequence):
+        return sequence, []
+
+    def get_summary(self, kind, content_hash):
+        with self._lock:
+            value = self._summaries.get((kind, content_hash))
+            return dict(value) if value else None
+
+    def set_summary(self, kind, content_hash, value, ttl_seconds=None):
+        with self._lock:
+            # Only the latest summary per kind is worth keeping
+            for key in [key for key in self._summaries if key[0] == kind]:
+                del self._summaries[key]
+            self._summaries[(kind, content_hash)] = dict(value)
+
+    def clear_answers(self):
+        pass
+
+
+class RedisCacheBackend(SharedCacheBackend):
+    """
+    Redis-backed backend shared by all workers.
+
+    Layout (all keys under `prefix`):
+        {prefix}:faq:answers    hash   question_hash -> JSON entry
+        {prefix}:faq:sequence   string counter for answer sequence numbers
+        {prefix}:faq:changes    zset   question_hash scored by its latest sequence number
+        {prefix}:summary:{kind}:{content_hash}   JSON summary (optionally expiring)
+
+    Only the newest max_answers answers are kept.
+
+    A `client` with the redis-py interface can be passed instead of a URL (e.g. a fake in tests).
+    """
+
+    name = 'redis'
+
+    def __init__(self, url: str = 'redis://localhost:6379/0', prefix: str = 'copilot',
+                 max_answers: int = 5000, client=None):
+        if client is None:
+            import redis  # Installed with channels-redis
+            client = redis.Redis.from_url(url, decode_responses=True)
+        self._client = client
+        self._prefix = prefix
+        self.max_answers = max_answers
+
+    def _key(self, *parts: str) -> str:
+        return ':'.join((self._prefix,) + parts)
+
+    @staticmethod
+    def _decode(raw) -> Optional[Dict]:
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode('utf-8')
+        return json.loads(raw)
+
+    def get_answer(self, question_hash):
+        return self._decode(self._client.hget(self._key('faq', 'answers'), question_hash))
+
+    def set_answer(self, question_hash, entry):
+        sequence = int(self._client.incr(self._key('faq', 'sequence')))
+        pipe = self._client.pipeline()
+        pipe.hset(self._key('faq', 'answers'), question_hash, json.dumps(entry))
+        pipe.zadd(self._key('faq', 'changes'), {question_hash: sequence})
+        pipe.zcard(self._key('faq', 'changes'))
+        count = pipe.execute()[-1]
+
+        # Keep the newest max_answers (sequence numbers only grow, so the lowest scores are oldest)
+        if count > self.max_answers:
+            oldest = self._client.zpopmin(self._key('faq', 'changes'), count - self.max_answers)
+            if oldest:
+                self._client.hdel(self._key('faq', 'answers'), *[h for h, _ in oldest])
+        return sequence
+
+    def answers_since(self, sequence):
+        changed = self._client.zrangebyscore(self._key('faq', 'changes'), f'({sequence}', '+inf', withscores=True)
+        if not changed:
+            return sequence, []
+        hashes = [h.decode('utf-8') if isinstance(h, bytes) else h for h, _ in changed]
+        latest = int(max(score for _, score in changed))
+        raw_entries = self._client.hmget(self._key('faq', 'answers'), hashes)
+        return latest, [
+            (question_hash, self._decode(raw))
+            for question_hash, raw in zip(hashes, raw_entries) if raw is not None
+        ]
+
+    def get_summary(self, kind, content_hash):
+        return self._decode(self._client.get(self._key('summary', kind, content_hash)))
+
+    def set_summary(self, kind, content_hash, value, ttl_seconds=None):
+        self._client.set(self._key('summary', kind, content_hash), json.dumps(value), ex=ttl_seconds or None)
+
+    def clear_answers(self):
+        self._client.delete(self._key('faq', 'answers'), self._key('faq', 'changes'))
+
+
+SHARED_CACHE_BACKENDS = {
+    InProcessCacheBackend.name: InProcessCacheBackend,
+    RedisCacheBackend.name: RedisCacheBackend,
+}
+
+
+def create_shared_cache(backend: str = 'memory', url: str = '', prefix: str = 'copilot',
+                        max_answers: int = 5000) -> SharedCacheBackend:
+    """Create the configured shared cache backend ('memory' or 'redis')."""
+    if backend not in SHARED_CACHE_BACKENDS:
+        raise ValueError(f"Unknown shared cache backend '{backend}'. Use one of: {', '.join(SHARED_CACHE_BACKENDS)}")
+    if backend == RedisCacheBackend.name:
+        return RedisCacheBackend(url=url or 'redis://localhost:6379/0', prefix=prefix, max_answers=max_answers)
+    return InProcessCacheBackend()
@@ -0,0 +1,75 @@
+"""
+Single-Flight Answers
+Coalesces identical questions that arrive while an answer for them is still being generated
+"""
+
+import asyncio
+from typing import Dict, List, Optional, Set, Tuple
+
+
+class InFlightAnswer:
+    """
+    An answer being streamed by one request (the leader) and shared with later identical ones.
+
+    The leader sends each chunk to every subscribed group. A request from a group that is
+    not subscribed yet joins via subscribe(), which hands back the text produced so far so
+    it can be replayed before live chunks follow. `lock` serialises chunk fan-out with
+    subscriptions so a joining group never sees chunks out of order.
+    """
+
+    def __init__(self, group: str):
+        self.groups: Set[str] = {group}
+        self.chunks: List[str] = []
+        self.lock = asyncio.Lock()
+        self.done = asyncio.Event()
+        self.answer: Optional[str] = None
+        self.followers = 0
+        self.cancelled = False  # The leader was superseded by a newer question
+
+    def subscribe(self, group: str) -> str:
+        """Add a group (call with `lock` held). Returns the text streamed so far."""
+        self.groups.add(group)
+        self.followers += 1
+        return ''.join(self.chunks)
+
+    def finish(self, answer: str):
+        self.answer = answer
+        self.done.set()
+
+    async def wait(self) -> str:
+        """Wait for the leader to finish and return the full answer ('' if it failed)."""
+        await self.done.wait()
+        return self.answer or ''
+
+
+class SingleFlight:
+    """Registry of in-flight answers keyed by normalized question (one per process)."""
+
+    def __init__(self):
+        self._flights: Dict[str, InFlightAnswer] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def get(self, key: str) -> Optional[InFlightAnswer]:
+        return self._flights.get(key)
+
+    def acquire(self, key: str, group: str) -> Tuple[InFlightAnswer, bool]:
+        """
+        Join the in-flight answer for a question, or start one.
+
+        Returns:
+            (flight, True if the caller is the leader and must produce the answer)
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            return flight, False
+        flight = self._flights[key] = InFlightAnswer(group)
+        return flight, True
+
+    def release(self, key: str, flight: InFlightAnswer, answer: str = ''):
+        """Finish a flight (leader only); followers waiting on it get `answer`."""
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.done.is_set():
+            flight.finish(answer)
@@ -0,0 +1,114 @@
+"""
+Summary Jobs
+Runs document summarization in the background on a bounded worker pool, with progress for polling and push
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class SummaryJob:
+    """One background summarization: its status, current step and result."""
+
+    def __init__(self, kind: str, notify: Optional[Callable[[Dict], None]] = None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = QUEUED
+        self.step: Optional[str] = None
+        self.result: Dict = {}
+        self.error: Optional[str] = None
+        self.created = time.time()
+        self.updated = self.created
+        self._notify = notify
+
+    def progress(self, step: str):
+        """Report the step the job is working on."""
+        self.step = step
+        self._changed()
+
+    def _changed(self):
+        self.updated = time.time()
+        if self._notify is not None:
+            try:
+                self._notify(self.to_dict())
+            except Exception as e:
+                print(f'[Summary Jobs] Notification failed: {str(e)}')
+
+    def to_dict(self) -> Dict:
+        return {
+            'job_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'step': self.step,
+            'result': self.result,
+            'error': self.error,
+            'elapsed_seconds': round(self.updated - self.created, 2)
+        }
+
+
+class SummaryJobManager:
+    """
+    Bounded pool for summarization jobs.
+
+    submit() returns at once with a queued job; at most `workers` jobs run at a time (each
+    blocks a thread on LLM calls) and the rest wait their turn. Every status change is
+    passed to `notify` (e.g. to push it to connected sockets). The newest `history` jobs
+    are kept so clients can poll for their result after it finished.
+    """
+
+    def __init__(self, workers: int = 2, history: int = 100, notify: Optional[Callable[[Dict], None]] = None):
+        self.workers = workers
+        self.history = history
+        self.notify = notify
+        self._jobs: 'OrderedDict[str, SummaryJob]' = OrderedDict()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='summary-job')
+        return self._executor
+
+    def submit(self, kind: str, work: Callable[[SummaryJob], Dict]) -> SummaryJob:
+        """Queue work(job), whose return value becomes the job result."""
+        job = SummaryJob(kind, self.notify)
+        with self._lock:
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.history:
+                self._jobs.popitem(last=False)
+            executor = self._get_executor()
+        job._changed()
+        executor.submit(self._run, job, work)
+        return job
+
+    def _run(self, job: SummaryJob, work: Callable[[SummaryJob], Dict]):
+        job.status = RUNNING
+        job._changed()
+        try:
+            job.result = work(job) or {}
+            job.status = DONE
+            job.step = None
+        except Exception as e:
+            print(f'[Summary Jobs] {job.kind} job {job.id[:8]} failed: {str(e)}')
+            job.error = str(e)
+            job.status = FAILED
+        job._changed()
+        print(f'[Summary Jobs] {job.kind} job {job.id[:8]} {job.status} in {job.updated - job.created:.1f}s')
+
+    def get(self, job_id: str) -> Optional[SummaryJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return {status: sum(1 for job in jobs if job.status == status) for status in (QUEUED, RUNNING, DONE, FAILED)}
@@ -0,0 +1,95 @@
+"""
+Document Summary Store
+Content-hash keyed cache of extracted text, detected language and summary, persisted in SQLite
+"""
+
+import hashlib
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from django.db import transaction
+
+from .models import DocumentSummary
+from .pdf_extraction import file_sha256
+
+
+class SummaryStore:
+    """
+    Two-level cache for resume / job description summaries.
+
+    Entries are keyed on a SHA-256 of the document files' names and bytes, so the key only
+    changes when the content does (not on a touch or copy). The first level is in memory:
+    file hashes are memoized per (size, mtime), so an unchanged document set costs a few
+    os.stat() calls and a dict lookup. The second level is the database, which keeps the
+    extracted text, language and summary across restarts. The newest `keep_per_kind`
+    entries of each kind are kept, so switching back to an earlier resume is free too.
+    """
+
+    def __init__(self, keep_per_kind: int = 5):
+        self.keep_per_kind = keep_per_kind
+        self._file_hashes: Dict[str, Tuple[int, int, str]] = {}  # path -> (size, mtime_ns, sha256)
+        self._entries: Dict[Tuple[str, str], Dict] = {}
+        self._lock = threading.Lock()
+
+    def file_hash(self, path: str) -> str:
+        """SHA-256 of a file, recomputed only when its size or mtime changed."""
+        stat = os.stat(path)
+        with self._lock:
+            known = self._file_hashes.get(path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+
+        file_hash = file_sha256(path)
+        with self._lock:
+            self._file_hashes[path] = (stat.st_size, stat.st_mtime_ns, file_hash)
+        return file_hash
+
+    def content_hash(self, paths: List[str]) -> str:
+        """Hash of the names and contents of a set of documents."""
+        digest = hashlib.sha256()
+        for path in paths:
+            digest.update(f'{os.path.basename(path)}:{self.file_hash(path)}\n'.encode())
+        return digest.hexdigest()
+
+    def get(self, kind: str, content_hash: str) -> Optional[Dict]:
+        """Stored entry ({'text', 'language', 'language_code', 'summary'}) or None."""
+        with self._lock:
+            entry = self._entries.get((kind, content_hash))
+        if entry is not None:
+            return entry
+
+        row = DocumentSummary.objects.filter(kind=kind, content_hash=content_hash).values(
+            'text', 'language', 'language_code', 'summary'
+        ).first()
+        if row is not None:
+            self._remember(kind, content_hash, row)
+        return row
+
+    def _remember(self, kind: str, content_hash: str, entry: Dict):
+        with self._lock:
+            self._entries.pop((kind, content_hash), None)
+            self._entries[(kind, content_hash)] = entry
+            keys = [key for key in self._entries if key[0] == kind]
+            for key in keys[:-self.keep_per_kind]:
+                del self._entries[key]
+
+    def save(self, kind: str, content_hash: str, text: str, language: str, language_code: str, summary: str):
+        """Store an entry and drop the oldest entries of the same kind beyond keep_per_kind."""
+        entry = {'text': text, 'language': language, 'language_code': language_code, 'summary': summary}
+        self._remember(kind, content_hash, entry)
+
+        with transaction.atomic():
+            DocumentSummary.objects.update_or_create(kind=kind, content_hash=content_hash, defaults=entry)
+            stale = DocumentSummary.objects.filter(kind=kind).order_by('-updated_at').values_list(
+                'pk', flat=True
+            )[self.keep_per_kind:]
+            DocumentSummary.objects.filter(pk__in=list(stale)).delete()
+
+    def clear(self) -> int:
+        """Forget every entry (memory and database)."""
+        with self._lock:
+            self._entries.clear()
+            self._file_hashes.clear()
+        deleted, _ = DocumentSummary.objects.all().delete()
+        return deleted
@@ -0,0 +1,73 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from copilot.chunk_coalescer import ChunkCoalescer
+
+
+class ChunkCoalescerTests(SimpleTestCase):
+    def setUp(self):
+        self.sent = []
+
+    async def send(self, text):
+        self.sent.append(text)
+
+    async def test_tokens_are_batched_until_flush(self):
+        coalescer = ChunkCoalescer(self.send, interval=10, max_bytes=1000)
+        for token in ['Spark ', 'uses ', 'lazy ', 'evaluation']:
+            await coalescer.add(token)
+        self.assertEqual(self.sent, [])
+
+        await coalescer.flush()
+        self.assertEqual(self.sent, ['Spark uses lazy evaluation'])
+        self.assertEqual((coalescer.chunks_in, coalescer.messages_out), (4, 1))
+        coalescer.close()
+
+    async def test_flushes_at_the_byte_limit(self):
+        coalescer = ChunkCoalescer(self.send, interval=10, max_bytes=10)
+        for token in ['abcd', 'efgh', 'ijkl', 'mn']:
+            await coalescer.add(token)
+
+        self.assertEqual(self.sent, ['abcdefghijkl'])
+        coalescer.close()
+
+    async def test_byte_limit_counts_utf8(self):
+        coalescer = ChunkCoalescer(self.send, interval=10, max_bytes=10)
+        await coalescer.add('données ')
+        await coalescer.add('é')
+
+        self.assertEqual(self.sent, ['données é'])
+        coalescer.close()
+
+    async def test_flushes_at_sentence_ends(self):
+        coalescer = ChunkCoalescer(self.send, interval=10, max_bytes=1000)
+        for token in ['It ', 'depends', '. ', 'First', ',', ' the', ' data', ':\n']:
+            await coalescer.add(token)
+
+        self.assertEqual(self.sent, ['It depends. ', 'First, the data:\n'])
+        coalescer.close()
+
+    async def test_timer_flushes_a_stalled_stream(self):
+        coalescer = ChunkCoalescer(self.send, interval=0.02, max_bytes=1000)
+        await coalescer.add('Partial ')
+        await coalescer.add('answer')
+        self.assertEqual(self.sent, [])
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.sent, ['Partial answer'])
+        coalescer.close()
+
+    async def test_zero_interval_sends_every_chunk(self):
+        coalescer = ChunkCoalescer(self.send, interval=0)
+        for token in ['a', 'b', 'c']:
+            await coalescer.add(token)
+
+        self.assertEqual(self.sent, ['a', 'b', 'c'])
+
+    async def test_close_drops_the_pending_flush(self):
+        coalescer = ChunkCoalescer(self.send, interval=0.02, max_bytes=1000)
+        await coalescer.add('cancelled answer')
+        coalescer.close()
+
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.sent, [])
@@ -0,0 +1,145 @@
+import asyncio
+
+from django.test import SimpleTestCase
+
+from copilot.context_retrieval import ContextIndex, last_question, split_into_chunks
+from copilot.conversation import ConversationHistory, fit_messages_to_budget, message_tokens
+from copilot.tokens import estimate_tokens
+
+
+def turns(count, start=0):
+    messages = []
+    for i in range(start, start + count):
+        messages.append({'role': 'user', 'content': f'Question {i}?'})
+        messages.append({'role': 'assistant', 'content': f'Answer {i}.'})
+    return messages
+
+
+class ConversationHistoryTests(SimpleTestCase):
+    async def test_old_turns_are_folded_into_the_summary(self):
+        calls = []
+
+        async def summarizer(summary, messages):
+            calls.append([m['content'] for m in messages])
+            return 'Discussed questions 0 and 1.'
+
+        history = ConversationHistory(summarizer=summarizer, keep_turns=2, fold_after=2)
+        for message in turns(4):
+            history.append(message)
+        await history._fold_task
+
+        self.assertEqual(calls, [['Question 0?', 'Answer 0.', 'Question 1?', 'Answer 1.']])
+        self.assertEqual(history.folded_messages, 4)
+        prompt = history.for_prompt()
+        self.assertEqual(prompt[0]['role'], 'system')
+        self.assertIn('Discussed questions 0 and 1.', prompt[0]['content'])
+        self.assertEqual([m['content'] for m in prompt[1:]], ['Question 2?', 'Answer 2.', 'Question 3?', 'Answer 3.'])
+
+    async def test_turns_stay_verbatim_until_the_fold_threshold(self):
+        history = ConversationHistory(summarizer=None, keep_turns=2, fold_after=2)
+        for message in turns(3):
+            history.append(message)
+
+        self.assertIsNone(history._fold_task)
+        self.assertEqual(history.for_prompt(), turns(3))
+
+    async def test_failed_summarizer_falls_back_to_an_extractive_summary(self):
+        async def summarizer(summary, messages):
+            raise RuntimeError('rate limited')
+
+        history = ConversationHistory(summarizer=summarizer, keep_turns=1, fold_after=1)
+        for message in turns(2):
+            history.append(message)
+        await history._fold_task
+
+        self.assertEqual(history.summary, 'Q: Question 0?\nA: Answer 0.')
+        self.assertEqual(len(history), 2)
+
+    async def test_close_cancels_a_running_fold(self):
+        async def summarizer(summary, messages):
+            await asyncio.sleep(10)
+
+        history = ConversationHistory(summarizer=summarizer, keep_turns=1, fold_after=1)
+        for message in turns(2):
+            history.append(message)
+        history.close()
+
+        with self.assertRaises(asyncio.CancelledError):
+            await history._fold_task
+        self.assertEqual(history.summary, '')
+        self.assertEqual(len(history), 4)
+
+    def test_folds_synchronously_without_an_event_loop(self):
+        history = ConversationHistory(summarizer=None, keep_turns=1, fold_after=1, summary_max_tokens=300)
+        for message in turns(2):
+            history.append(message)
+
+        self.assertEqual(history.summary, 'Q: Question 0?\nA: Answer 0.')
+        self.assertEqual([m['content'] for m in history], ['Question 1?', 'Answer 1.'])
+
+
+class BudgetTests(SimpleTestCase):
+    def test_messages_within_budget_are_kept(self):
+        messages = turns(2)
+        self.assertEqual(fit_messages_to_budget('System.', messages, 1000), messages)
+
+    def test_oldest_turns_go_first_and_the_question_is_kept(self):
+        summary = {'role': 'system', 'content': 'Summary ' * 20}
+        messages = [summary] + turns(3) + [{'role': 'user', 'content': 'Current question?'}]
+        budget = estimate_tokens('System.') + sum(message_tokens(m) for m in messages[-3:]) + message_tokens(summary)
+
+        fitted = fit_messages_to_budget('System.', messages, budget)
+        self.assertEqual(fitted, [summary] + messages[-3:])
+
+        fitted = fit_messages_to_budget('System.', messages, estimate_tokens('System.') + 10)
+        self.assertEqual(len(fitted), 1)
+        self.assertEqual(fitted[0]['role'], 'user')
+        self.assertTrue('Current question?'.endswith(fitted[0]['content']))
+
+
+RESUME = """# Jane Doe - Senior Data Engineer
+Eight years building data platforms.
+
+## Streaming
+Built Kafka and Spark Structured Streaming pipelines processing 2M events per second.
+Designed exactly-once sinks with idempotent writes.
+
+## Warehousing
+Modeled a Snowflake warehouse with dbt, star schemas and slowly changing dimensions.
+
+## Leadership
+Mentored five engineers and ran the on-call rotation.
+"""
+
+
+class ContextIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = ContextIndex(RESUME, chunk_tokens=40)
+
+    def test_chunks_follow_sections(self):
+        self.assertEqual([chunk.splitlines()[0] for chunk in split_into_chunks(RESUME, 40)],
+                         ['# Jane Doe - Senior Data Engineer', '## Streaming', '## Warehousing', '## Leadership'])
+
+    def test_short_documents_are_sent_whole(self):
+        self.assertEqual(self.index.select('Tell me about Kafka', budget_tokens=10_000), RESUME)
+
+    def test_selects_the_relevant_section_and_the_lead(self):
+        selected = self.index.select('How did you build your Kafka streaming pipelines?', budget_tokens=60, top_k=1)
+
+        self.assertIn('Jane Doe', selected)
+        self.assertIn('Kafka', selected)
+        self.assertNotIn('Snowflake', selected)
+        self.assertNotIn('Mentored', selected)
+        self.assertLessEqual(estimate_tokens(selected), 60)
+
+    def test_ranking_prefers_matching_terms(self):
+        scores = self.index.scores('Which warehouse modeling did you do with dbt?')
+        self.assertEqual(max(range(len(scores)), key=scores.__getitem__), 2)
+
+    def test_unmatched_questions_fall_back_to_document_order(self):
+        selected = self.index.select('What are your hobbies?', budget_tokens=40)
+        self.assertTrue(selected.startswith('# Jane Doe'))
+
+    def test_last_question(self):
+        self.assertEqual(last_question(turns(2)), 'Question 1?')
+        self.assertIsNone(last_question([]))
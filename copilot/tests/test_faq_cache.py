@@ -0,0 +1,140 @@
+from datetime import datetime, timedelta
+
+from django.test import SimpleTestCase
+
+from copilot.faq_cache import BoundedFAQCache, SpeculativeAnswerCache
+
+
+def entry(question, hit_count=0, age_seconds=0, language='en'):
+    return {
+        'question': question,
+        'answer': f'Answer to {question}',
+        'language': language,
+        'timestamp': datetime.now() - timedelta(seconds=age_seconds),
+        'hit_count': hit_count
+    }
+
+
+class EvictionTests(SimpleTestCase):
+    def test_lru_evicts_least_recently_used(self):
+        cache = BoundedFAQCache(max_entries=3, policy='lru')
+        for key in 'abc':
+            cache.put(key, entry(key))
+        cache.get('a')
+
+        self.assertEqual(cache.put('d', entry('d')), ['b'])
+        self.assertEqual(sorted(cache.keys()), ['a', 'c', 'd'])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_lfu_evicts_least_hit(self):
+        cache = BoundedFAQCache(max_entries=3, policy='lfu')
+        for key in 'abc':
+            cache.put(key, entry(key))
+        cache.record_hit('a')
+        cache.record_hit('a')
+        cache.record_hit('c')
+
+        self.assertEqual(cache.put('d', entry('d')), ['b'])
+        # d has no hits yet, so it is the next to go
+        self.assertEqual(cache.put('e', entry('e')), ['d'])
+        self.assertEqual(sorted(cache.keys()), ['a', 'c', 'e'])
+
+    def test_lfu_breaks_ties_by_least_recent_use(self):
+        cache = BoundedFAQCache(max_entries=2, policy='lfu')
+        cache.put('a', entry('a'))
+        cache.put('b', entry('b'))
+        cache.record_hit('a')
+        cache.record_hit('b')
+
+        self.assertEqual(cache.put('c', entry('c', hit_count=5)), ['a'])
+
+    def test_ttl_policy_evicts_oldest(self):
+        cache = BoundedFAQCache(max_entries=3, policy='ttl')
+        cache.put('new', entry('new', age_seconds=10))
+        cache.put('old', entry('old', age_seconds=300))
+        cache.put('mid', entry('mid', age_seconds=100))
+
+        self.assertEqual(cache.put('now', entry('now')), ['old'])
+
+    def test_expired_entries_are_dropped_on_access(self):
+        cache = BoundedFAQCache(ttl_seconds=60)
+        cache.put('stale', entry('stale', age_seconds=120))
+        cache.put('faq', entry('faq', age_seconds=120), pinned=True)
+
+        self.assertIsNone(cache.get('stale'))
+        self.assertNotIn('stale', cache)
+        self.assertIsNotNone(cache.get('faq'))
+        self.assertEqual(cache.expirations, 1)
+
+    def test_expired_entries_go_before_evictions(self):
+        cache = BoundedFAQCache(max_entries=2, policy='lfu', ttl_seconds=60)
+        cache.put('stale', entry('stale', hit_count=10, age_seconds=120))
+        cache.put('fresh', entry('fresh'))
+
+        self.assertEqual(cache.put('new', entry('new')), ['stale'])
+        self.assertEqual(cache.expirations, 1)
+        self.assertEqual(cache.evictions, 0)
+
+    def test_memory_budget_evicts(self):
+        cache = BoundedFAQCache(max_entries=100, max_bytes=1000, policy='lru')
+        for i in range(10):
+            cache.put(str(i), entry(f'question {i}'))
+
+        self.assertLessEqual(cache.stats()['bytes_used'], 1000)
+        self.assertIn('9', cache)
+        self.assertNotIn('0', cache)
+
+    def test_pinned_entries_are_never_evicted(self):
+        for policy in ('lru', 'lfu', 'ttl'):
+            with self.subTest(policy=policy):
+                cache = BoundedFAQCache(max_entries=2, policy=policy)
+                cache.put('faq1', entry('faq1', age_seconds=600), pinned=True)
+                cache.put('faq2', entry('faq2', age_seconds=600), pinned=True)
+
+                self.assertEqual(cache.put('learned', entry('learned', hit_count=50)), ['learned'])
+                # Only pinned entries left: the cache goes over budget rather than drop one
+                self.assertEqual(cache.put('faq3', entry('faq3'), pinned=True), [])
+                self.assertEqual(sorted(cache.keys()), ['faq1', 'faq2', 'faq3'])
+
+    def test_running_stats_follow_evictions(self):
+        cache = BoundedFAQCache(max_entries=2, policy='lfu')
+        cache.put('a', entry('a', language='fr'))
+        cache.put('b', entry('b'))
+        cache.record_hit('b')
+        cache.put('c', entry('c'))
+
+        self.assertEqual(cache.partition_counts(), {'en': 2})
+        self.assertEqual(cache.total_hits, 1)
+        self.assertEqual([key for key, _ in cache.top()], ['b', 'c'])
+        self.assertEqual(cache.page(language='fr'), (0, []))
+
+
+class SpeculativeAnswerCacheTests(SimpleTestCase):
+    def test_take_matches_fuzzily_and_consumes(self):
+        cache = SpeculativeAnswerCache()
+        cache.put('k1', 'How do you handle late arriving data?', 'Watermarks.')
+        cache.put('k2', 'What is your experience with Kafka?', 'Three years.')
+
+        match = cache.take('other', 'so, how do you handle late arriving data?')
+        self.assertIsNotNone(match)
+        self.assertEqual(match[0]['answer'], 'Watermarks.')
+        self.assertIsNone(cache.take('k1', 'How do you handle late arriving data?'))
+        self.assertEqual(cache.take('k2', 'anything')[1], 1.0)
+        self.assertEqual(len(cache), 0)
+
+    def test_index_follows_evictions_without_rebuilding_on_lookup(self):
+        questions = [
+            'How do you partition a Delta table?',
+            'What is your experience with Kafka?',
+            'Explain slowly changing dimensions.',
+            'How would you tune a skewed Spark join?',
+            'Describe a data quality incident you handled.',
+        ]
+        cache = SpeculativeAnswerCache(max_entries=3)
+        for i, question in enumerate(questions):
+            cache.put(f'k{i}', question, str(i))
+
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(len(cache._index), 3)
+        self.assertIsNone(cache.take('x', questions[0]))
+        self.assertEqual(cache.take('x', questions[3])[0]['answer'], '3')
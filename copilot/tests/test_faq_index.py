@@ -0,0 +1,92 @@
+from django.test import SimpleTestCase
+
+from copilot.faq_index import FAQIndex
+
+QUESTIONS = [
+    "What is ETL?",
+    "What is ELT?",
+    "What is the difference between ETL and ELT?",
+    "What is the difference between OLTP and OLAP?",
+    "What does a good data model look like?",
+    "How well do you know Spark?",
+]
+
+
+class FAQIndexMatchingTests(SimpleTestCase):
+    def setUp(self):
+        self.index = FAQIndex(threshold=0.75)
+        self.index.build({question: question for question in QUESTIONS})
+
+    def assertHits(self, question, expected):
+        match = self.index.search(question)
+        self.assertIsNotNone(match, f"{question!r} missed")
+        self.assertEqual(match[0], expected)
+
+    def assertMisses(self, question, unexpected):
+        match = self.index.best_match(question)
+        if match is not None and match[0] == unexpected:
+            self.assertLess(match[1], self.index.threshold, f"{question!r} matched {unexpected!r}")
+
+    def test_exact_question_hits(self):
+        for question in QUESTIONS:
+            self.assertHits(question, question)
+
+    def test_spoken_near_duplicates_hit(self):
+        self.assertHits("so, what is ETL exactly?", "What is ETL?")
+        self.assertHits("can you tell me what ETL is?", "What is ETL?")
+        self.assertHits("what is, like, ETL?", "What is ETL?")
+        self.assertHits("so like, what is ELT?", "What is ELT?")
+        self.assertHits("um what's the difference between ETL and ELT", "What is the difference between ETL and ELT?")
+        self.assertHits("what's the difference between OLTP and OLAP, right?",
+                        "What is the difference between OLTP and OLAP?")
+
+    def test_filler_variants_score_like_the_clean_question(self):
+        self.assertAlmostEqual(self.index.best_match("uh so, what is ETL exactly?")[1],
+                               self.index.best_match("What is ETL?")[1], places=5)
+
+    def test_real_distinctions_miss(self):
+        self.assertMisses("What is ETL?", "What is ELT?")
+        self.assertMisses("What is ELT?", "What is ETL?")
+        self.assertMisses("so, what is ELT exactly?", "What is ETL?")
+        self.assertMisses("What is the difference between ETL and ELT?", "What is the difference between OLTP and OLAP?")
+        self.assertIsNone(self.index.search("How do you handle merge conflicts in git?"))
+
+    def test_markers_are_content_words_inside_a_clause(self):
+        self.assertEqual(self.index._tokenize("What does a good data model look like?")[-2:], ['look', 'like'])
+        self.assertIn('well', self.index._tokenize("How well do you know Spark?"))
+        self.assertEqual(self.index._tokenize("so, um, like, basically"), ['so', 'um', 'like', 'basically'])
+
+
+class FAQIndexUpdateTests(SimpleTestCase):
+    def setUp(self):
+        self.index = FAQIndex(threshold=0.75, max_pending=2)
+        self.index.build({question: question for question in QUESTIONS[:4]})
+
+    def test_added_questions_are_searchable_before_a_rebuild(self):
+        self.index.add('spark', "How well do you know Spark?")
+
+        self.assertIn('spark', self.index)
+        self.assertEqual(len(self.index), 5)
+        self.assertEqual(self.index.search("so, how well do you know Spark?")[0], 'spark')
+
+    def test_removed_questions_stop_matching(self):
+        self.index.remove("What is ETL?")
+
+        self.assertNotIn("What is ETL?", self.index)
+        self.assertEqual(len(self.index), 3)
+        match = self.index.search("What is ETL?")
+        self.assertTrue(match is None or match[0] != "What is ETL?")
+
+    def test_readding_a_key_replaces_its_question(self):
+        self.index.add("What is ETL?", "How well do you know Spark?")
+
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.search("How well do you know Spark?")[0], "What is ETL?")
+
+    def test_compaction_is_requested_after_enough_changes(self):
+        self.index.add('a', "What does a good data model look like?")
+        self.index.add('b', "How well do you know Spark?")
+        self.assertFalse(self.index.needs_compaction)
+
+        self.index.add('c', "How do you handle merge conflicts in git?")
+        self.assertTrue(self.index.needs_compaction)
@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from copilot import utils
+from copilot.models import FAQEntry
+
+
+class FAQCacheTestCase(TestCase):
+    def setUp(self):
+        utils.clear_faq_cache()
+        self.addCleanup(utils.clear_faq_cache)
+
+
+class LanguagePartitionTests(FAQCacheTestCase):
+    def test_fuzzy_match_within_the_question_language(self):
+        utils.cache_answer("What is the difference between ETL and ELT?", 'Where the transform runs.', language='en')
+
+        result = utils.get_cached_answer("so, what is the difference between ETL and ELT?", language='en')
+        self.assertEqual(result['answer'], 'Where the transform runs.')
+        self.assertEqual(result['matched_question'], "What is the difference between ETL and ELT?")
+        self.assertGreaterEqual(result['similarity'], 0.75)
+
+    def test_other_partitions_are_not_searched(self):
+        utils.cache_answer("Qu'est-ce que Databricks Auto Loader?", 'Un outil d\'ingestion.', language='fr')
+
+        self.assertIsNone(utils.get_cached_answer("Alors, qu'est-ce que Databricks Auto Loader?", language='en'))
+        self.assertEqual(utils.get_cached_answer("Alors, qu'est-ce que Databricks Auto Loader?", language='fr')['answer'],
+                         'Un outil d\'ingestion.')
+
+    def test_recaching_in_another_language_moves_the_entry(self):
+        utils.cache_answer("What is Unity Catalog?", 'Governance.', language='en')
+        utils.cache_answer("What is Unity Catalog?", 'Gouvernance.', language='fr')
+
+        self.assertIsNone(utils._search_faq_index("What is Unity Catalog?", 'en'))
+        self.assertEqual(utils._search_faq_index("What is Unity Catalog?", 'fr')[0],
+                         utils.get_question_hash("What is Unity Catalog?"))
+
+
+class FAQReloadTests(FAQCacheTestCase):
+    def setUp(self):
+        super().setUp()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.faq_file = os.path.join(directory.name, 'faq.json')
+        settings_override = override_settings(FAQ_FILES=self.faq_file)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def write_faqs(self, faqs, language='en'):
+        with open(self.faq_file, 'w', encoding='utf-8') as f:
+            json.dump({'language': language, 'faqs': [{'question': q, 'answer': a} for q, a in faqs]}, f)
+
+    def test_reload_applies_a_diff(self):
+        self.write_faqs([("What is ETL?", 'Extract, transform, load.'),
+                         ("What is ELT?", 'Extract, load, transform.'),
+                         ("What is OLAP?", 'Analytics.')])
+        self.assertEqual(utils.load_faq_files(),
+                         {'loaded': 3, 'added': 3, 'updated': 0, 'removed': 0, 'unchanged': 0})
+        utils.get_cached_answer("What is ETL?")
+
+        self.write_faqs([("What is ETL?", 'Extract, transform, load.'),
+                         ("What is ELT?", 'Load first, transform in the warehouse.'),
+                         ("What is a data lakehouse?", 'A lake with warehouse features.')])
+        self.assertEqual(utils.load_faq_files(),
+                         {'loaded': 3, 'added': 1, 'updated': 1, 'removed': 1, 'unchanged': 1})
+
+        self.assertEqual(utils.get_cached_answer("What is ELT?")['answer'], 'Load first, transform in the warehouse.')
+        self.assertEqual(utils.get_cached_answer("so, what is a data lakehouse?")['answer'], 'A lake with warehouse features.')
+        self.assertEqual(utils.get_cached_answer("What is ETL?")['hit_count'], 2)
+        self.assertIsNone(utils._search_faq_index("What is OLAP?", 'en'))
+        self.assertEqual(FAQEntry.objects.filter(source=FAQEntry.SOURCE_FILE).count(), 3)
+
+    def test_reload_keeps_llm_answers(self):
+        self.write_faqs([("What is ETL?", 'Extract, transform, load.')])
+        utils.load_faq_files()
+        utils.cache_answer("How do you size a Spark cluster?", 'Start from the data volume.')
+
+        self.write_faqs([("What is ELT?", 'Extract, load, transform.')])
+        result = utils.load_faq_files()
+
+        self.assertEqual((result['added'], result['removed']), (1, 1))
+        self.assertEqual(utils.get_cached_answer("How do you size a Spark cluster?")['answer'], 'Start from the data volume.')
+
+    def test_missing_files_keep_the_current_cache(self):
+        self.write_faqs([("What is ETL?", 'Extract, transform, load.')])
+        utils.load_faq_files()
+        os.remove(self.faq_file)
+
+        self.assertEqual(utils.load_faq_files()['loaded'], 0)
+        self.assertIsNotNone(utils.get_cached_answer("What is ETL?"))
@@ -0,0 +1,72 @@
+from unittest import mock
+
+from django.db import DatabaseError
+from django.test import TestCase
+
+from copilot import utils
+from copilot.faq_store import FAQStore
+from copilot.models import FAQEntry
+
+
+class FAQStoreTests(TestCase):
+    def setUp(self):
+        self.store = FAQStore(batch_size=3)
+
+    def test_writes_are_buffered_until_flush(self):
+        self.assertFalse(self.store.enqueue_answer('h1', 'What is ETL?', 'Extract, transform, load.'))
+        self.assertEqual(FAQEntry.objects.count(), 0)
+        self.assertEqual(self.store.pending_count(), 1)
+
+        self.assertEqual(self.store.flush(), 1)
+        self.assertEqual(self.store.pending_count(), 0)
+        row = FAQEntry.objects.get(question_hash='h1')
+        self.assertEqual((row.question, row.answer, row.source), ('What is ETL?', 'Extract, transform, load.', 'llm'))
+
+    def test_enqueue_reports_a_full_batch(self):
+        self.assertFalse(self.store.enqueue_answer('h1', 'q1', 'a1'))
+        self.assertFalse(self.store.record_hit('h0'))
+        self.assertTrue(self.store.enqueue_answer('h2', 'q2', 'a2'))
+
+    def test_flush_upserts_and_keeps_hit_counts(self):
+        self.store.enqueue_answer('h1', 'What is ETL?', 'old')
+        self.store.flush()
+        self.store.record_hit('h1')
+        self.store.record_hit('h1')
+        self.store.flush()
+
+        self.store.enqueue_answer('h1', 'What is ETL?', 'new', language='en')
+        self.store.record_hit('h1')
+        self.assertEqual(self.store.flush(), 2)
+
+        row = FAQEntry.objects.get(question_hash='h1')
+        self.assertEqual(row.answer, 'new')
+        self.assertEqual(row.hit_count, 3)
+        self.assertEqual(FAQEntry.objects.count(), 1)
+
+    def test_failed_flush_keeps_writes_for_retry(self):
+        self.store.enqueue_answer('h1', 'q1', 'a1')
+        self.store.record_hit('h1')
+
+        with mock.patch.object(FAQEntry.objects, 'bulk_create', side_effect=DatabaseError('locked')):
+            with self.assertRaises(DatabaseError):
+                self.store.flush()
+        self.assertEqual(self.store.pending_count(), 2)
+        self.assertEqual(FAQEntry.objects.count(), 0)
+
+        # A newer answer queued before the retry wins over the one that failed
+        self.store.enqueue_answer('h1', 'q1', 'a2')
+        self.assertEqual(self.store.flush(), 2)
+        self.assertEqual(FAQEntry.objects.get(question_hash='h1').answer, 'a2')
+
+    def test_flush_helper_swallows_database_errors(self):
+        with mock.patch.object(utils._faq_store, 'flush', side_effect=DatabaseError('locked')):
+            self.assertEqual(utils.flush_faq_store(), 0)
+
+    def test_replace_file_entries_keeps_llm_answers(self):
+        self.store.enqueue_answer('learned', 'q', 'a')
+        self.store.flush()
+        self.store.replace_file_entries([('f1', 'q1', 'a1', 'en'), ('f2', 'q2', 'a2', 'fr')])
+        self.store.replace_file_entries([('f2', 'q2', 'a2 edited', 'fr')])
+
+        self.assertEqual(sorted(FAQEntry.objects.values_list('question_hash', flat=True)), ['f2', 'learned'])
+        self.assertEqual(FAQEntry.objects.get(question_hash='f2').answer, 'a2 edited')
@@ -0,0 +1,32 @@
+from django.test import SimpleTestCase
+
+from copilot.language import detect_language, detect_language_code, identify_language
+
+
+class LanguageIdentificationTests(SimpleTestCase):
+    def assertLanguage(self, text, expected):
+        self.assertEqual(detect_language_code(text), expected, text)
+
+    def test_interview_questions(self):
+        self.assertLanguage("What is the difference between a data lake and a data warehouse?", 'en')
+        self.assertLanguage("Quelle est la différence entre un data lake et un data warehouse ?", 'fr')
+        self.assertLanguage("¿Cuál es la diferencia entre un data lake y un data warehouse?", 'es')
+        self.assertLanguage("Qual é a diferença entre um data lake e um data warehouse?", 'pt')
+        self.assertLanguage("Was ist der Unterschied zwischen einem Data Lake und einem Data Warehouse?", 'de')
+
+    def test_product_names_do_not_decide_the_language(self):
+        self.assertLanguage("Qu'est-ce que Databricks Auto Loader?", 'fr')
+        self.assertLanguage("¿Qué es Databricks Auto Loader?", 'es')
+        self.assertLanguage("Was ist Databricks Auto Loader?", 'de')
+        self.assertLanguage("What is Databricks Auto Loader?", 'en')
+
+    def test_confidence(self):
+        code, confidence = identify_language("Pouvez-vous décrire votre expérience avec Apache Spark et Delta Lake ?")
+        self.assertEqual(code, 'fr')
+        self.assertGreater(confidence, 0.5)
+
+    def test_empty_text_defaults_to_english(self):
+        self.assertLanguage('', 'en')
+        self.assertLanguage('   ', 'en')
+        self.assertEqual(detect_language(''), 'English')
+        self.assertEqual(detect_language("Quelle est votre expérience avec Kafka ?"), 'French')
@@ -0,0 +1,202 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest import mock
+from urllib.parse import parse_qs
+
+from channels.testing import WebsocketCommunicator
+from django.test import SimpleTestCase
+
+from copilot import utils
+from copilot.consumers import InterviewConsumer
+from copilot.single_flight import SingleFlight
+
+
+class SingleFlightTests(SimpleTestCase):
+    async def test_first_caller_leads_and_later_ones_follow(self):
+        flights = SingleFlight()
+        flight, is_leader = flights.acquire('q', 'room-a')
+        same, follows = flights.acquire('q', 'room-b')
+
+        self.assertTrue(is_leader)
+        self.assertIs(same, flight)
+        self.assertFalse(follows)
+        self.assertEqual(len(flights), 1)
+
+    async def test_subscribe_replays_streamed_text(self):
+        flight, _ = SingleFlight().acquire('q', 'room-a')
+        flight.chunks.extend(['Part one. ', 'Part two. '])
+
+        async with flight.lock:
+            self.assertEqual(flight.subscribe('room-b'), 'Part one. Part two. ')
+        self.assertEqual(flight.groups, {'room-a', 'room-b'})
+        self.assertEqual(flight.followers, 1)
+
+    async def test_release_wakes_followers(self):
+        flights = SingleFlight()
+        flight, _ = flights.acquire('q', 'room-a')
+        waiter = asyncio.create_task(flight.wait())
+        await asyncio.sleep(0)
+
+        flights.release('q', flight, 'The answer.')
+        self.assertEqual(await waiter, 'The answer.')
+        self.assertIsNone(flights.get('q'))
+        self.assertTrue(flights.acquire('q', 'room-a')[1])
+
+    async def test_failed_leader_hands_followers_an_empty_answer(self):
+        flights = SingleFlight()
+        flight, _ = flights.acquire('q', 'room-a')
+        flights.release('q', flight)
+
+        self.assertEqual(await flight.wait(), '')
+
+
+def chunk(text):
+    return SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
+
+
+class FakeStream:
+    """LLM stream that sends its first chunk, then waits for `gate` before sending the rest."""
+
+    def __init__(self, question):
+        self.question = question
+        self.gate = asyncio.Event()
+        self.closed = False
+
+    async def __aiter__(self):
+        yield chunk(f'Answer to {self.question} ')
+        await self.gate.wait()
+        yield chunk('More detail.')
+
+    def close(self):
+        self.closed = True
+
+
+class RoomConsumer(InterviewConsumer):
+    """Consumer in the room named by the `room` query parameter (the real one has a single room)."""
+
+    async def connect(self):
+        await super().connect()
+        room = parse_qs(self.scope['query_string'].decode()).get('room', ['interview_room'])[0]
+        await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
+        self.room_group_name = room
+        await self.channel_layer.group_add(room, self.channel_name)
+
+
+class ConsumerSingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        utils.clear_faq_cache()
+        self.addCleanup(utils.clear_faq_cache)
+        self.streams = []
+
+        async def generate_response_async(messages, *args, **kwargs):
+            stream = FakeStream(messages[-1]['content'])
+            self.streams.append(stream)
+            return stream
+
+        patches = [
+            mock.patch('copilot.consumers.generate_response_async', side_effect=generate_response_async),
+            mock.patch('copilot.consumers.queue_faq_write', return_value=False),
+            mock.patch('copilot.consumers.flush_faq_store', return_value=0),
+            mock.patch.multiple(
+                InterviewConsumer,
+                _faq_loaded=True,
+                _faq_flush_task=SimpleNamespace(done=lambda: False),
+                _resume_cache=('Resume', 'English', 'en'),
+                _job_cache=('Job', 'English', 'en'),
+                _cache_timestamp=time.time()
+            )
+        ]
+        for patch in patches:
+            patch.start()
+            self.addCleanup(patch.stop)
+
+    async def connect(self, room):
+        communicator = WebsocketCommunicator(RoomConsumer.as_asgi(), f'/ws/interview/?room={room}')
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual((await communicator.receive_json_from())['type'], 'initialization')
+        return communicator
+
+    async def ask(self, communicator, question):
+        await communicator.send_json_to({
+            'type': 'transcription', 'text': question, 'predictions_enabled': False, 'hedge_enabled': False
+        })
+
+    async def receive_until(self, communicator, message_type):
+        messages = []
+        while not messages or messages[-1]['type'] != message_type:
+            messages.append(await communicator.receive_json_from(timeout=2))
+        return messages
+
+    def answer_text(self, messages):
+        return ''.join(message['text'] for message in messages if message['type'] == 'answer_chunk')
+
+    async def test_identical_questions_share_one_stream(self):
+        question = 'How do you design a CDC pipeline?'
+        leader, follower = await self.connect('room-a'), await self.connect('room-b')
+
+        await self.ask(leader, question)
+        await self.receive_until(leader, 'answer_chunk')
+        await self.ask(follower, question)
+        replayed = await self.receive_until(follower, 'answer_chunk')
+        self.streams[0].gate.set()
+
+        leader_messages = await self.receive_until(leader, 'answer_complete')
+        follower_messages = replayed + await self.receive_until(follower, 'answer_complete')
+
+        self.assertEqual(len(self.streams), 1)
+        self.assertEqual(self.answer_text(leader_messages), 'More detail.')
+        self.assertEqual(self.answer_text(follower_messages), f'Answer to {question} More detail.')
+        self.assertEqual(len(InterviewConsumer._single_flight), 0)
+        await leader.disconnect()
+        await follower.disconnect()
+
+    async def test_superseded_follower_stops_receiving_the_shared_answer(self):
+        question = 'What is your experience with Kafka?'
+        leader, follower = await self.connect('room-a'), await self.connect('room-b')
+
+        await self.ask(leader, question)
+        await self.receive_until(leader, 'answer_chunk')
+        await self.ask(follower, question)
+        await self.receive_until(follower, 'answer_chunk')
+
+        await self.ask(follower, 'How do you test data pipelines?')
+        self.assertEqual((await follower.receive_json_from(timeout=2))['type'], 'answer_cancelled')
+        follower_messages = await self.receive_until(follower, 'answer_chunk')
+        self.assertFalse(self.streams[0].closed)
+        self.streams[0].gate.set()
+
+        leader_messages = await self.receive_until(leader, 'answer_complete')
+        self.assertNotIn('answer_cancelled', [message['type'] for message in leader_messages])
+        self.assertEqual(self.answer_text(leader_messages), 'More detail.')
+
+        self.streams[1].gate.set()
+        follower_messages += await self.receive_until(follower, 'answer_complete')
+        self.assertEqual(self.answer_text(follower_messages), 'Answer to How do you test data pipelines? More detail.')
+        await leader.disconnect()
+        await follower.disconnect()
+
+    async def test_superseded_leader_closes_its_stream_and_tells_followers(self):
+        question = 'How do you handle schema evolution?'
+        leader, follower = await self.connect('room-a'), await self.connect('room-b')
+
+        await self.ask(leader, question)
+        await self.receive_until(leader, 'answer_chunk')
+        await self.ask(follower, question)
+        await self.receive_until(follower, 'answer_chunk')
+
+        await self.ask(leader, 'What is a data contract?')
+        self.assertEqual((await leader.receive_json_from(timeout=2))['type'], 'answer_cancelled')
+        self.assertEqual((await follower.receive_json_from(timeout=2))['type'], 'answer_cancelled')
+        self.assertTrue(self.streams[0].closed)
+        self.assertIsNone(InterviewConsumer._single_flight.get(utils.get_question_hash(question)))
+
+        # The superseded answer was not cached
+        await self.receive_until(leader, 'answer_chunk')
+        self.streams[1].gate.set()
+        await self.receive_until(leader, 'answer_complete')
+        self.assertIsNone(utils.get_cached_answer(question))
+        self.assertTrue(await follower.receive_nothing(timeout=0.2))
+        await leader.disconnect()
+        await follower.disconnect()
@@ -0,0 +1,12 @@
+"""
+Token Estimates
+Cheap token counts for prompt budgeting and metrics, without loading a tokenizer
+"""
+
+# Average characters per token of OpenAI tokenizers on English text
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for OpenAI tokenizers)."""
+    return max(1, round(len(text) / CHARS_PER_TOKEN)) if text else 0
@@ -8,10 +8,14 @@ urlpatterns = [
     path('generate-summaries/', views.generate_summaries, name='generate_summaries'),
     path('save-job-text/', views.save_job_text, name='save_job_text'),
     path('get-summaries/', views.get_summaries, name='get_summaries'),
+    path('summary-jobs/<str:job_id>/', views.get_summary_job_status, name='get_summary_job_status'),
     path('calendar-interviews/', views.get_calendar_interviews, name='get_calendar_interviews'),
     path('compare-llms/', views.compare_llms, name='compare_llms'),
+    path('compare-llms/fanout/', views.compare_llms_fanout, name='compare_llms_fanout'),
     path('upload-faq/', views.upload_faq, name='upload_faq'),
     path('get-faq-stats/', views.get_faq_stats, name='get_faq_stats'),
+    path('get-faq-metrics/', views.get_faq_metrics, name='get_faq_metrics'),
+    path('get-llm-stats/', views.get_llm_stats, name='get_llm_stats'),
     path('get-faq-data/', views.get_faq_data, name='get_faq_data'),
     path('clear-faq/', views.clear_faq, name='clear_faq'),
     path('generate-company-questions/', views.generate_company_questions, name='generate_company_questions'),
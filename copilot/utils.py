@@ -1,17 +1,41 @@
 import os
 import json
-import PyPDF2
 from django.conf import settings
-import openai
-from openai import AsyncOpenAI
+import glob
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
 import hashlib
+import threading
+import time
+import weakref
 from datetime import datetime, timedelta
-
-# Configure OpenAI
-openai.api_key = settings.OPENAI_API_KEY if settings.OPENAI_API_KEY else None
-
-# Create async client for better performance
-async_openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if settings.OPENAI_API_KEY else None
+from django.db import DatabaseError
+from .faq_cache import BoundedFAQCache, SpeculativeAnswerCache
+from .faq_index import FAQIndex
+from .faq_metrics import FAQCacheMetrics
+from .faq_store import FAQStore
+from .llm_gateway import LLMGateway, parse_model_overrides
+from .context_retrieval import ContextIndex, last_question
+from .conversation import fit_messages_to_budget
+from .language import LANGUAGE_NAMES, detect_language_code
+from .shared_cache import create_shared_cache
+from .pdf_extraction import PDFTextExtractor
+from .summary_jobs import SummaryJobManager
+from .summary_store import SummaryStore
+
+# Pooled OpenAI clients for every LLM call in this process (sync and async callers)
+llm_gateway = LLMGateway(
+    api_key=settings.OPENAI_API_KEY,
+    timeout=settings.LLM_TIMEOUT,
+    connect_timeout=settings.LLM_CONNECT_TIMEOUT,
+    max_connections=settings.LLM_MAX_CONNECTIONS,
+    max_keepalive_connections=settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+    default_concurrency=settings.LLM_DEFAULT_CONCURRENCY,
+    model_concurrency=parse_model_overrides(settings.LLM_MODEL_CONCURRENCY, int, 'LLM_MODEL_CONCURRENCY'),
+    model_timeouts=parse_model_overrides(settings.LLM_MODEL_TIMEOUTS, float, 'LLM_MODEL_TIMEOUTS')
+)
 
 # Cache for summaries to improve performance
 _resume_cache = {
@@ -31,7 +55,78 @@ _job_cache = {
 }
 
 # FAQ Cache: Store frequently asked questions and their answers for instant responses
-_faq_cache = {}  # Key: normalized question hash, Value: {'question': str, 'answer': str, 'timestamp': datetime, 'hit_count': int}
+# Key: normalized question hash, Value: {'question': str, 'answer': str, 'language': str, 'timestamp': datetime, 'hit_count': int}
+# Bounded by entry count and memory; preloaded FAQ entries are pinned and never evicted
+_faq_cache = BoundedFAQCache(
+    max_entries=settings.FAQ_CACHE_MAX_ENTRIES,
+    max_bytes=settings.FAQ_CACHE_MAX_BYTES,
+    policy=settings.FAQ_CACHE_EVICTION_POLICY,
+    ttl_seconds=settings.FAQ_CACHE_TTL
+)
+
+# Fuzzy retrieval indexes over _faq_cache questions, one per language partition
+# (updated in place as the cache changes, compacted by rebuilds off the request path)
+_faq_indexes = {}  # Key: language code, Value: FAQIndex
+_faq_index_lock = threading.Lock()
+# Rebuilds in progress. Key: token, Value: (language, or None for all, [changes since the rebuild's snapshot])
+_faq_index_journals = {}
+_faq_index_compacting = set()  # Languages with a compaction running
+
+# Answers prefetched for predicted next questions, one cache per session (they are built from
+# that session's conversation and documents); tracked here only for the stats
+_speculative_caches = weakref.WeakSet()
+
+# Cache shared by all worker processes: answers learned on one worker are pulled into the
+# others' _faq_cache, and summaries are reused across workers (in-process unless Redis is configured;
+# the in-process backend holds summaries only, _faq_cache is the one copy of the answers)
+_shared_cache = create_shared_cache(
+    backend=settings.SHARED_CACHE_BACKEND,
+    url=settings.REDIS_URL,
+    prefix=settings.SHARED_CACHE_PREFIX,
+    max_answers=settings.FAQ_CACHE_MAX_ENTRIES
+)
+_shared_sequence = 0  # Last shared answer sequence number pulled into _faq_cache
+_shared_synced_at = 0.0
+_shared_sync_lock = threading.Lock()
+
+# Hit rate, near misses, lookup latency and estimated LLM savings (this process)
+_faq_metrics = FAQCacheMetrics(
+    latency_window=settings.FAQ_METRICS_LATENCY_WINDOW,
+    default_llm_seconds=settings.FAQ_METRICS_DEFAULT_LLM_SECONDS
+)
+
+# BM25 indexes over the chunks of the resume / job summaries, so prompts only carry the
+# parts relevant to the question (rebuilt when a summary changes)
+_context_indexes = {}  # Key: 'resume' or 'job', Value: ContextIndex
+_context_index_lock = threading.Lock()
+
+# Resume / job summaries for prompts, keyed by a fingerprint of the documents on disk, so
+# callers that only need the context skip text extraction and language detection
+_interview_context = {
+    'fingerprint': None,
+    'resume_summary': '',
+    'job_summary': ''
+}
+_interview_context_lock = threading.Lock()
+
+# Resume and job description pipelines run side by side (see get_document_summaries)
+_summary_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='summary')
+_summary_locks = {'resume': threading.Lock(), 'job': threading.Lock()}
+
+# Durable copy of the FAQ cache in db.sqlite3 (LLM answers are written behind in batches)
+_faq_store = FAQStore(batch_size=settings.FAQ_STORE_BATCH_SIZE)
+
+# Resume / job summaries by document content hash (in memory, then SQLite)
+_summary_store = SummaryStore(keep_per_kind=settings.SUMMARY_STORE_KEEP)
+
+# PDF page text by (file hash, page); large PDFs are parsed across a process pool
+_pdf_extractor = PDFTextExtractor(
+    workers=settings.PDF_EXTRACT_WORKERS,
+    parallel_min_pages=settings.PDF_PARALLEL_MIN_PAGES,
+    cache_max_pages=settings.PDF_PAGE_CACHE_MAX_PAGES
+)
+_faq_warmed = False
+_faq_warm_lock = threading.Lock()
 
 def normalize_question(question):
     """Normalize a question for cache lookup (remove punctuation, lowercase, trim)."""
@@ -49,140 +144,592 @@ def get_question_hash(question):
     normalized = normalize_question(question)
     return hashlib.md5(normalized.encode()).hexdigest()
 
-def get_cached_answer(question):
+def _add_to_faq_indexes(indexes, question_hash, question, language):
+    """Index one question in its language partition (and out of any other)."""
+    for code, index in indexes.items():
+        if code != language:
+            index.remove(question_hash)
+    if language not in indexes:
+        indexes[language] = FAQIndex(threshold=settings.FAQ_MATCH_THRESHOLD)
+    indexes[language].add(question_hash, question)
+
+def _journal_faq_index_change(question_hash, question=None, language=None):
+    """Record a change for the rebuilds in progress, which replay it on swap (caller holds the index lock)."""
+    for partition, changes in _faq_index_journals.values():
+        if question is None or partition is None or partition == language:
+            changes.append((question_hash, question, language))
+
+def _start_faq_index_rebuild(language=None):
+    """Begin journaling index changes. Call before taking the snapshot the rebuild is built from."""
+    token = object()
+    with _faq_index_lock:
+        _faq_index_journals[token] = (language, [])
+    return token
+
+def _finish_faq_index_rebuild(token, indexes):
+    """Replay the changes made while `indexes` were built and swap them in (caller holds the index lock)."""
+    _, changes = _faq_index_journals.pop(token)
+    for question_hash, question, language in changes:
+        if question is None:
+            for index in indexes.values():
+                index.remove(question_hash)
+        else:
+            _add_to_faq_indexes(indexes, question_hash, question, language)
+    _faq_indexes.update(indexes)
+
+def _maybe_compact_faq_index(language):
+    """Rebuild a partition in the background once enough changed since its last build (caller holds the lock)."""
+    index = _faq_indexes.get(language)
+    if index is None or not index.needs_compaction or language in _faq_index_compacting:
+        return
+    _faq_index_compacting.add(language)
+    token = object()
+    _faq_index_journals[token] = (language, [])
+    threading.Thread(target=_compact_faq_index, args=(language, token), name='faq-index-compact', daemon=True).start()
+
+def _compact_faq_index(language, token):
+    """Build a fresh index for one language partition and swap it in."""
+    try:
+        index = FAQIndex(threshold=settings.FAQ_MATCH_THRESHOLD)
+        index.build({key: entry['question'] for key, entry in _faq_cache.items() if entry.get('language', 'en') == language})
+        with _faq_index_lock:
+            _finish_faq_index_rebuild(token, {language: index})
+        print(f"[FAQ Index] Compacted '{language}' partition ({len(index)} entries)")
+    except Exception as e:
+        print(f"[FAQ Index] Compaction of '{language}' failed: {str(e)}")
+        with _faq_index_lock:
+            _faq_index_journals.pop(token, None)
+    finally:
+        with _faq_index_lock:
+            _faq_index_compacting.discard(language)
+
+def _index_faq_entry(question_hash, question, language):
+    """Add a newly cached question to the FAQ indexes (no rebuild)."""
+    with _faq_index_lock:
+        _add_to_faq_indexes(_faq_indexes, question_hash, question, language)
+        _journal_faq_index_change(question_hash, question, language)
+        _maybe_compact_faq_index(language)
+
+def _unindex_faq_entries(question_hashes):
+    """Remove questions that left the cache (evicted, expired or deleted) from the FAQ indexes."""
+    if not question_hashes:
+        return
+    with _faq_index_lock:
+        for question_hash in question_hashes:
+            for index in _faq_indexes.values():
+                index.remove(question_hash)
+            _journal_faq_index_change(question_hash)
+        for language in list(_faq_indexes):
+            _maybe_compact_faq_index(language)
+
+def _rebuild_faq_indexes():
+    """Rebuild every partition from the cache after a bulk load (built aside, then swapped in)."""
+    token = _start_faq_index_rebuild()
+    indexes = _build_faq_indexes(_faq_cache.items())
+    with _faq_index_lock:
+        _faq_indexes.clear()
+        _finish_faq_index_rebuild(token, indexes)
+    print(f"[FAQ Index] Built partitions: {', '.join(f'{code}={len(index)}' for code, index in indexes.items())}")
+
+def _build_faq_indexes(entries):
+    """Build one FAQIndex per language partition from (hash, entry) pairs."""
+    partitions = {}
+    for key, entry in entries:
+        partitions.setdefault(entry.get('language', 'en'), {})[key] = entry['question']
+
+    indexes = {}
+    for code, questions in partitions.items():
+        indexes[code] = FAQIndex(threshold=settings.FAQ_MATCH_THRESHOLD)
+        indexes[code].build(questions)
+    return indexes
+
+def _search_faq_index(question, language, near_miss=False):
+    """
+    Fuzzy-match a question against the FAQ partition for its language.
+    Returns (hash, similarity) or None. With near_miss=True the best match is
+    returned even when it is below the match threshold.
+    """
+    with _faq_index_lock:
+        index = _faq_indexes.get(language)
+        if index is None:
+            return None
+        return index.best_match(question) if near_miss else index.search(question)
+
+def _shared_call(method, *args, default=None):
+    """Call the shared cache backend. It only speeds things up, so failures are logged and ignored."""
+    try:
+        return method(*args)
+    except Exception as e:
+        print(f'[Shared Cache] {method.__name__} failed: {str(e)}')
+        return default
+
+def _store_shared_entry(question_hash, entry):
+    """Put an answer learned by another worker into the local FAQ cache (without re-publishing it)."""
+    local = _faq_cache.get(question_hash)
+    if local is not None and local['answer'] == entry['answer']:
+        return local
+
+    local = {
+        'question': entry['question'],
+        'answer': entry['answer'],
+        'language': entry.get('language') or detect_language_code(entry['question']),
+        'timestamp': datetime.now(),
+        'hit_count': local['hit_count'] if local else 0
+    }
+    _unindex_faq_entries(_faq_cache.put(question_hash, local))
+    _index_faq_entry(question_hash, local['question'], local['language'])
+    return local
+
+def sync_shared_answers(force=False):
+    """
+    Pull answers other workers stored in the shared cache into the local FAQ cache.
+    Runs at most every SHARED_CACHE_SYNC_INTERVAL seconds unless forced.
+    Returns the number of entries pulled.
+    """
+    global _shared_sequence, _shared_synced_at
+
+    now = time.monotonic()
+    if not force and now - _shared_synced_at < settings.SHARED_CACHE_SYNC_INTERVAL:
+        return 0
+
+    with _shared_sync_lock:
+        _shared_synced_at = now
+        result = _shared_call(_shared_cache.answers_since, _shared_sequence)
+        if result is None:
+            return 0
+        _shared_sequence, changed = result
+
+    for question_hash, entry in changed:
+        _store_shared_entry(question_hash, entry)
+
+    if changed:
+        print(f'[Shared Cache] Pulled {len(changed)} answers from other workers (sequence: {_shared_sequence})')
+    return len(changed)
+
+def get_cached_answer(question, language=None, speculative_cache=None):
     """
     Get cached answer for a question if it exists.
+    Tries an exact match on the normalized question first, then the fuzzy FAQ index
+    of the question's language partition (detected when not given), then the answers
+    prefetched for this session's predicted questions (speculative_cache). A prefetched
+    answer is moved into the FAQ cache and flagged with 'speculative'.
     Returns dict with 'answer' and 'cached' flag, or None if not found.
     """
+    started = time.perf_counter()
     question_hash = get_question_hash(question)
-
-    if question_hash in _faq_cache:
-        cached_entry = _faq_cache[question_hash]
-        # Update hit count
-        cached_entry['hit_count'] += 1
-        print(f"[FAQ Cache HIT] Question: '{question[:50]}...' (hits: {cached_entry['hit_count']})")
+    similarity = 1.0
+    hit_kind = 'exact'  # Which lookup found the answer (a fuzzy match can also score 1.0)
+    near_miss = None
+
+    sync_shared_answers()
+
+    cached_entry = _faq_cache.get(question_hash)
+    if cached_entry is None:
+        # Exact hit on another worker's answer that has not been synced (or was evicted here)
+        shared_entry = _shared_call(_shared_cache.get_answer, question_hash)
+        if shared_entry is not None:
+            cached_entry = _store_shared_entry(question_hash, shared_entry)
+
+    if cached_entry is None:
+        match = _search_faq_index(question, language or detect_language_code(question), near_miss=True)
+        if match and match[1] >= settings.FAQ_MATCH_THRESHOLD:
+            cached_entry = _faq_cache.get(match[0])
+            if cached_entry is None:
+                # Expired since it was indexed
+                _unindex_faq_entries([match[0]])
+            else:
+                question_hash, similarity = match
+                hit_kind = 'fuzzy'
+        elif match:
+            near_miss = match[1]
+
+    if cached_entry is not None:
+        # Update hit count (and the cache's running stats / top-K)
+        cached_entry = _faq_cache.record_hit(question_hash) or cached_entry
+        _faq_metrics.record_hit(hit_kind, time.perf_counter() - started, cached_entry['answer'])
+        print(f"[FAQ Cache HIT] Question: '{question[:50]}...' (hits: {cached_entry['hit_count']}, similarity: {similarity:.2f})")
         return {
             'answer': cached_entry['answer'],
             'cached': True,
-            'hit_count': cached_entry['hit_count']
+            'hit_count': cached_entry['hit_count'],
+            'matched_question': cached_entry['question'],
+            'similarity': similarity
+        }
+
+    speculative = speculative_cache.take(question_hash, question) if speculative_cache is not None else None
+    if speculative is not None:
+        entry, similarity = speculative
+        _faq_metrics.record_hit('speculative', time.perf_counter() - started, entry['answer'])
+        cache_answer(question, entry['answer'])
+        print(f"[Prefetch HIT] Question: '{question[:50]}...' (predicted: '{entry['question'][:50]}', similarity: {similarity:.2f})")
+        return {
+            'answer': entry['answer'],
+            'cached': True,
+            'speculative': True,
+            'hit_count': 1,
+            'matched_question': entry['question'],
+            'similarity': similarity
         }
 
-    print(f"[FAQ Cache MISS] Question: '{question[:50]}...'")
+    _faq_metrics.record_miss(near_miss, time.perf_counter() - started)
+    near_miss_info = f" (closest similarity: {near_miss:.2f})" if near_miss is not None else ""
+    print(f"[FAQ Cache MISS] Question: '{question[:50]}...'{near_miss_info}")
     return None
 
-def cache_answer(question, answer):
-    """Cache an answer for future use."""
+def record_llm_response(seconds, answer):
+    """Record how long a generated answer took (to estimate what cache hits save)."""
+    _faq_metrics.record_llm_answer(seconds, answer)
+
+def get_faq_cache_metrics(prometheus=False):
+    """FAQ cache telemetry as a dict, or as Prometheus text."""
+    if prometheus:
+        return _faq_metrics.to_prometheus()
+    return _faq_metrics.snapshot()
+
+def is_answer_available(question, speculative_cache=None):
+    """
+    Check (without counting a hit) whether a question would be answered from cache,
+    including this session's prefetched answers. Searches the FAQ index: call it from a thread.
+    """
     question_hash = get_question_hash(question)
+    if question_hash in _faq_cache or (speculative_cache is not None and question_hash in speculative_cache):
+        return True
+    return _search_faq_index(question, detect_language_code(question)) is not None
+
+def new_speculative_cache():
+    """Cache for the answers prefetched in one session (only that session may be served from it)."""
+    cache = SpeculativeAnswerCache(ttl_seconds=settings.PREFETCH_TTL, threshold=settings.FAQ_MATCH_THRESHOLD)
+    _speculative_caches.add(cache)
+    return cache
+
+def cache_speculative_answer(speculative_cache, question, answer):
+    """Store an answer prefetched for a predicted question in the session's cache."""
+    speculative_cache.put(get_question_hash(question), question, answer)
+    print(f"[Prefetch SAVED] Question: '{question[:50]}...' (Prefetched this session: {len(speculative_cache)})")
+
+def _speculative_stats():
+    """Prefetch counters summed over the live sessions."""
+    totals = {}
+    for cache in list(_speculative_caches):
+        for name, value in cache.stats().items():
+            totals[name] = totals.get(name, 0) + value
+    return totals
+
+def cache_answer(question, answer, pinned=False, language=None):
+    """
+    Cache an answer for future use, in the partition of the question's language.
+    Pinned entries (preloaded FAQ) are never evicted. Other answers are also published
+    to the shared cache so every worker can serve them.
+    """
+    question_hash = get_question_hash(question)
+    language = language or detect_language_code(question)
 
-    _faq_cache[question_hash] = {
+    evicted = _faq_cache.put(question_hash, {
         'question': question,
         'answer': answer,
+        'language': language,
         'timestamp': datetime.now(),
         'hit_count': 0
-    }
+    }, pinned=pinned)
+    _unindex_faq_entries(evicted)
+    _index_faq_entry(question_hash, question, language)
+
+    if not pinned:
+        # Preloaded FAQ entries are loaded by every worker anyway
+        _shared_call(_shared_cache.set_answer, question_hash,
+                     {'question': question, 'answer': answer, 'language': language})
+
+    if evicted:
+        print(f"[FAQ Cache EVICT] Removed {len(evicted)} entries ({_faq_cache.policy.name} policy)")
 
     print(f"[FAQ Cache SAVED] Question: '{question[:50]}...' (Total cached: {len(_faq_cache)})")
 
+def queue_faq_write(question, answer):
+    """Queue an LLM answer for the durable FAQ store. Returns True when a flush is due."""
+    return _faq_store.enqueue_answer(get_question_hash(question), question, answer, detect_language_code(question))
+
+def queue_faq_hit(question):
+    """Queue a hit-count increment for a cached question. Returns True when a flush is due."""
+    return _faq_store.record_hit(get_question_hash(question))
+
+def flush_faq_store():
+    """Write queued FAQ answers and hit counts to the database."""
+    try:
+        written = _faq_store.flush()
+    except DatabaseError as e:
+        print(f'[FAQ Store] Flush failed, will retry: {str(e)}')
+        return 0
+
+    if written:
+        print(f'[FAQ Store] Flushed {written} writes to database')
+    return written
+
+def warm_faq_cache():
+    """
+    Populate the FAQ cache from the database once per process.
+    The FAQ file is only parsed when the database has no copy of it or the file is newer.
+    """
+    global _faq_warmed
+
+    with _faq_warm_lock:
+        if _faq_warmed:
+            return len(_faq_cache)
+
+        try:
+            rows = _faq_store.load_all()
+        except DatabaseError as e:
+            print(f'[FAQ Store] Database unavailable, loading FAQ files instead: {str(e)}')
+            load_faq_files(persist=False)
+            _faq_warmed = True
+            return len(_faq_cache)
+
+        # Oldest first, so the most recent answers survive if the cache is over budget
+        for row in sorted(rows, key=lambda row: row['updated_at']):
+            _faq_cache.put(row['question_hash'], {
+                'question': row['question'],
+                'answer': row['answer'],
+                'language': row['language'],
+                'timestamp': row['updated_at'].astimezone().replace(tzinfo=None),
+                'hit_count': row['hit_count']
+            }, pinned=row['source'] == 'file')
+        _rebuild_faq_indexes()
+        print(f'[FAQ Store] Warm-loaded {len(rows)} entries from database')
+
+        # Re-seed from the FAQ files if they were never stored or one has been edited since
+        faq_files = get_faq_files()
+        file_rows = [row for row in rows if row['source'] == 'file']
+        if faq_files:
+            stored_at = max((row['updated_at'].timestamp() for row in file_rows), default=0)
+            if max(os.path.getmtime(path) for path in faq_files) > stored_at:
+                load_faq_files()
+
+        _faq_warmed = True
+        return len(_faq_cache)
+
+def start_faq_cache_warmup():
+    """Warm the FAQ cache on a background thread so server startup isn't blocked."""
+    threading.Thread(target=warm_faq_cache, name='faq-cache-warmup', daemon=True).start()
+
 def get_faq_cache_stats():
-    """Get statistics about the FAQ cache."""
+    """Get statistics about the FAQ cache (from running counters, no scan of the entries)."""
     if not _faq_cache:
         return "FAQ Cache is empty"
 
-    total_questions = len(_faq_cache)
-    total_hits = sum(entry['hit_count'] for entry in _faq_cache.values())
-    most_asked = max(_faq_cache.values(), key=lambda x: x['hit_count'])
+    top = [entry for _, entry in _faq_cache.top(5)]
 
     return {
-        'total_questions': total_questions,
-        'total_hits': total_hits,
-        'most_asked_question': most_asked['question'],
-        'most_asked_hits': most_asked['hit_count']
+        'total_questions': len(_faq_cache),
+        'total_hits': _faq_cache.total_hits,
+        'most_asked_question': top[0]['question'],
+        'most_asked_hits': top[0]['hit_count'],
+        'top_questions': [
+            {'question': entry['question'], 'hit_count': entry['hit_count'], 'language': entry.get('language', 'en')}
+            for entry in top
+        ],
+        'partitions': _faq_cache.partition_counts(),
+        **_faq_cache.stats(),
+        **_speculative_stats()
     }
 
-def load_faq_from_file():
-    """Load FAQ questions and answers from faq_data_eng.json file into cache."""
-    faq_file_path = os.path.join(settings.BASE_DIR, 'faq_data_eng.json')
+def get_faq_files():
+    """
+    Resolve the FAQ files configured in settings.FAQ_FILES (comma-separated paths, globs
+    or directories, relative to BASE_DIR). Earlier entries take precedence.
+    """
+    faq_files = []
+    for pattern in settings.FAQ_FILES.split(','):
+        pattern = pattern.strip()
+        if not pattern:
+            continue
+        path = os.path.join(settings.BASE_DIR, pattern)
+        if os.path.isdir(path):
+            path = os.path.join(path, '*.json')
+        for faq_file in sorted(glob.glob(path)):
+            if faq_file not in faq_files:
+                faq_files.append(faq_file)
+    return faq_files
+
+def read_faq_files():
+    """
+    Parse every configured FAQ file without touching the cache.
+    Each entry goes into the partition of its language: the entry's "language" field, the
+    file's top-level "language" field, or the language detected from the question.
+    When the same question appears in several files, the first file wins.
 
-    if not os.path.exists(faq_file_path):
-        print('[FAQ Loader] faq_data_eng.json not found - skipping preload')
-        return 0
+    Returns:
+        Dict of question hash -> {'question', 'answer', 'language'}, in file order
+    """
+    faq_entries = {}
 
-    try:
-        with open(faq_file_path, 'r', encoding='utf-8') as f:
-            faq_data = json.load(f)
+    for faq_file_path in get_faq_files():
+        try:
+            with open(faq_file_path, 'r', encoding='utf-8') as f:
+                faq_data = json.load(f)
+        except Exception as e:
+            print(f'[FAQ Loader] Error loading FAQ file {os.path.basename(faq_file_path)}: {str(e)}')
+            continue
 
-        faqs = faq_data.get('faqs', [])
-        loaded_count = 0
+        file_language = faq_data.get('language')
+        file_count = 0
 
-        for faq in faqs:
+        for faq in faq_data.get('faqs', []):
             question = faq.get('question', '').strip()
             answer = faq.get('answer', '').strip()
+            question_hash = get_question_hash(question)
 
-            if question and answer:
-                # Use cache_answer to populate the cache
-                cache_answer(question, answer)
-                loaded_count += 1
+            if question and answer and question_hash not in faq_entries:
+                faq_entries[question_hash] = {
+                    'question': question,
+                    'answer': answer,
+                    'language': faq.get('language') or file_language or detect_language_code(question)
+                }
+                file_count += 1
 
-        print(f'[FAQ Loader] Successfully loaded {loaded_count} FAQ entries into cache')
-        return loaded_count
+        print(f'[FAQ Loader] Read {file_count} entries from {os.path.basename(faq_file_path)}')
 
-    except Exception as e:
-        print(f'[FAQ Loader] Error loading FAQ file: {str(e)}')
-        return 0
+    return faq_entries
 
-def reload_faq_cache():
-    """Reload FAQ cache from file - clears existing cache and reloads."""
-    global _faq_cache
+def load_faq_files(persist=True):
+    """
+    Load the configured FAQ files into the cache (and the FAQ store) without ever emptying it.
 
-    # Clear existing cache
-    old_count = len(_faq_cache)
-    _faq_cache.clear()
-    print(f'[FAQ Reload] Cleared {old_count} entries from cache')
+    The new entries are diffed against the pinned FAQ entries currently cached and the search
+    indexes for the result are built off to the side. Then the diff and the new indexes are
+    swapped in together, so concurrent lookups see either the old or the new FAQ set.
+    Hit counts and LLM-learned entries are kept.
 
-    # Reload from file
-    new_count = load_faq_from_file()
+    Returns:
+        Dict with 'loaded', 'added', 'updated', 'removed' and 'unchanged' counts
+    """
+    faq_entries = read_faq_files()
+    if not faq_entries:
+        # Never drop the current FAQ set because the files are missing or unreadable
+        print(f'[FAQ Loader] No FAQ entries found in {settings.FAQ_FILES!r} - keeping current cache')
+        return {'loaded': 0, 'added': 0, 'updated': 0, 'removed': 0, 'unchanged': 0}
+
+    token = _start_faq_index_rebuild()
+    entries, version = _faq_cache.snapshot()
+    current = dict(entries)
+
+    # Diff against what is cached now
+    puts = {}
+    updated_count = 0
+    for question_hash, faq in faq_entries.items():
+        existing = current.get(question_hash)
+        if existing is not None and existing.get('pinned') and all(existing.get(field) == faq[field] for field in faq):
+            continue
+        if existing is not None:
+            updated_count += 1
+        puts[question_hash] = {
+            **faq,
+            'timestamp': datetime.now(),
+            'hit_count': existing['hit_count'] if existing else 0,
+            'pinned': True
+        }
+    removals = [key for key, entry in entries if entry.get('pinned') and key not in faq_entries]
 
-    # Reset the consumer flag to force reload on next connection
+    # Build the indexes for the post-reload contents before touching the live cache
+    removed = set(removals)
+    new_entries = [(key, entry) for key, entry in entries if key not in removed and key not in puts]
+    new_entries.extend(puts.items())
     try:
-        from copilot.consumers import InterviewConsumer
-        InterviewConsumer._faq_loaded = False
-        print(f'[FAQ Reload] Reset consumer flag for next connection')
-    except Exception as e:
-        print(f'[FAQ Reload] Warning: Could not reset consumer flag: {str(e)}')
+        new_indexes = _build_faq_indexes(new_entries)
+    except Exception:
+        with _faq_index_lock:
+            _faq_index_journals.pop(token, None)
+        raise
+
+    # Swap: cache contents and indexes change together while lookups wait on the index lock.
+    # Answers cached while we were building are replayed from the journal.
+    with _faq_index_lock:
+        evicted, _ = _faq_cache.apply(puts, removals, expected_version=version)
+        _faq_indexes.clear()
+        _finish_faq_index_rebuild(token, new_indexes)
+        for index in _faq_indexes.values():
+            for key in evicted:
+                index.remove(key)
+
+    result = {
+        'loaded': len(faq_entries),
+        'added': len(puts) - updated_count,
+        'updated': updated_count,
+        'removed': len(removals),
+        'unchanged': len(faq_entries) - len(puts)
+    }
+    print(f"[FAQ Loader] Loaded {result['loaded']} FAQ entries "
+          f"(added {result['added']}, updated {result['updated']}, removed {result['removed']}, unchanged {result['unchanged']})")
+
+    if persist:
+        try:
+            _faq_store.replace_file_entries(
+                (question_hash, faq['question'], faq['answer'], faq['language']) for question_hash, faq in faq_entries.items()
+            )
+            print(f'[FAQ Loader] Stored {len(faq_entries)} FAQ entries in database')
+        except DatabaseError as e:
+            print(f'[FAQ Loader] Warning: Could not store FAQ entries in database: {str(e)}')
+
+    return result
+
+def reload_faq_cache():
+    """Reload FAQ cache from the FAQ files - applied as an atomic diff, the cache is never emptied."""
+    old_count = len(_faq_cache)
+    result = load_faq_files()
 
     return {
         'old_count': old_count,
-        'new_count': new_count,
+        'new_count': result['loaded'],
+        'added': result['added'],
+        'updated': result['updated'],
+        'removed': result['removed'],
         'success': True
     }
 
 def clear_faq_cache():
-    """Clear all FAQ cache entries."""
+    """Clear all FAQ cache entries (in memory; the FAQ store keeps its answers and hit counts)."""
     global _faq_cache
     count = len(_faq_cache)
     _faq_cache.clear()
+    with _faq_index_lock:
+        _faq_indexes.clear()
+    _shared_call(_shared_cache.clear_answers)
     print(f'[FAQ Clear] Cleared {count} entries from cache')
     return count
 
-def get_all_faq_data():
-    """Get all FAQ questions and answers from cache."""
-    if not _faq_cache:
-        return []
+def _faq_item(entry):
+    """JSON-friendly view of a FAQ cache entry."""
+    return {
+        'question': entry['question'],
+        'answer': entry['answer'],
+        'hit_count': entry['hit_count'],
+        'language': entry.get('language', 'en'),
+        'source': 'file' if entry.get('pinned') else 'llm',
+        'timestamp': entry['timestamp'].isoformat() if entry['timestamp'] else None
+    }
 
-    # Convert cache to list of Q&A pairs, sorted by question
-    faq_list = []
-    for entry in _faq_cache.values():
-        faq_list.append({
-            'question': entry['question'],
-            'answer': entry['answer'],
-            'hit_count': entry['hit_count'],
-            'timestamp': entry['timestamp'].isoformat() if entry['timestamp'] else None
-        })
+def get_faq_page(offset=0, limit=50, language=None, prefix='', search='', source=None):
+    """
+    Get one page of FAQ questions and answers, sorted by question.
+
+    Args:
+        offset, limit: Page window
+        language: Only this language partition (e.g. 'en')
+        prefix: Question prefix (case-insensitive)
+        search: Substring of the question or answer (case-insensitive)
+        source: 'file' (preloaded FAQ) or 'llm' (learned answers)
 
-    # Sort by question alphabetically
-    faq_list.sort(key=lambda x: x['question'].lower())
+    Returns:
+        (total matching entries, list of FAQ dicts for the page)
+    """
+    total, page = _faq_cache.page(offset, limit, language=language, prefix=prefix, search=search, source=source)
+    return total, [_faq_item(entry) for _, entry in page]
+
+def get_all_faq_data():
+    """Get all FAQ questions and answers from cache, sorted by question."""
+    return get_faq_page(0, len(_faq_cache))[1]
 
-    return faq_list
+def iter_pdf_pages(file_path):
+    """Yield the text of each page of a PDF in order (unchanged pages come from the page cache)."""
+    return _pdf_extractor.iter_pages(file_path, _summary_store.file_hash(file_path))
 
 def extract_text_from_pdf(file_path):
     """Extract text from a PDF file."""
@@ -190,13 +737,7 @@ def extract_text_from_pdf(file_path):
         return "PDF file not found."
 
     try:
-        with open(file_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page_num in range(len(reader.pages)):
-                page = reader.pages[page_num]
-                text += page.extract_text()
-            return text
+        return ''.join(iter_pdf_pages(file_path))
     except Exception as e:
         return f"Error extracting text from PDF: {str(e)}"
 
@@ -217,6 +758,41 @@ def extract_text_from_file(file_path):
     except Exception as e:
         return f"Error extracting text from file: {str(e)}"
 
+def _get_cached_summary(kind, content_hash, memory_cache):
+    """
+    Cached (summary, language, language_code) for documents with this content hash, or None.
+    Looks in this process's cache, then the shared cache (another worker may have summarized
+    the same files), then the summary store on disk.
+    """
+    label = 'Resume' if kind == 'resume' else 'Job'
+    if memory_cache['hash'] == content_hash and memory_cache['summary']:
+        print(f'[{label} Cache HIT] Using cached summary (hash: {content_hash[:8]}..., lang: {memory_cache["language_code"]})')
+        return memory_cache['summary'], memory_cache['language'], memory_cache['language_code']
+
+    source, entry = 'shared', _shared_call(_shared_cache.get_summary, kind, content_hash)
+    if not entry:
+        try:
+            source, entry = 'stored', _summary_store.get(kind, content_hash)
+        except DatabaseError as e:
+            print(f'[Summary Store] Lookup failed: {str(e)}')
+            entry = None
+    if not entry:
+        return None
+
+    memory_cache.update(hash=content_hash, timestamp=datetime.now(), summary=entry['summary'],
+                        language=entry['language'], language_code=entry['language_code'])
+    print(f'[{label} Cache HIT] Using {source} summary (hash: {content_hash[:8]}..., lang: {entry["language_code"]})')
+    return entry['summary'], entry['language'], entry['language_code']
+
+def _save_summary(kind, content_hash, text, language, language_code, summary):
+    """Publish a new summary to the shared cache and the summary store."""
+    _shared_call(_shared_cache.set_summary, kind, content_hash,
+                 {'summary': summary, 'language': language, 'language_code': language_code})
+    try:
+        _summary_store.save(kind, content_hash, text, language, language_code, summary)
+    except DatabaseError as e:
+        print(f'[Summary Store] Save failed: {str(e)}')
+
 def get_resume_summary():
     """Get a summary of ALL resume documents with language detection and caching."""
     resume_dir = settings.RESUME_DIR
@@ -232,41 +808,30 @@ def get_resume_summary():
     if not resume_files:
         return "No resume found in the resume directory.", "English", "en"
 
-    # Calculate hash of all files to detect changes
-    file_hashes = []
-    for resume_file in resume_files:
-        resume_path = os.path.join(resume_dir, resume_file)
-        # Use file modification time + name as hash
-        mtime = os.path.getmtime(resume_path)
-        file_hashes.append(f"{resume_file}:{mtime}")
+    # Unchanged documents are answered from the cache before any text extraction or LLM call
+    current_hash = _summary_store.content_hash([os.path.join(resume_dir, f) for f in resume_files])
+    cached = _get_cached_summary('resume', current_hash, _resume_cache)
+    if cached:
+        return cached
 
-    # Extract text from ALL documents and combine them FIRST to detect language
+    # Extract text from ALL documents and combine them to detect language
     print(f'Found {len(resume_files)} resume document(s): {resume_files}')
-    combined_resume_text = ""
+    documents = []
 
     for i, resume_file in enumerate(resume_files, 1):
         resume_path = os.path.join(resume_dir, resume_file)
         text = extract_text_from_file(resume_path)
 
         # Add document separator for clarity
-        combined_resume_text += f"\n\n=== DOCUMENT {i}: {resume_file} ===\n\n{text}"
+        documents.append(f"\n\n=== DOCUMENT {i}: {resume_file} ===\n\n{text}")
         print(f'Extracted {len(text)} characters from {resume_file}')
 
-    resume_text = combined_resume_text
+    resume_text = ''.join(documents)
 
-    # Detect language BEFORE checking cache
     print('Detecting resume language...')
     language, language_code = detect_language(resume_text)
     print(f'Detected language: {language} ({language_code})')
 
-    # Include language code in hash to ensure cache invalidation when language changes
-    current_hash = hashlib.md5(f"{'_'.join(file_hashes)}_{language_code}".encode()).hexdigest()
-
-    # Check cache with language-aware hash
-    if _resume_cache['hash'] == current_hash and _resume_cache['summary']:
-        print(f'[Resume Cache HIT] Using cached resume summary (hash: {current_hash[:8]}..., lang: {language_code})')
-        return _resume_cache['summary'], _resume_cache['language'], _resume_cache['language_code']
-
     print(f'[Resume Cache MISS] Generating summaries... (hash: {current_hash[:8]}..., lang: {language_code})')
 
     # Language-specific instructions
@@ -365,7 +930,7 @@ Documentos de currículo:
     resume_system_message = resume_system_messages.get(language_code, resume_system_messages['en'])
 
     # Generate DETAILED summary using OpenAI
-    response = openai.chat.completions.create(
+    response = llm_gateway.complete_sync(
         model="gpt-4",
         messages=[
             {"role": "system", "content": resume_system_message},
@@ -382,6 +947,7 @@ Documentos de currículo:
     _resume_cache['language'] = language
     _resume_cache['language_code'] = language_code
     _resume_cache['timestamp'] = datetime.now()
+    _save_summary('resume', current_hash, resume_text, language, language_code, summary)
 
     print(f'[Resume Cache SAVED] Resume summary generated and cached')
 
@@ -402,31 +968,20 @@ def get_job_description_summary():
     if not job_files:
         return "No job description found in the job description directory.", "English", "en"
 
-    # Calculate hash of all files to detect changes
-    file_hashes = []
-    for job_file in job_files:
-        job_path = os.path.join(job_dir, job_file)
-        # Use file modification time + name as hash
-        mtime = os.path.getmtime(job_path)
-        file_hashes.append(f"{job_file}:{mtime}")
+    # Unchanged documents are answered from the cache before any text extraction or LLM call
+    current_hash = _summary_store.content_hash([os.path.join(job_dir, f) for f in job_files])
+    cached = _get_cached_summary('job', current_hash, _job_cache)
+    if cached:
+        return cached
 
-    # Use the first job description found - extract text FIRST to detect language
+    # Use the first job description found - extract text to detect language
     job_path = os.path.join(job_dir, job_files[0])
     job_text = extract_text_from_file(job_path)
 
-    # Detect language BEFORE checking cache
     print('Detecting job description language...')
     language, language_code = detect_language(job_text)
     print(f'Detected language: {language} ({language_code})')
 
-    # Include language code in hash to ensure cache invalidation when language changes
-    current_hash = hashlib.md5(f"{'_'.join(file_hashes)}_{language_code}".encode()).hexdigest()
-
-    # Check cache with language-aware hash
-    if _job_cache['hash'] == current_hash and _job_cache['summary']:
-        print(f'[Job Cache HIT] Using cached job description summary (hash: {current_hash[:8]}..., lang: {language_code})')
-        return _job_cache['summary'], _job_cache['language'], _job_cache['language_code']
-
     print(f'[Job Cache MISS] Generating job description summary... (hash: {current_hash[:8]}..., lang: {language_code})')
 
     # Language-specific instructions
@@ -540,7 +1095,7 @@ Texto da descrição da vaga:
     system_message = system_messages.get(language_code, system_messages['en'])
 
     # Generate DETAILED summary using OpenAI
-    response = openai.chat.completions.create(
+    response = llm_gateway.complete_sync(
         model="gpt-4",
         messages=[
             {"role": "system", "content": system_message},
@@ -557,52 +1112,90 @@ Texto da descrição da vaga:
     _job_cache['language'] = language
     _job_cache['language_code'] = language_code
     _job_cache['timestamp'] = datetime.now()
+    _save_summary('job', current_hash, job_text, language, language_code, summary)
 
     print(f'[Job Cache SAVED] Job description summary generated and cached')
 
     return summary, language, language_code
 
-def detect_language(text):
-    """Detect the primary language of the text using AI."""
+def _documents_fingerprint():
+    """Names and modification times of the resume and job description files."""
+    fingerprint = []
+    for directory in (settings.RESUME_DIR, settings.JOB_DESCRIPTION_DIR):
+        if not os.path.isdir(directory):
+            fingerprint.append(f'{directory}:missing')
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(('.pdf', '.txt', '.docx')):
+                fingerprint.append(f'{name}:{os.path.getmtime(os.path.join(directory, name))}')
+    return '|'.join(fingerprint)
+
+def _run_summary_pipeline(kind):
+    """
+    (summary, language, language_code) for one document kind, or None if it failed.
+    Callers asking for the same kind wait for the one already generating it, then read its cache.
+    """
+    get_summary = get_resume_summary if kind == 'resume' else get_job_description_summary
     try:
-        response = openai.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {"role": "system", "content": """You are a language detection assistant.
+        with _summary_locks[kind]:
+            return get_summary()
+    except Exception as e:
+        print(f"[Summaries] {kind} summary failed: {str(e)}")
+        return None
 
-Detect the PRIMARY language of the text provided.
+def get_document_summaries():
+    """
+    Resume and job description summaries, computed concurrently: text extraction, language
+    detection and summarization of one document overlap with the other's, so a cold start
+    costs the slower pipeline rather than both.
 
-Return ONLY a JSON object in this exact format (no additional text):
-{
-    "language": "English",
-    "language_code": "en"
-}
+    Returns:
+        Tuple of (resume, job), each (summary, language, language_code) or None if it failed
+    """
+    resume = _summary_executor.submit(_run_summary_pipeline, 'resume')
+    job = _run_summary_pipeline('job')
+    return resume.result(), job
+
+async def aget_document_summaries():
+    """get_document_summaries() for async callers (consumers, async views)."""
+    resume, job = await asyncio.gather(
+        asyncio.to_thread(_run_summary_pipeline, 'resume'),
+        asyncio.to_thread(_run_summary_pipeline, 'job')
+    )
+    return resume, job
 
-Possible languages: English (en), Portuguese (pt), French (fr), Spanish (es), German (de)
-If uncertain, use English as default."""},
-                {"role": "user", "content": f"Detect the language of this text:\n\n{text[:1000]}"}
-            ],
-            max_tokens=50,
-            temperature=0.3
-        )
+def get_interview_context():
+    """
+    Resume and job description summaries for answer prompts ('' when a document is missing).
+    Only re-summarizes when the files change; otherwise no text extraction or LLM call.
 
-        result = response.choices[0].message.content.strip()
+    Returns:
+        Tuple of (resume_summary, job_summary)
+    """
+    fingerprint = _documents_fingerprint()
+    with _interview_context_lock:
+        if _interview_context['fingerprint'] == fingerprint:
+            return _interview_context['resume_summary'], _interview_context['job_summary']
 
-        try:
-            import json
-            data = json.loads(result)
-            return data.get('language', 'English'), data.get('language_code', 'en')
-        except:
-            return 'English', 'en'
+        summaries = [(_usable_summary(result[0]) or "") if result else "" for result in get_document_summaries()]
 
-    except Exception as e:
-        print(f"Error detecting language: {str(e)}")
-        return 'English', 'en'
+        _interview_context.update(fingerprint=fingerprint, resume_summary=summaries[0], job_summary=summaries[1])
+        return summaries[0], summaries[1]
+
+def detect_language(text):
+    """
+    Detect the primary language of the text (offline n-gram identifier, no LLM call).
+
+    Returns:
+        Tuple of (language name, language code), e.g. ('French', 'fr')
+    """
+    language_code = detect_language_code(text)
+    return LANGUAGE_NAMES[language_code], language_code
 
 def extract_company_and_position(job_text):
     """Extract company name and job position from job description text using AI."""
     try:
-        response = openai.chat.completions.create(
+        response = llm_gateway.complete_sync(
             model="gpt-3.5-turbo",  # Fast model for extraction
             messages=[
                 {"role": "system", "content": """You are an assistant that extracts structured information from job descriptions.
@@ -637,10 +1230,77 @@ If company or position cannot be found, use "Not specified" for that field."""},
         print(f"Error extracting company and position: {str(e)}")
         return 'Not specified', 'Not specified'
 
+def _push_summary_job(job):
+    """Send a summary job update to every connected interview socket."""
+    channel_layer = get_channel_layer()
+    if channel_layer is not None:
+        async_to_sync(channel_layer.group_send)('interview_room', {'type': 'summary_job_message', 'job': job})
+
+# Resume / job description summaries generated in the background (uploads return a job id)
+_summary_jobs = SummaryJobManager(
+    workers=settings.SUMMARY_JOB_WORKERS,
+    history=settings.SUMMARY_JOB_HISTORY,
+    notify=_push_summary_job
+)
+
+def _usable_summary(summary):
+    """None for the placeholder texts returned when no document is present."""
+    if not summary or "not found" in summary.lower() or "created" in summary.lower():
+        return None
+    return summary
+
+def start_resume_summary_job():
+    """Summarize the resume documents in the background. Returns the job."""
+    def work(job):
+        job.progress('Generating resume summary')
+        with _summary_locks['resume']:
+            summary, language, language_code = get_resume_summary()
+        summary = _usable_summary(summary)
+        if summary is None:
+            return {}
+        return {'resume_summary': summary, 'language': language, 'language_code': language_code}
+
+    return _summary_jobs.submit('resume', work)
+
+def start_job_description_job(job_text=None, file_path=None):
+    """
+    Analyze a job description in the background: company and position, then the summary.
+    Pass the text (pasted job description) or the uploaded file to read it from. Returns the job.
+    """
+    def work(job):
+        text = job_text
+        if text is None:
+            job.progress('Extracting text from job description')
+            text = extract_text_from_file(file_path)
+
+        job.progress('Extracting company and position')
+        company, position = extract_company_and_position(text)
+        print(f'Extracted: Company={company}, Position={position}')
+        result = {'company': company, 'position': position}
+
+        job.progress('Generating job description summary')
+        try:
+            with _summary_locks['job']:
+                summary, language, language_code = get_job_description_summary()
+            summary = _usable_summary(summary)
+            if summary is not None:
+                result.update(job_summary=summary, language=language, language_code=language_code)
+        except Exception as e:
+            # Company and position are still useful without a summary
+            print(f"Job summary generation failed: {str(e)}")
+        return result
+
+    return _summary_jobs.submit('job', work)
+
+def get_summary_job(job_id):
+    """Status dict of a summary job, or None if it is unknown (or too old)."""
+    job = _summary_jobs.get(job_id)
+    return job.to_dict() if job is not None else None
+
 def extract_question_from_transcript(transcript_text):
     """Extract ALL questions and relevant context from a potentially long transcript."""
     try:
-        response = openai.chat.completions.create(
+        response = llm_gateway.complete_sync(
             model="gpt-3.5-turbo",  # Fast model for extraction
             messages=[
                 {"role": "system", "content": """You are an assistant that extracts interview questions from transcripts.
@@ -669,20 +1329,76 @@ RULES:
         # Fallback: return first 300 chars to preserve more context
         return transcript_text[:300] + "..." if len(transcript_text) > 300 else transcript_text
 
-async def generate_response_async(messages, resume_summary, job_summary, model='gpt-4o-mini', provider=None):
-    """Generate a response based on the interview context using configured LLM provider."""
-    # Use provided provider or fall back to settings
-    if provider is None:
-        provider = settings.LLM_PROVIDER
+async def summarize_conversation(summary, messages):
+    """Fold interview turns into the running conversation summary (used by ConversationHistory)."""
+    transcript = '\n'.join(
+        f"{'Interviewer' if message['role'] == 'user' else 'Candidate'}: {message['content']}"
+        for message in messages
+    )
 
-    print(f"Using LLM provider: {provider}")
-    print(f"Model: {model if provider == 'openai' else model}")
+    response = await llm_gateway.complete(
+        model=settings.HISTORY_SUMMARY_MODEL,
+        messages=[
+            {"role": "system", "content": f"""You maintain a running summary of a job interview from the candidate's side.
+Merge the new exchanges into the existing summary. Keep the topics asked about, the key facts, numbers and
+technologies the candidate mentioned, and any commitments made. Drop filler. Write compact bullet points,
+at most {settings.HISTORY_SUMMARY_MAX_TOKENS} tokens, in the language of the interview."""},
+            {"role": "user", "content": f"Existing summary:\n{summary or '(none)'}\n\nNew exchanges:\n{transcript}"}
+        ],
+        max_tokens=settings.HISTORY_SUMMARY_MAX_TOKENS,
+        temperature=0.2
+    )
+    return response.choices[0].message.content.strip()
+
+def _get_context_index(kind, text):
+    """ContextIndex for the current resume or job summary (built once per summary)."""
+    index = _context_indexes.get(kind)
+    if index is None or index.text != text:
+        # Built outside the lock, so a lookup of the current index never waits for a build
+        index = ContextIndex(text, chunk_tokens=settings.CONTEXT_CHUNK_TOKENS)
+        with _context_index_lock:
+            _context_indexes[kind] = index
+        print(f'[Context] Indexed {kind} summary: {len(index)} chunks, {index.total_tokens} tokens')
+    return index
+
+def select_prompt_context(question, resume_summary, job_summary):
+    """
+    Parts of the resume and job summaries relevant to the question, each within its token budget.
+    Returns the full summaries when retrieval is disabled or there is no question.
 
-    system_prompt = f"""You are Maikon Renner, a senior data engineer with 8+ years experience in a job interview. Answer naturally as if YOU had this experience.
+    Returns:
+        Tuple of (resume_context, job_context)
+    """
+    if not settings.CONTEXT_RETRIEVAL_ENABLED or not question:
+        return resume_summary, job_summary
+
+    resume_context = _get_context_index('resume', resume_summary or '').select(
+        question, settings.CONTEXT_RESUME_BUDGET_TOKENS, top_k=settings.CONTEXT_TOP_K
+    )
+    job_context = _get_context_index('job', job_summary or '').select(
+        question, settings.CONTEXT_JOB_BUDGET_TOKENS, top_k=settings.CONTEXT_TOP_K
+    )
+    return resume_context, job_context
+
+async def aselect_prompt_context(question, resume_summary, job_summary):
+    """
+    select_prompt_context() for async callers: indexing a new summary (chunking, term counts)
+    runs in a thread, only the BM25 query runs on the event loop.
+    """
+    if settings.CONTEXT_RETRIEVAL_ENABLED and question:
+        stale = [(kind, text or '') for kind, text in (('resume', resume_summary), ('job', job_summary))
+                 if getattr(_context_indexes.get(kind), 'text', None) != (text or '')]
+        if stale:
+            await asyncio.to_thread(lambda: [_get_context_index(kind, text) for kind, text in stale])
+    return select_prompt_context(question, resume_summary, job_summary)
+
+def build_system_prompt(resume_context, job_context):
+    """System prompt for interview answers with the given resume / job context."""
+    return f"""You are Maikon Renner, a senior data engineer with 8+ years experience in a job interview. Answer naturally as if YOU had this experience.
 
 **CONTEXT:**
-Resume: {resume_summary}
-Job: {job_summary}
+Resume: {resume_context}
+Job: {job_context}
 
 **CRITICAL RULES:**
 1. YOU ARE THE CANDIDATE - respond in first person with confidence
@@ -701,22 +1417,54 @@ Q: "Tell me about your ETL experience"
 A: "At Gexel Telecom, I built PySpark ETL pipelines processing 50GB daily. I implemented automated validation that reduced errors by 80% and improved reliability through incremental loading."
 """
 
+async def generate_response_async(messages, resume_summary, job_summary, model='gpt-4o-mini', provider=None, hedge=False,
+                                  usage=False):
+    """
+    Generate a response based on the interview context using configured LLM provider.
+    With hedge=True a backup model (settings.LLM_HEDGE_BACKUP_MODEL) is raced against a slow first token.
+    With usage=True the stream ends with a chunk carrying token usage (no choices).
+    """
+    # Use provided provider or fall back to settings
+    if provider is None:
+        provider = settings.LLM_PROVIDER
+
+    print(f"Using LLM provider: {provider}")
+    print(f"Model: {model if provider == 'openai' else model}")
+
+    # Only the resume / job chunks relevant to the question being answered
+    resume_context, job_context = await aselect_prompt_context(last_question(messages), resume_summary, job_summary)
+    system_prompt = build_system_prompt(resume_context, job_context)
+
     full_messages = [
         {"role": "system", "content": system_prompt}
     ]
 
-    # Add conversation history
-    for message in messages:
+    # Add conversation history (trimmed to the per-request prompt budget)
+    for message in fit_messages_to_budget(system_prompt, messages, settings.LLM_PROMPT_TOKEN_BUDGET):
         full_messages.append(message)
 
-    # Generate response using OpenAI
+    stream_kwargs = {'max_tokens': 450, 'temperature': 0.3}
+    if usage:
+        stream_kwargs['stream_options'] = {'include_usage': True}
+
+    # Generate response using OpenAI (streamed through the shared gateway)
     try:
-        response = await async_openai_client.chat.completions.create(
+        if hedge and settings.LLM_HEDGE_BACKUP_MODEL and settings.LLM_HEDGE_BACKUP_MODEL != model:
+            response = await llm_gateway.hedged_stream(
+                model=model,
+                messages=full_messages,
+                backup_model=settings.LLM_HEDGE_BACKUP_MODEL,
+                hedge_delay=settings.LLM_HEDGE_DELAY,
+                **stream_kwargs
+            )
+            if response.model != model:
+                print(f"[HEDGE] Answer streamed by backup model {response.model}")
+            return response
+
+        response = await llm_gateway.stream(
             model=model,
             messages=full_messages,
-            max_tokens=450,
-            temperature=0.3,
-            stream=True
+            **stream_kwargs
         )
         return response
     except Exception as e:
@@ -1,13 +1,15 @@
 from django.shortcuts import render
 from django.conf import settings
-from django.http import JsonResponse, StreamingHttpResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.core.files.storage import FileSystemStorage
 import subprocess
 import os
 import json
 import asyncio
-from .utils import get_resume_summary, get_job_description_summary, extract_text_from_pdf, extract_company_and_position, extract_text_from_file, generate_response_async, reload_faq_cache, clear_faq_cache, get_faq_cache_stats, get_all_faq_data
+from datetime import datetime
+from .utils import get_job_description_summary, extract_text_from_pdf, extract_company_and_position, extract_text_from_file, generate_response_async, reload_faq_cache, clear_faq_cache, get_faq_cache_stats, get_faq_page, get_faq_cache_metrics, llm_gateway, get_interview_context, aselect_prompt_context, build_system_prompt, start_resume_summary_job, start_job_description_job, get_summary_job, get_document_summaries
+from .llm_fanout import fan_out, estimate_prompt_tokens
 import PyPDF2
 
 def index(request):
@@ -106,70 +108,23 @@ def upload_document(request):
         filename = fs.save(uploaded_file.name, uploaded_file)
         file_path = fs.path(filename)
 
-        # Initialize variables for extraction
-        company = None
-        position = None
-        job_summary = None
-        resume_summary = None
-
-        # If resume file, generate summary automatically
+        # Summaries and extraction run in the background; the client follows the job
+        # (pushed to interview sockets, or polled at job_status_url)
         if file_type == 'resume':
-            try:
-                print('Generating resume summary automatically...')
-                resume_summary, resume_language, resume_language_code = get_resume_summary()
-                if "not found" in resume_summary.lower() or "created" in resume_summary.lower():
-                    resume_summary = None
-                else:
-                    # Store language info
-                    response_data['language'] = resume_language
-                    response_data['language_code'] = resume_language_code
-            except Exception as e:
-                print(f"Error generating resume summary: {str(e)}")
-                resume_summary = None
-                # Continue even if summary generation fails
-
-        # If job description file, extract company and position
-        if file_type == 'job':
-            try:
-                print('Extracting text from job description file...')
-                job_text = extract_text_from_file(file_path)
-
-                print('Extracting company and position from job description...')
-                company, position = extract_company_and_position(job_text)
-                print(f'Extracted: Company={company}, Position={position}')
-
-                # Generate job description summary automatically
-                print('Generating job description summary...')
-                job_summary, job_language, job_language_code = get_job_description_summary()
-                if "not found" in job_summary.lower() or "created" in job_summary.lower():
-                    job_summary = None
-                else:
-                    # Store language info in response
-                    if 'language' not in response_data:
-                        response_data['language'] = job_language
-                        response_data['language_code'] = job_language_code
-            except Exception as e:
-                print(f"Error processing job description: {str(e)}")
-                # Continue even if extraction fails
+            job = start_resume_summary_job()
+        else:
+            job = start_job_description_job(file_path=file_path)
 
         response_data = {
             'success': True,
             'message': 'File uploaded successfully',
             'file_path': file_path,
-            'file_name': filename
+            'file_name': filename,
+            'job_id': job.id,
+            'job_status_url': f'/summary-jobs/{job.id}/'
         }
 
-        # Add resume summary if it's a resume
-        if file_type == 'resume' and resume_summary:
-            response_data['resume_summary'] = resume_summary
-
-        # Add extracted data if it's a job description
-        if file_type == 'job' and company and position:
-            response_data['company'] = company
-            response_data['position'] = position
-            response_data['job_summary'] = job_summary
-
-        return JsonResponse(response_data)
+        return JsonResponse(response_data, status=202)
 
     except Exception as e:
         return JsonResponse({
@@ -184,29 +139,13 @@ def generate_summaries(request):
         return JsonResponse({'success': False, 'message': 'Invalid request method'}, status=400)
 
     try:
-        resume_summary = None
-        job_summary = None
-        resume_language = None
-        resume_language_code = None
-        job_language = None
-        job_language_code = None
-
-        # Generate resume summary
-        try:
-            resume_summary, resume_language, resume_language_code = get_resume_summary()
-            if "not found" in resume_summary.lower() or "created" in resume_summary.lower():
-                resume_summary = None
-        except Exception as e:
-            print(f"Resume summary generation failed: {str(e)}")
+        # Generate resume and job summaries concurrently
+        resume, job = get_document_summaries()
+        resume_summary, resume_language, resume_language_code = resume or (None, None, None)
+        job_summary, job_language, job_language_code = job or (None, None, None)
+        if resume_summary and ("not found" in resume_summary.lower() or "created" in resume_summary.lower()):
             resume_summary = None
-
-        # Generate job summary
-        try:
-            job_summary, job_language, job_language_code = get_job_description_summary()
-            if "not found" in job_summary.lower() or "created" in job_summary.lower():
-                job_summary = None
-        except Exception as e:
-            print(f"Job summary generation failed: {str(e)}")
+        if job_summary and ("not found" in job_summary.lower() or "created" in job_summary.lower()):
             job_summary = None
 
         if not resume_summary and not job_summary:
@@ -259,32 +198,15 @@ def save_job_text(request):
         with open(txt_path, 'w', encoding='utf-8') as f:
             f.write(job_text)
 
-        # Extract company and position using AI
-        print('Extracting company and position from job description...')
-        company, position = extract_company_and_position(job_text)
-        print(f'Extracted: Company={company}, Position={position}')
-
-        # Generate job description summary automatically
-        print('Generating job description summary...')
-        try:
-            job_summary, job_language, job_language_code = get_job_description_summary()
-            if "not found" in job_summary.lower() or "created" in job_summary.lower():
-                job_summary = None
-        except Exception as e:
-            print(f"Job summary generation failed: {str(e)}")
-            job_summary = None
-            job_language = None
-            job_language_code = None
+        # Extract company and position and generate the summary in the background
+        job = start_job_description_job(job_text=job_text)
 
         return JsonResponse({
             'success': True,
-            'message': 'Job description saved and analyzed successfully',
-            'company': company,
-            'position': position,
-            'job_summary': job_summary,
-            'language': job_language,
-            'language_code': job_language_code
-        })
+            'message': 'Job description saved, analysis started',
+            'job_id': job.id,
+            'job_status_url': f'/summary-jobs/{job.id}/'
+        }, status=202)
 
     except Exception as e:
         return JsonResponse({
@@ -292,32 +214,23 @@ def save_job_text(request):
             'message': f'Save failed: {str(e)}'
         }, status=500)
 
+def get_summary_job_status(request, job_id):
+    """Status, current step and (when done) result of a background summary job"""
+    job = get_summary_job(job_id)
+    if job is None:
+        return JsonResponse({'success': False, 'message': 'Unknown job'}, status=404)
+    return JsonResponse({'success': True, **job})
+
 def get_summaries(request):
     """Get existing summaries"""
     try:
-        resume_summary = None
-        job_summary = None
-        resume_language = None
-        resume_language_code = None
-        job_language = None
-        job_language_code = None
-
-        # Get resume summary
-        try:
-            resume_summary, resume_language, resume_language_code = get_resume_summary()
-            if "not found" in resume_summary.lower() or "created" in resume_summary.lower():
-                resume_summary = 'No resume found'
-        except Exception as e:
-            print(f"Resume summary error: {str(e)}")
+        # Get resume and job summaries concurrently
+        resume, job = get_document_summaries()
+        resume_summary, resume_language, resume_language_code = resume or (None, None, None)
+        job_summary, job_language, job_language_code = job or (None, None, None)
+        if not resume_summary or "not found" in resume_summary.lower() or "created" in resume_summary.lower():
             resume_summary = 'No resume found'
-
-        # Get job summary
-        try:
-            job_summary, job_language, job_language_code = get_job_description_summary()
-            if "not found" in job_summary.lower() or "created" in job_summary.lower():
-                job_summary = 'No job description found'
-        except Exception as e:
-            print(f"Job summary error: {str(e)}")
+        if not job_summary or "not found" in job_summary.lower() or "created" in job_summary.lower():
             job_summary = 'No job description found'
 
         return JsonResponse({
@@ -410,8 +323,11 @@ def get_calendar_interviews(request):
         }, status=500)
 
 @csrf_exempt
-def compare_llms(request):
-    """Compare LLMs endpoint - streams response from selected provider/model"""
+async def compare_llms(request):
+    """
+    Compare LLMs endpoint - streams response from selected provider/model.
+    Async view: the stream runs on the server's event loop through the shared LLM gateway.
+    """
     if request.method != 'POST':
         return JsonResponse({'error': 'Invalid request method'}, status=400)
 
@@ -426,30 +342,14 @@ def compare_llms(request):
 
         print(f"[Playground] Provider: {provider}, Model: {model}, Question: {question[:50]}...")
 
-        # Get resume and job summaries for context
-        resume_summary = ""
-        job_summary = ""
-
-        try:
-            resume_summary, _, _ = get_resume_summary()
-            if "not found" in resume_summary.lower() or "created" in resume_summary.lower():
-                resume_summary = ""
-        except Exception as e:
-            print(f"[Playground] Resume summary error: {str(e)}")
-            resume_summary = ""
-
-        try:
-            job_summary, _, _ = get_job_description_summary()
-            if "not found" in job_summary.lower() or "created" in job_summary.lower():
-                job_summary = ""
-        except Exception as e:
-            print(f"[Playground] Job summary error: {str(e)}")
-            job_summary = ""
+        # Get resume and job summaries for context (cached until the documents change)
+        resume_summary, job_summary = await asyncio.to_thread(get_interview_context)
 
         print(f"[Playground] Context loaded - Resume: {len(resume_summary)} chars, Job: {len(job_summary)} chars")
 
         # Create streaming generator
         async def stream_response():
+            response_stream = None
             try:
                 # Create simple message history with CV/Job context
                 messages = [
@@ -487,24 +387,13 @@ def compare_llms(request):
                 error_msg = f"Error generating response: {str(e)}"
                 print(f"[Playground Error] {error_msg}")
                 yield error_msg.encode('utf-8')
-
-        # Convert async generator to sync generator for StreamingHttpResponse
-        def sync_stream():
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            try:
-                async_gen = stream_response()
-                while True:
-                    try:
-                        chunk = loop.run_until_complete(async_gen.__anext__())
-                        yield chunk
-                    except StopAsyncIteration:
-                        break
             finally:
-                loop.close()
+                # Client went away mid-stream: stop the upstream request too
+                if hasattr(response_stream, 'close'):
+                    response_stream.close()
 
         response = StreamingHttpResponse(
-            sync_stream(),
+            stream_response(),
             content_type='text/plain; charset=utf-8'
         )
         response['Cache-Control'] = 'no-cache'
@@ -515,6 +404,69 @@ def compare_llms(request):
         print(f"[Playground Error] {str(e)}")
         return JsonResponse({'error': str(e)}, status=500)
 
+@csrf_exempt
+async def compare_llms_fanout(request):
+    """
+    Fan-out comparison - streams several provider/models concurrently for one question.
+    Response is NDJSON: start / chunk / done (metrics) events tagged with the model index,
+    then a summary with time to first token, tokens/sec, total latency and token counts per model.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'Invalid request method'}, status=400)
+
+    try:
+        data = json.loads(request.body)
+        question = data.get('question', '').strip()
+        targets = [
+            {'provider': target.get('provider', 'openai'), 'model': target.get('model', 'gpt-4o-mini')}
+            for target in data.get('models', [])
+        ]
+
+        if not question:
+            return JsonResponse({'error': 'Question is required'}, status=400)
+        if not targets:
+            return JsonResponse({'error': 'At least one model is required'}, status=400)
+        if len(targets) > settings.PLAYGROUND_MAX_MODELS:
+            return JsonResponse({'error': f'At most {settings.PLAYGROUND_MAX_MODELS} models per comparison'}, status=400)
+
+        print(f"[Playground] Fan-out to {', '.join(t['provider'] + '/' + t['model'] for t in targets)}, "
+              f"Question: {question[:50]}...")
+
+        # Same question and context for every model
+        resume_summary, job_summary = await asyncio.to_thread(get_interview_context)
+        messages = [{"role": "user", "content": question}]
+        prompt_tokens = estimate_prompt_tokens(
+            build_system_prompt(*await aselect_prompt_context(question, resume_summary, job_summary)), question
+        )
+
+        async def open_stream(provider, model):
+            return await generate_response_async(
+                messages=messages,
+                resume_summary=resume_summary,
+                job_summary=job_summary,
+                model=model,
+                provider=provider,
+                usage=True
+            )
+
+        async def stream_events():
+            async for event in fan_out(targets, open_stream, prompt_tokens=prompt_tokens):
+                if event['type'] == 'summary':
+                    for result in event['results']:
+                        print(f"[Playground] {result['provider']}/{result['model']}: TTFT {result['ttft_ms']} ms, "
+                              f"{result['tokens_per_second']} tok/s, total {result['total_ms']} ms, "
+                              f"{result['completion_tokens']} tokens")
+                yield (json.dumps(event) + '\n').encode('utf-8')
+
+        response = StreamingHttpResponse(stream_events(), content_type='application/x-ndjson')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    except Exception as e:
+        print(f"[Playground Error] {str(e)}")
+        return JsonResponse({'error': str(e)}, status=500)
+
 @csrf_exempt
 def upload_faq(request):
     """Upload FAQ JSON file and reload cache"""
@@ -575,7 +527,7 @@ def upload_faq(request):
 
         print(f'[FAQ Upload] Saved {len(faqs)} FAQ entries to file')
 
-        # Reload cache
+        # Reload cache (atomic diff - lookups keep hitting the cache during the reload)
         reload_result = reload_faq_cache()
 
         return JsonResponse({
@@ -583,6 +535,9 @@ def upload_faq(request):
             'message': f'FAQ uploaded successfully! {reload_result["new_count"]} questions loaded into cache',
             'faq_count': reload_result['new_count'],
             'old_count': reload_result['old_count'],
+            'added': reload_result['added'],
+            'updated': reload_result['updated'],
+            'removed': reload_result['removed'],
             'timestamp': datetime.now().isoformat()
         })
 
@@ -612,7 +567,16 @@ def get_faq_stats(request):
             'total_questions': stats['total_questions'],
             'total_hits': stats['total_hits'],
             'most_asked_question': stats['most_asked_question'],
-            'most_asked_hits': stats['most_asked_hits']
+            'most_asked_hits': stats['most_asked_hits'],
+            'top_questions': stats['top_questions'],
+            'partitions': stats['partitions'],
+            'eviction_policy': stats['eviction_policy'],
+            'max_entries': stats['max_entries'],
+            'max_bytes': stats['max_bytes'],
+            'bytes_used': stats['bytes_used'],
+            'pinned_entries': stats['pinned_entries'],
+            'evictions': stats['evictions'],
+            'expirations': stats['expirations']
         })
 
     except Exception as e:
@@ -621,6 +585,46 @@ def get_faq_stats(request):
             'message': f'Failed to get stats: {str(e)}'
         }, status=500)
 
+@csrf_exempt
+def get_faq_metrics(request):
+    """
+    FAQ cache telemetry: hits, misses, near-miss similarity histogram, lookup latency
+    percentiles and estimated LLM time/tokens saved.
+    JSON by default; Prometheus text with ?format=prometheus (or Accept: text/plain).
+    """
+    try:
+        if request.GET.get('format') == 'prometheus' or (
+                'format' not in request.GET and request.headers.get('Accept', '').startswith('text/plain')):
+            return HttpResponse(get_faq_cache_metrics(prometheus=True),
+                                content_type='text/plain; version=0.0.4; charset=utf-8')
+
+        return JsonResponse({
+            'success': True,
+            **get_faq_cache_metrics()
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Failed to get metrics: {str(e)}'
+        }, status=500)
+
+@csrf_exempt
+def get_llm_stats(request):
+    """LLM gateway counters per model and hedged request statistics (backup sent / won)."""
+    try:
+        return JsonResponse({
+            'success': True,
+            'models': llm_gateway.stats(),
+            'hedging': llm_gateway.hedge_stats()
+        })
+
+    except Exception as e:
+        return JsonResponse({
+            'success': False,
+            'message': f'Failed to get LLM stats: {str(e)}'
+        }, status=500)
+
 @csrf_exempt
 def clear_faq(request):
     """Clear FAQ cache"""
@@ -644,14 +648,43 @@ def clear_faq(request):
 
 @csrf_exempt
 def get_faq_data(request):
-    """Get all FAQ questions and answers"""
+    """
+    Get FAQ questions and answers, one page at a time.
+
+    Query parameters: offset, limit (default FAQ_PAGE_SIZE, max FAQ_PAGE_SIZE_MAX),
+    language, prefix (question prefix), q (substring of question or answer), source (file/llm)
+    """
+    try:
+        offset = int(request.GET.get('offset', 0))
+        limit = int(request.GET.get('limit', settings.FAQ_PAGE_SIZE))
+    except ValueError:
+        return JsonResponse({'success': False, 'message': 'offset and limit must be integers'}, status=400)
+
+    source = request.GET.get('source') or None
+    if source not in (None, 'file', 'llm'):
+        return JsonResponse({'success': False, 'message': "source must be 'file' or 'llm'"}, status=400)
+
+    offset = max(offset, 0)
+    limit = min(max(limit, 0), settings.FAQ_PAGE_SIZE_MAX)
+
     try:
-        faq_data = get_all_faq_data()
+        total, faq_data = get_faq_page(
+            offset,
+            limit,
+            language=request.GET.get('language') or None,
+            prefix=request.GET.get('prefix', ''),
+            search=request.GET.get('q', ''),
+            source=source
+        )
 
         return JsonResponse({
             'success': True,
             'faqs': faq_data,
-            'count': len(faq_data)
+            'count': len(faq_data),
+            'total': total,
+            'offset': offset,
+            'limit': limit,
+            'has_more': offset + len(faq_data) < total
         })
 
     except Exception as e:
@@ -692,10 +725,6 @@ def generate_company_questions(request):
             company_name, position_title = extract_company_and_position(job_full_text)
             print(f"Generating questions for: {company_name} - {position_title}")
 
-        # Use synchronous OpenAI client for simplicity
-        from openai import OpenAI
-        client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
         # Map language to instruction and category labels
         language_config = {
             'English': {
@@ -875,7 +904,7 @@ Retorne APENAS o objeto JSON, sem texto adicional."""
         system_message = system_messages.get(job_language_code, system_messages.get('en'))
 
         # Call OpenAI API with enhanced parameters for better quality
-        response = client.chat.completions.create(
+        response = llm_gateway.complete_sync(
             model="gpt-4o-mini",  # Fast and cost-effective
             messages=[
                 {"role": "system", "content": system_message},
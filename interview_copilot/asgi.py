@@ -8,6 +8,10 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'interview_copilot.settings')
 django_asgi_app = get_asgi_application()
 
 import interview_copilot.routing
+from copilot.utils import start_faq_cache_warmup
+
+# Load the FAQ cache from the database while the server starts
+start_faq_cache_warmup()
 
 application = ProtocolTypeRouter({
     "http": django_asgi_app,
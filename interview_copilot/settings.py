@@ -63,17 +63,35 @@ WSGI_APPLICATION = 'interview_copilot.wsgi.application'
 ASGI_APPLICATION = 'interview_copilot.asgi.application'
 
 # Channel layer configuration
-CHANNEL_LAYERS = {
-    'default': {
-        'BACKEND': 'channels.layers.InMemoryChannelLayer',
-    },
-}
+# Redis (optional): set REDIS_URL to share rooms and caches between several worker processes
+REDIS_URL = os.environ.get('REDIS_URL', '')
+
+if REDIS_URL:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels_redis.core.RedisChannelLayer',
+            'CONFIG': {
+                'hosts': [REDIS_URL],
+            },
+        },
+    }
+else:
+    CHANNEL_LAYERS = {
+        'default': {
+            'BACKEND': 'channels.layers.InMemoryChannelLayer',
+        },
+    }
 
 # Database
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'OPTIONS': {
+            # WAL lets FAQ lookups keep reading while the FAQ store flushes writes
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
@@ -116,4 +134,99 @@ DEEPGRAM_API_KEY = os.environ['DEEPGRAM_API_KEY']
 
 # PDF Directories
 RESUME_DIR = os.path.join(BASE_DIR, 'resume')
-JOB_DESCRIPTION_DIR = os.path.join(BASE_DIR, 'job_description')
\ No newline at end of file
+JOB_DESCRIPTION_DIR = os.path.join(BASE_DIR, 'job_description')
+
+# FAQ Cache
+# Minimum cosine similarity (0-1) for a fuzzy FAQ match to count as a cache hit
+FAQ_MATCH_THRESHOLD = float(os.environ.get('FAQ_MATCH_THRESHOLD', '0.75'))
+# FAQ files to preload: comma-separated paths, globs or directories relative to BASE_DIR
+# (earlier entries win when the same question appears in several files)
+FAQ_FILES = os.environ.get('FAQ_FILES', 'faq_data_eng.json,faq_data_*.json')
+# Cache bounds: eviction policy is 'lfu' (hit_count), 'lru' or 'ttl' (oldest first); TTL 0 = never expire
+FAQ_CACHE_MAX_ENTRIES = int(os.environ.get('FAQ_CACHE_MAX_ENTRIES', '5000'))
+FAQ_CACHE_MAX_BYTES = int(os.environ.get('FAQ_CACHE_MAX_BYTES', str(20 * 1024 * 1024)))
+FAQ_CACHE_EVICTION_POLICY = os.environ.get('FAQ_CACHE_EVICTION_POLICY', 'lfu')
+FAQ_CACHE_TTL = float(os.environ.get('FAQ_CACHE_TTL', '0'))
+# Write-behind to the FAQ store: flush when this many writes are queued, or every N seconds
+FAQ_STORE_BATCH_SIZE = int(os.environ.get('FAQ_STORE_BATCH_SIZE', '50'))
+FAQ_STORE_FLUSH_INTERVAL = float(os.environ.get('FAQ_STORE_FLUSH_INTERVAL', '2.0'))
+# /get-faq-data/ page size (default and maximum)
+FAQ_PAGE_SIZE = int(os.environ.get('FAQ_PAGE_SIZE', '50'))
+FAQ_PAGE_SIZE_MAX = int(os.environ.get('FAQ_PAGE_SIZE_MAX', '500'))
+# Telemetry (/get-faq-metrics/): latency percentiles over the last N lookups; assumed LLM
+# response time per saved call until real LLM answers have been timed
+FAQ_METRICS_LATENCY_WINDOW = int(os.environ.get('FAQ_METRICS_LATENCY_WINDOW', '1000'))
+FAQ_METRICS_DEFAULT_LLM_SECONDS = float(os.environ.get('FAQ_METRICS_DEFAULT_LLM_SECONDS', '3.0'))
+
+# Cached answer delivery
+# Default for new clients: 'instant' (one message) or 'paced' (CACHE_DELIVERY_WORDS_PER_SECOND)
+CACHE_DELIVERY_MODE = os.environ.get('CACHE_DELIVERY_MODE', 'instant')
+CACHE_DELIVERY_WORDS_PER_SECOND = float(os.environ.get('CACHE_DELIVERY_WORDS_PER_SECOND', '60'))
+
+# Streamed LLM answers: tokens are batched into one answer_chunk message per window
+# (flushed after ANSWER_CHUNK_FLUSH_MS or ANSWER_CHUNK_FLUSH_BYTES, and at every sentence end; 0 ms = one message per token)
+ANSWER_CHUNK_FLUSH_MS = float(os.environ.get('ANSWER_CHUNK_FLUSH_MS', '60'))
+ANSWER_CHUNK_FLUSH_BYTES = int(os.environ.get('ANSWER_CHUNK_FLUSH_BYTES', '200'))
+
+# Speculative prefetch of answers for predicted questions
+PREFETCH_ENABLED = os.environ.get('PREFETCH_ENABLED', 'False').lower() in ('true', '1', 'yes')
+PREFETCH_MAX_CONCURRENT = int(os.environ.get('PREFETCH_MAX_CONCURRENT', '2'))  # Parallel prefetch LLM calls per session
+PREFETCH_BUDGET = int(os.environ.get('PREFETCH_BUDGET', '20'))  # Max prefetch LLM calls per session
+PREFETCH_TTL = float(os.environ.get('PREFETCH_TTL', '300'))  # Seconds a prefetched answer stays usable
+PREFETCH_TOP_N = int(os.environ.get('PREFETCH_TOP_N', '3'))  # Predictions prefetched after each answer
+
+# Shared cache (answers and summaries seen by every worker)
+# 'memory' (this process only) or 'redis' (REDIS_URL) - defaults to redis when REDIS_URL is set
+SHARED_CACHE_BACKEND = os.environ.get('SHARED_CACHE_BACKEND', 'redis' if REDIS_URL else 'memory')
+SHARED_CACHE_PREFIX = os.environ.get('SHARED_CACHE_PREFIX', 'copilot')
+SHARED_CACHE_SYNC_INTERVAL = float(os.environ.get('SHARED_CACHE_SYNC_INTERVAL', '1.0'))  # Seconds between pulls of other workers' answers
+
+# Resume / job summaries stored in the database by document content hash (survive restarts)
+SUMMARY_STORE_KEEP = int(os.environ.get('SUMMARY_STORE_KEEP', '5'))  # Newest summaries kept per kind
+
+# PDF text extraction: page text cached by (file hash, page); PDFs with at least
+# PDF_PARALLEL_MIN_PAGES uncached pages are parsed across PDF_EXTRACT_WORKERS processes (1 = in-process)
+PDF_EXTRACT_WORKERS = int(os.environ.get('PDF_EXTRACT_WORKERS', str(min(4, os.cpu_count() or 1))))
+PDF_PARALLEL_MIN_PAGES = int(os.environ.get('PDF_PARALLEL_MIN_PAGES', '8'))
+PDF_PAGE_CACHE_MAX_PAGES = int(os.environ.get('PDF_PAGE_CACHE_MAX_PAGES', '2000'))
+
+# Background summary jobs started by document uploads (progress pushed to sockets, or polled)
+SUMMARY_JOB_WORKERS = int(os.environ.get('SUMMARY_JOB_WORKERS', '2'))  # Jobs running at once (each waits on LLM calls)
+SUMMARY_JOB_HISTORY = int(os.environ.get('SUMMARY_JOB_HISTORY', '100'))  # Finished jobs kept for polling
+
+# LLM gateway (pooled OpenAI clients shared by all LLM calls)
+LLM_TIMEOUT = float(os.environ.get('LLM_TIMEOUT', '60'))  # Seconds per request (default for all models)
+LLM_CONNECT_TIMEOUT = float(os.environ.get('LLM_CONNECT_TIMEOUT', '5'))
+LLM_MAX_CONNECTIONS = int(os.environ.get('LLM_MAX_CONNECTIONS', '50'))
+LLM_MAX_KEEPALIVE_CONNECTIONS = int(os.environ.get('LLM_MAX_KEEPALIVE_CONNECTIONS', '20'))
+LLM_DEFAULT_CONCURRENCY = int(os.environ.get('LLM_DEFAULT_CONCURRENCY', '8'))  # Concurrent requests per model
+# Per-model overrides as comma-separated model=value pairs (parsed by the LLM gateway)
+LLM_MODEL_CONCURRENCY = os.environ.get('LLM_MODEL_CONCURRENCY', 'gpt-4=4')
+LLM_MODEL_TIMEOUTS = os.environ.get('LLM_MODEL_TIMEOUTS', 'gpt-4=120')
+
+# Conversation history sent to the LLM
+HISTORY_KEEP_TURNS = int(os.environ.get('HISTORY_KEEP_TURNS', '4'))  # Question/answer pairs kept verbatim
+HISTORY_SUMMARY_MAX_TOKENS = int(os.environ.get('HISTORY_SUMMARY_MAX_TOKENS', '300'))  # Running summary of older turns
+HISTORY_SUMMARY_MODEL = os.environ.get('HISTORY_SUMMARY_MODEL', 'gpt-4o-mini')
+LLM_PROMPT_TOKEN_BUDGET = int(os.environ.get('LLM_PROMPT_TOKEN_BUDGET', '6000'))  # Hard cap on prompt tokens per answer
+
+# Resume / job context in answer prompts (only the chunks relevant to the question)
+CONTEXT_RETRIEVAL_ENABLED = os.environ.get('CONTEXT_RETRIEVAL_ENABLED', 'True').lower() in ('true', '1', 'yes')
+CONTEXT_CHUNK_TOKENS = int(os.environ.get('CONTEXT_CHUNK_TOKENS', '120'))
+CONTEXT_TOP_K = int(os.environ.get('CONTEXT_TOP_K', '4'))  # Chunks per document besides the lead (profile) chunk
+CONTEXT_RESUME_BUDGET_TOKENS = int(os.environ.get('CONTEXT_RESUME_BUDGET_TOKENS', '600'))
+CONTEXT_JOB_BUDGET_TOKENS = int(os.environ.get('CONTEXT_JOB_BUDGET_TOKENS', '400'))
+
+# Hedged answers: race a backup model when the primary has not produced a token in time
+LLM_HEDGE_ENABLED = os.environ.get('LLM_HEDGE_ENABLED', 'False').lower() in ('true', '1', 'yes')  # Default for clients that don't choose
+LLM_HEDGE_DELAY = float(os.environ.get('LLM_HEDGE_DELAY', '1.5'))  # Seconds without a first token before hedging
+LLM_HEDGE_BACKUP_MODEL = os.environ.get('LLM_HEDGE_BACKUP_MODEL', 'gpt-3.5-turbo')
+
+# Speculative answers from interim transcripts (started before the final transcription arrives)
+SPECULATIVE_ANSWERS_ENABLED = os.environ.get('SPECULATIVE_ANSWERS_ENABLED', 'False').lower() in ('true', '1', 'yes')  # Default for clients that don't choose
+SPECULATIVE_MATCH_THRESHOLD = float(os.environ.get('SPECULATIVE_MATCH_THRESHOLD', '0.85'))  # Final vs interim word similarity to keep the answer
+SPECULATIVE_MIN_WORDS = int(os.environ.get('SPECULATIVE_MIN_WORDS', '4'))
+SPECULATIVE_MAX_PER_QUESTION = int(os.environ.get('SPECULATIVE_MAX_PER_QUESTION', '3'))  # Answers started between two final transcripts
+
+# Playground fan-out (/compare-llms/fanout/): models streamed concurrently per request
+PLAYGROUND_MAX_MODELS = int(os.environ.get('PLAYGROUND_MAX_MODELS', '6'))
\ No newline at end of file
@@ -420,6 +420,16 @@ document.addEventListener('DOMContentLoaded', function() {
         socket.onopen = () => {
             statusElement.textContent = 'Connected to server';
             logger.log('WebSocket connection established');
+
+            // Tell the server how cached answers should be delivered to this client
+            const deliveryMode = localStorage.getItem('cacheDeliveryMode');
+            if (deliveryMode) {
+                socket.send(JSON.stringify({
+                    type: 'delivery_settings',
+                    mode: deliveryMode,
+                    words_per_second: parseFloat(localStorage.getItem('cacheDeliveryWordsPerSecond') || '60')
+                }));
+            }
         };
         
         socket.onmessage = (event) => {
@@ -451,6 +461,11 @@ document.addEventListener('DOMContentLoaded', function() {
                     completeCurrentAnswer();
                     break;
 
+                case 'answer_cancelled':
+                    // A newer question superseded this answer - keep what arrived, marked as interrupted
+                    cancelCurrentAnswer();
+                    break;
+
                 case 'cache_indicator':
                     // Store badge info to display when answer starts
                     pendingBadge = {
@@ -466,6 +481,11 @@ document.addEventListener('DOMContentLoaded', function() {
                     // Display predicted next questions
                     displayPredictions(data.predictions);
                     break;
+
+                case 'summary_job':
+                    // Background document summary progress (uploads from the resume builder)
+                    logger.log(`Summary job ${data.job.kind}: ${data.job.status}`, data.job.step || '');
+                    break;
             }
         };
         
@@ -577,11 +597,11 @@ document.addEventListener('DOMContentLoaded', function() {
 
                     // Broadcast live transcript to all connected clients (including Electron)
                     if (socket && socket.readyState === WebSocket.OPEN) {
-                        socket.send(JSON.stringify({
+                        socket.send(JSON.stringify(withSpeculativeSetting({
                             type: 'live_transcript_update',
                             text: currentTranscript,
                             is_final: true
-                        }));
+                        })));
                     }
 
                     // Don't auto-send anymore - user will press ENTER when ready
@@ -597,11 +617,11 @@ document.addEventListener('DOMContentLoaded', function() {
 
                     // Broadcast interim transcript to all connected clients (including Electron)
                     if (socket && socket.readyState === WebSocket.OPEN) {
-                        socket.send(JSON.stringify({
+                        socket.send(JSON.stringify(withSpeculativeSetting({
                             type: 'live_transcript_update',
                             text: currentTranscript + interimTranscript,
                             is_final: false
-                        }));
+                        })));
                     }
                 }
             } else {
@@ -627,6 +647,15 @@ document.addEventListener('DOMContentLoaded', function() {
         };
     }
 
+    // Optional override of the server's SPECULATIVE_ANSWERS_ENABLED default
+    function withSpeculativeSetting(message) {
+        const speculativeEnabled = localStorage.getItem('speculativeEnabled');
+        if (speculativeEnabled !== null) {
+            message.speculative_enabled = speculativeEnabled === 'true';
+        }
+        return message;
+    }
+
     // Strip HTML tags from text
     function stripHtmlTags(html) {
         const tmp = document.createElement('div');
@@ -659,13 +688,24 @@ document.addEventListener('DOMContentLoaded', function() {
 
         if (socket && socket.readyState === WebSocket.OPEN) {
             logger.log('Sending to WebSocket...');
-            socket.send(JSON.stringify({
+            const message = {
                 type: 'transcription',
                 text: cleanText,
                 provider: llmProvider,
                 model: currentModel,
                 predictions_enabled: predictionsEnabled
-            }));
+            };
+            // Optional override of the server's PREFETCH_ENABLED default
+            const prefetchEnabled = localStorage.getItem('prefetchEnabled');
+            if (prefetchEnabled !== null) {
+                message.prefetch_enabled = prefetchEnabled === 'true';
+            }
+            // Optional override of the server's LLM_HEDGE_ENABLED default
+            const hedgeEnabled = localStorage.getItem('hedgeEnabled');
+            if (hedgeEnabled !== null) {
+                message.hedge_enabled = hedgeEnabled === 'true';
+            }
+            socket.send(JSON.stringify(message));
             logger.log('Message sent to WebSocket!');
         } else {
             logger.error('WebSocket is not open! Cannot send message.');
@@ -756,6 +796,21 @@ document.addEventListener('DOMContentLoaded', function() {
         }
     }
 
+    // Close the current answer early (superseded by a newer question)
+    function cancelCurrentAnswer() {
+        if (pendingQuestion) {
+            addMessageToConversation('question', pendingQuestion.text, pendingQuestion.timestamp);
+            pendingQuestion = null;
+        }
+        pendingBadge = null;
+
+        const answerDiv = document.getElementById('current-answer');
+        if (answerDiv) {
+            answerDiv.classList.add('answer-cancelled');
+            completeCurrentAnswer();
+        }
+    }
+
     // Display cache/LLM indicator badge
     function displayCacheIndicator(isCached, hitCount, model, provider) {
         const answerDiv = document.getElementById('current-answer');
@@ -160,15 +160,24 @@ document.addEventListener('DOMContentLoaded', function() {
         const llm1Timer = setInterval(() => updateTime(llm1Time, llm1StartTime), 100);
         const llm2Timer = setInterval(() => updateTime(llm2Time, llm2StartTime), 100);
 
-        // Send parallel requests
+        // Stream both models concurrently over one fan-out request
+        const columns = [
+            { response: llm1Response, status: llm1Status, time: llm1Time, timer: llm1Timer, text: '' },
+            { response: llm2Response, status: llm2Status, time: llm2Time, timer: llm2Timer, text: '' }
+        ];
+
         try {
-            await Promise.all([
-                sendLLMRequest(llm1Config, llm1Response, llm1Status, llm1Time, llm1Timer),
-                sendLLMRequest(llm2Config, llm2Response, llm2Status, llm2Time, llm2Timer)
-            ]);
+            await sendFanOutRequest(question, [llm1Config, llm2Config], columns);
         } catch (error) {
             console.error('Error during comparison:', error);
+            columns.forEach(column => {
+                clearInterval(column.timer);
+                updateStatus(column.status, 'Error', '❌');
+                column.response.innerHTML = `<p class="error-message">Error: ${error.message}</p>`;
+            });
         } finally {
+            columns.forEach(column => clearInterval(column.timer));
+
             // Re-enable button
             compareBtn.disabled = false;
             compareBtn.textContent = '⚡ Compare Models';
@@ -176,56 +185,77 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     /**
-     * Send request to LLM and stream response
+     * Show measured metrics for a finished model
      */
-    async function sendLLMRequest(config, responseElement, statusElement, timeElement, timer) {
-        try {
-            updateStatus(statusElement, 'Generating...', '⚡');
-
-            const response = await fetch('/compare-llms/', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(config)
-            });
-
-            if (!response.ok) {
-                throw new Error(`HTTP error! status: ${response.status}`);
-            }
-
-            // Read streaming response
-            const reader = response.body.getReader();
-            const decoder = new TextDecoder();
-            let fullText = '';
-            let firstChunk = true;
-
-            while (true) {
-                const { done, value } = await reader.read();
+    function showMetrics(column, metrics) {
+        clearInterval(column.timer);
+        const parts = [];
+        if (metrics.ttft_ms !== null) parts.push(`TTFT ${(metrics.ttft_ms / 1000).toFixed(2)}s`);
+        if (metrics.tokens_per_second !== null) parts.push(`${metrics.tokens_per_second} tok/s`);
+        parts.push(`${(metrics.total_ms / 1000).toFixed(1)}s`);
+        column.time.textContent = parts.join(' · ');
+        column.time.title = `Prompt tokens: ${metrics.prompt_tokens ?? '?'}, completion tokens: ${metrics.completion_tokens}` +
+            (metrics.usage_reported ? '' : ' (estimated)');
+    }
 
-                if (done) break;
+    /**
+     * Send one fan-out request and demultiplex its NDJSON event stream into the columns
+     */
+    async function sendFanOutRequest(question, configs, columns) {
+        columns.forEach(column => updateStatus(column.status, 'Generating...', '⚡'));
+
+        const response = await fetch('/compare-llms/fanout/', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({
+                question: question,
+                models: configs.map(config => ({ provider: config.provider, model: config.model }))
+            })
+        });
 
-                const chunk = decoder.decode(value, { stream: true });
-                fullText += chunk;
+        if (!response.ok) {
+            throw new Error(`HTTP error! status: ${response.status}`);
+        }
 
-                if (firstChunk) {
-                    updateStatus(statusElement, 'Streaming...', '📡');
-                    firstChunk = false;
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+
+        while (true) {
+            const { done, value } = await reader.read();
+
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+            const lines = buffer.split('\n');
+            buffer = lines.pop();
+
+            for (const line of lines) {
+                if (!line.trim()) continue;
+                const event = JSON.parse(line);
+                const column = columns[event.index];
+
+                if (event.type === 'chunk') {
+                    if (!column.text) {
+                        updateStatus(column.status, 'Streaming...', '📡');
+                    }
+                    column.text += event.text;
+                    appendChunk(column.response, event.text);
+                } else if (event.type === 'done') {
+                    showMetrics(column, event.metrics);
+                    if (event.metrics.error) {
+                        updateStatus(column.status, 'Error', '❌');
+                        column.response.innerHTML = `<p class="error-message">Error: ${event.metrics.error}</p>`;
+                    } else {
+                        updateStatus(column.status, 'Complete', '✅');
+                        renderMarkdown(column.response, column.text);
+                    }
+                } else if (event.type === 'summary') {
+                    console.table(event.results);
                 }
-
-                appendChunk(responseElement, chunk);
             }
-
-            // Final rendering
-            clearInterval(timer);
-            updateStatus(statusElement, 'Complete', '✅');
-            renderMarkdown(responseElement, fullText);
-
-        } catch (error) {
-            clearInterval(timer);
-            updateStatus(statusElement, 'Error', '❌');
-            responseElement.innerHTML = `<p class="error-message">Error: ${error.message}</p>`;
-            console.error('LLM Request Error:', error);
         }
     }
 
@@ -35,6 +35,41 @@ function getDetectedLanguage() {
     return JSON.parse(localStorage.getItem('detectedLanguage') || '{}');
 }
 
+// Summary Job Polling
+// Uploads return at once with a job id; summaries are generated in the background
+function waitForSummaryJob(jobId, onProgress) {
+    return new Promise((resolve, reject) => {
+        const poll = () => {
+            fetch(`/summary-jobs/${jobId}/`)
+                .then(response => response.json())
+                .then(job => {
+                    if (!job.success) {
+                        reject(new Error(job.message || 'Unknown job'));
+                    } else if (job.status === 'done') {
+                        resolve(job);
+                    } else if (job.status === 'failed') {
+                        reject(new Error(job.error || 'Processing failed'));
+                    } else {
+                        if (onProgress) onProgress(job);
+                        setTimeout(poll, 1000);
+                    }
+                })
+                .catch(reject);
+        };
+        poll();
+    });
+}
+
+// Waits for the upload's summary job and merges its result into the upload response
+function withSummaryJobResult(data, message) {
+    if (!data.success || !data.job_id) {
+        return data;
+    }
+    return waitForSummaryJob(data.job_id, job => {
+        showLoader(job.step ? `${message} (${job.step})` : message);
+    }).then(job => Object.assign(data, job.result));
+}
+
 // Resume Builder Controller
 document.addEventListener('DOMContentLoaded', function() {
     // Resume upload area
@@ -224,9 +259,9 @@ function uploadFile(file, type) {
 
     // Show loader with appropriate message
     if (type === 'resume') {
-        showLoader('Generating Resume Summary... (This may take up to 30 seconds)');
+        showLoader('Generating Resume Summary...');
     } else {
-        showLoader('Analyzing Job Description... (This may take up to 30 seconds)');
+        showLoader('Analyzing Job Description...');
     }
 
     // Upload to server
@@ -235,6 +270,7 @@ function uploadFile(file, type) {
         body: formData
     })
     .then(response => response.json())
+    .then(data => withSummaryJobResult(data, type === 'resume' ? 'Generating Resume Summary...' : 'Analyzing Job Description...'))
     .then(data => {
         hideLoader();
         if (data.success) {
@@ -327,7 +363,7 @@ function saveJobText() {
     const jobFiles = document.getElementById('jobFiles');
 
     // Show loader
-    showLoader('Analyzing Job Description... (This may take up to 30 seconds)');
+    showLoader('Analyzing Job Description...');
 
     // Send to backend
     fetch('/save-job-text/', {
@@ -338,6 +374,7 @@ function saveJobText() {
         body: JSON.stringify({ job_text: jobText })
     })
     .then(response => response.json())
+    .then(data => withSummaryJobResult(data, 'Analyzing Job Description...'))
     .then(data => {
         hideLoader();
         if (data.success) {
@@ -1010,7 +1047,12 @@ function clearAllSummaries() {
 }
 
 // FAQ Viewer Functions
+// The server pages and searches the FAQ cache; we keep only the pages loaded so far
+const FAQ_PAGE_SIZE = 50;
 let cachedFaqData = null;
+let faqSearchTerm = '';
+let faqTotal = 0;
+let faqSearchTimer = null;
 
 function toggleFaqViewer() {
     const viewer = document.getElementById('faqViewer');
@@ -1024,28 +1066,44 @@ function toggleFaqViewer() {
     }
 }
 
-function loadFaqData() {
+function loadFaqData(append = false) {
     const container = document.getElementById('faqItemsContainer');
     if (!container) return;
 
     // If we have cached data, use it
-    if (cachedFaqData) {
+    if (cachedFaqData && !append) {
         renderFaqItems(cachedFaqData);
         return;
     }
 
-    container.innerHTML = '<p class="loading-text">Loading FAQs...</p>';
+    if (!append) {
+        container.innerHTML = '<p class="loading-text">Loading FAQs...</p>';
+    }
+
+    const params = new URLSearchParams({
+        offset: append && cachedFaqData ? cachedFaqData.length : 0,
+        limit: FAQ_PAGE_SIZE
+    });
+    if (faqSearchTerm) {
+        params.set('q', faqSearchTerm);
+    }
 
-    // Fetch FAQ data from backend
-    fetch('/get-faq-data/')
+    // Fetch one page of FAQ data from backend
+    fetch(`/get-faq-data/?${params}`)
         .then(response => response.json())
         .then(data => {
             if (data.success && data.faqs && data.faqs.length > 0) {
-                cachedFaqData = data.faqs;
+                cachedFaqData = append && cachedFaqData ? cachedFaqData.concat(data.faqs) : data.faqs;
+                faqTotal = data.total;
                 renderFaqItems(cachedFaqData);
                 setupFaqSearch();
-            } else {
-                container.innerHTML = '<p class="no-results-text">No FAQ data available.</p>';
+            } else if (!append) {
+                cachedFaqData = [];
+                faqTotal = 0;
+                container.innerHTML = faqSearchTerm
+                    ? '<p class="no-results-text">No results found.</p>'
+                    : '<p class="no-results-text">No FAQ data available.</p>';
+                setupFaqSearch();
             }
         })
         .catch(error => {
@@ -1054,27 +1112,17 @@ function loadFaqData() {
         });
 }
 
-function renderFaqItems(faqs, searchTerm = '') {
+function renderFaqItems(faqs) {
     const container = document.getElementById('faqItemsContainer');
     if (!container) return;
 
-    // Filter FAQs based on search term
-    let filteredFaqs = faqs;
-    if (searchTerm) {
-        const lowerSearch = searchTerm.toLowerCase();
-        filteredFaqs = faqs.filter(faq =>
-            faq.question.toLowerCase().includes(lowerSearch) ||
-            faq.answer.toLowerCase().includes(lowerSearch)
-        );
-    }
-
-    if (filteredFaqs.length === 0) {
+    if (faqs.length === 0) {
         container.innerHTML = '<p class="no-results-text">No results found.</p>';
         return;
     }
 
     let html = '';
-    filteredFaqs.forEach((faq, index) => {
+    faqs.forEach((faq, index) => {
         html += `
             <div class="faq-item" data-index="${index}">
                 <div class="faq-question" onclick="toggleFaqItem(${index})">
@@ -1088,6 +1136,11 @@ function renderFaqItems(faqs, searchTerm = '') {
         `;
     });
 
+    // More pages on the server
+    if (faqs.length < faqTotal) {
+        html += `<button class="faq-load-more" onclick="loadFaqData(true)">Load more (${faqs.length} of ${faqTotal})</button>`;
+    }
+
     container.innerHTML = html;
 }
 
@@ -1100,17 +1153,17 @@ function toggleFaqItem(index) {
 
 function setupFaqSearch() {
     const searchInput = document.getElementById('faqSearchInput');
-    if (!searchInput) return;
-
-    // Remove previous event listeners by cloning
-    const newSearchInput = searchInput.cloneNode(true);
-    searchInput.parentNode.replaceChild(newSearchInput, searchInput);
-
-    newSearchInput.addEventListener('input', (e) => {
-        const searchTerm = e.target.value;
-        if (cachedFaqData) {
-            renderFaqItems(cachedFaqData, searchTerm);
-        }
+    if (!searchInput || searchInput.dataset.bound) return;
+    searchInput.dataset.bound = 'true';
+
+    // Search on the server, debounced while typing
+    searchInput.addEventListener('input', (e) => {
+        clearTimeout(faqSearchTimer);
+        faqSearchTimer = setTimeout(() => {
+            faqSearchTerm = e.target.value.trim();
+            cachedFaqData = null;
+            loadFaqData();
+        }, 250);
     });
 }
 